@@ -0,0 +1,219 @@
+"""
+Benchmark of clustering algorithms on synthetic datasets.
+
+Every algorithm is run on a grid of dataset sizes (n points, d dimensions, k
+clusters) with warmup runs and repeats. Results are saved as JSON and can be
+compared with results saved earlier to find regressions:
+
+    python benchmark.py --output results.json
+    python benchmark.py --output new.json --baseline results.json
+
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from clustering_algorithms import CLARA, PAM, PointSet, Telemetry
+from data_loaders import make_blobs
+from timer import Timer
+
+# (n, d, k)
+SIZES = [(200, 2, 3), (1000, 2, 5), (2000, 8, 10)]
+QUICK_SIZES = [(100, 2, 3)]
+
+# name: (function(points, clusters_num, **kwargs) -> algorithm, maximal number of
+# points), kwargs are passed to the algorithm
+ALGORITHMS: Dict[str, tuple] = {
+    "pam": (lambda points, k, **kwargs: PAM(points, k, **kwargs), 200),
+    "pam-numpy": (
+        lambda points, k, **kwargs: PAM(points, k, engine="numpy", **kwargs),
+        2000,
+    ),
+    "fastpam1": (
+        lambda points, k, **kwargs: PAM(
+            points, k, engine="numpy", swap_strategy="fastpam1", **kwargs
+        ),
+        None,
+    ),
+    "fasterpam": (
+        lambda points, k, **kwargs: PAM(
+            points, k, engine="numpy", swap_strategy="fasterpam", init="lab", **kwargs
+        ),
+        None,
+    ),
+    "clara": (lambda points, k, **kwargs: CLARA(points, k, **kwargs), 2000),
+    "clara-numpy": (
+        lambda points, k, **kwargs: CLARA(points, k, engine="numpy", **kwargs),
+        None,
+    ),
+}
+
+# relative slowdown of the minimal time reported as a regression
+TOLERANCE = 0.2
+# slowdowns shorter than this (in seconds) are treated as noise
+MIN_TIME_DIFFERENCE = 0.005
+
+
+def run_algorithm(create: Callable, data: dict, clusters_num: int, seed: int, **kwargs):
+    """
+    Create and run the algorithm on a fresh copy of points.
+    """
+    random.seed(seed)
+    points = PointSet(data["coordinates"], data["coordinates_columns"])
+    algorithm = create(points, clusters_num, **kwargs)
+    algorithm.run()
+    return algorithm
+
+
+def benchmark_case(
+    name: str, points_num: int, dimensions: int, clusters_num: int, args
+) -> dict:
+    """
+    Measure one algorithm on one dataset size.
+
+    Return:
+        Dictionary with measured values.
+
+    """
+    create, _ = ALGORITHMS[name]
+    data = make_blobs(points_num, dimensions, clusters_num, seed=args.seed)
+
+    for _ in range(args.warmup):
+        run_algorithm(create, data, clusters_num, args.seed)
+
+    timer = Timer()
+    for _ in range(args.repeats):
+        with timer.section("run"):
+            algorithm = run_algorithm(create, data, clusters_num, args.seed)
+    times = timer.get_section("run")
+
+    # counters and memory are measured in a separate run, tracing slows it down
+    telemetry = Telemetry()
+    tracemalloc.start()
+    algorithm = run_algorithm(
+        create, data, clusters_num, args.seed, telemetry=telemetry
+    )
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    df = algorithm.get_result_df()
+    return {
+        "algorithm": name,
+        "n": points_num,
+        "d": dimensions,
+        "k": clusters_num,
+        "times": times.durations,
+        "mean_time": times.mean,
+        "min_time": times.min,
+        "distance_computations": telemetry.counters["distance_computations"],
+        "swap_candidates": telemetry.counters["swap_candidates"],
+        "phases": telemetry.to_dict()["timings"],
+        "iterations": getattr(algorithm, "iterations", None),
+        "peak_memory": peak_memory,
+        "cost": float(df["nearest_medoid_distance"].sum()),
+    }
+
+
+def run_benchmark(args) -> dict:
+    sizes = QUICK_SIZES if args.quick else SIZES
+    results = []
+    for points_num, dimensions, clusters_num in sizes:
+        for name in args.algorithms:
+            max_points = ALGORITHMS[name][1]
+            if max_points and points_num > max_points:
+                continue
+            result = benchmark_case(name, points_num, dimensions, clusters_num, args)
+            print(
+                f"{name:>12} n={points_num:<6} d={dimensions:<3} k={clusters_num:<3} "
+                f"{result['min_time']:.4f}s"
+            )
+            results.append(result)
+
+    return {
+        "metadata": {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    results: dict, baseline: dict, tolerance: float = TOLERANCE
+) -> List[str]:
+    """
+    Compare results with baseline results of the same cases.
+
+    Return:
+        List of found regressions: slower minimal time (more than `tolerance`),
+        more distance computations or higher cost.
+
+    """
+
+    def key(result):
+        return result["algorithm"], result["n"], result["d"], result["k"]
+
+    baseline_results = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results["results"]:
+        old = baseline_results.get(key(result))
+        if old is None:
+            continue
+        case = "{} n={} d={} k={}".format(*key(result))
+        slowdown = result["min_time"] - old["min_time"]
+        if slowdown > old["min_time"] * tolerance and slowdown > MIN_TIME_DIFFERENCE:
+            regressions.append(
+                f"{case}: time {old['min_time']:.4f}s -> {result['min_time']:.4f}s"
+            )
+        if result["distance_computations"] > old["distance_computations"]:
+            regressions.append(
+                f"{case}: distance computations {old['distance_computations']} -> "
+                f"{result['distance_computations']}"
+            )
+        if result["cost"] > old["cost"] * (1 + 1e-9):
+            regressions.append(f"{case}: cost {old['cost']} -> {result['cost']}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="JSON file with results to compare with")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS)
+    )
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="run only small sizes")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_benchmark(args)
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_results(
+                results, json.load(baseline_file), args.tolerance
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
@@ -1,4 +1,12 @@
 from .clara import CLARA
+from .clarans import CLARANS
+from .distance_cache import DistanceMatrixCache
+from .distance_matrix import DistanceMatrix
 from .k_medoids_algorithm import KMedoidsAlgorithm
+from .k_selection import select_k
+from .multi_start import MultiStartPAM
 from .pam import PAM
-from .point import Point, get_initial_points
+from .point import Point, get_coordinates_array, get_initial_points
+from .point_set import PointSet, PointView
+from .row_cache import DistanceRowCache
+from .telemetry import Telemetry
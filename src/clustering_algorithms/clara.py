@@ -1,27 +1,81 @@
 import random
+from functools import partial
 from statistics import mean
-from typing import List
+from typing import List, Optional, Tuple, Union
 
-from clustering_algorithms.k_medoids_algorithm import KMedoidsAlgorithm
+import numpy as np
+
+from clustering_algorithms.distance_matrix import DistanceMatrix
+from clustering_algorithms.distances import DistanceKernel
+from clustering_algorithms.k_medoids_algorithm import (
+    INITIALIZATIONS,
+    KMedoidsAlgorithm,
+)
+from clustering_algorithms.medoids_index import MedoidsIndex
 from clustering_algorithms.pam import PAM
 from clustering_algorithms.point import Point
+from clustering_algorithms.telemetry import (
+    SAMPLE_EVALUATION,
+    SAMPLING,
+    Callback,
+    Telemetry,
+)
+from clustering_algorithms.workers import call_in_worker, resolve_n_jobs, worker_pool
+
+# number of rows of the distance matrix computed at once
+ROWS_BLOCK_SIZE = 1024
 
 
 class CLARA(KMedoidsAlgorithm):
     def __init__(
         self,
-        points: List[Point],
+        points: List[Point] = None,
         clusters_num: int = 2,
         labels: List["str"] = None,
         samples_num: int = None,
+        engine: str = "python",
+        distance_matrix: DistanceMatrix = None,
+        swap_strategy: str = "pam",
+        init: str = "random",
+        draws_num: int = 5,
+        n_jobs: int = 1,
+        callbacks: List[Callback] = None,
+        telemetry: Telemetry = None,
+        medoids_index: str = "auto",
+        metric: Union[str, DistanceKernel] = "euclidean",
+        p: float = None,
     ):
-        super().__init__(points=points, clusters_num=clusters_num, labels=labels)
+        super().__init__(
+            points=points,
+            clusters_num=clusters_num,
+            labels=labels,
+            engine=engine,
+            distance_matrix=distance_matrix,
+            callbacks=callbacks,
+            telemetry=telemetry,
+            medoids_index=medoids_index,
+            metric=metric,
+            p=p,
+        )
+        if init not in INITIALIZATIONS:
+            raise ValueError(
+                f"Unknown initialization ({init}). Available: {INITIALIZATIONS}."
+            )
+        self.swap_strategy = swap_strategy
+        # initial medoids of the whole dataset stay random, `init` is used by PAM
+        # for every sample
+        self.init = init
 
         self.update_clusters_assignment()
         self.best_medoids = self.medoids_indices
         self.best_dissimilarity = self.calculate_dissimilarity()
 
-        # number of samples that will be passed to the PAM algorithm
+        # number of samples drawn, each of them is clustered by PAM
+        self.draws_num = draws_num
+        # number of worker processes, -1 uses all CPUs
+        self.n_jobs = resolve_n_jobs(n_jobs)
+
+        # number of points in each sample passed to the PAM algorithm
         if samples_num:
             self.samples_num = samples_num
         else:
@@ -46,32 +100,165 @@ class CLARA(KMedoidsAlgorithm):
             mean distance between points and medoids that represent their clusters
 
         """
-        return mean(
-            [point.compute_distance(point.nearest_medoid) for point in self.points]
+        if self.engine == "numpy":
+            return float(np.mean(self.nearest_distances))
+
+        return mean([point.nearest_medoid_distance for point in self.points])
+
+    def compute_dissimilarity(self, medoids_indices: List[int]) -> float:
+        """
+        Calculate dissimilarity of the whole dataset for given medoids without
+        changing points' assignment. Distances are computed in blocks of rows (see
+        `assign_coordinates`) or, for many medoids, nearest medoids are found with
+        the KD-tree.
+
+        Arguments:
+            medoids_indices: indices of medoids
+
+        Return:
+            mean distance between points and their nearest medoids
+
+        """
+        medoids_positions = np.array(
+            [self.positions[idx] for idx in medoids_indices], dtype=np.intp
         )
+        if self.uses_medoids_index(len(medoids_positions)):
+            medoids_index = MedoidsIndex(
+                self.coordinates[medoids_positions], self.minkowski_p
+            )
+            return float(
+                np.mean(self.query_medoids_index(medoids_index, self.coordinates)[1])
+            )
+        if self.distance_matrix is None:
+            _, nearest_distances, _, _ = self.assign_coordinates(
+                self.coordinates, self.coordinates[medoids_positions]
+            )
+            return float(np.mean(nearest_distances))
 
-    def run(self) -> None:
+        points_positions = np.arange(len(self.points))
+        total = 0.0
+        for start in range(0, len(self.points), ROWS_BLOCK_SIZE):
+            rows = points_positions[start : start + ROWS_BLOCK_SIZE]
+            total += self.compute_distances(rows, medoids_positions).min(axis=1).sum()
+        return total / len(self.points)
+
+    def evaluate_sample(
+        self, sample: List[Point], seed: int
+    ) -> Tuple[List[int], float, Optional[Telemetry]]:
         """
-        Run CLARA algorithm. Use clara_instance.get_result_df() to fetch the results.
+        Run PAM on the sample and compute dissimilarity of the whole dataset for
+        medoids found by PAM. The random generator is seeded with `seed`, so the
+        result does not depend on the process in which the sample is evaluated.
+
+        Arguments:
+            sample: points drawn from the dataset
+            seed: seed for PAM's random initialization
+
+        Return:
+            Tuple with medoids' indices, dissimilarity and telemetry collected while
+            evaluating the sample (None if telemetry is disabled).
 
         """
-        for idx in range(5):
-            # call PAM to find medoids of the small sample
+        # telemetry of the sample is returned, so it is not lost in worker processes
+        telemetry = self.telemetry
+        if telemetry is not None:
+            self.telemetry = Telemetry()
+
+        # PAM uses the global random generator, its state is restored afterwards
+        state = random.getstate()
+        random.seed(seed)
+        try:
+            sample_distance_matrix = None
+            if self.distance_matrix is not None:
+                sample_distance_matrix = self.distance_matrix.submatrix(
+                    [self.positions[point.idx] for point in sample]
+                )
             pam = PAM(
-                points=self.draw_samples(),
+                points=sample,
                 clusters_num=self.clusters_num,
                 labels=self.labels,
+                engine=self.engine,
+                distance_matrix=sample_distance_matrix,
+                swap_strategy=self.swap_strategy,
+                init=self.init,
+                telemetry=self.telemetry,
+                medoids_index=self.medoids_index,
+                metric=self.metric,
+                p=self.p,
             )
             pam.run()
 
-            # determine the most similar medoid for each point from dataset
-            new_medoids = [medoid.idx for medoid in pam.medoids]
-            self.medoids_indices = new_medoids
-            self.update_clusters_assignment()
+            medoids_indices = list(pam.medoids_indices)
+            dissimilarity = self.compute_dissimilarity(medoids_indices)
+            sample_telemetry = self.telemetry
+        finally:
+            # also when the sample fails, so the caller's state is not changed
+            random.setstate(state)
+            self.telemetry = telemetry
+        return medoids_indices, dissimilarity, sample_telemetry
+
+    def evaluate_sample_positions(
+        self, sample_positions: np.ndarray, seed: int
+    ) -> Tuple[List[int], float, Optional[Telemetry]]:
+        """
+        `evaluate_sample` for the sample given by positions of its points, which are
+        sent to worker processes instead of the points.
+
+        """
+        sample = [self.points[position] for position in sample_positions]
+        return self.evaluate_sample(sample, seed)
 
-            # calculate dissimilarity. If this value is less than the current minimum,
-            # use this value as the current minimum and update best medoids set
-            new_dissimilarity = self.calculate_dissimilarity()
+    def run(self) -> None:
+        """
+        Run CLARA algorithm. Use clara_instance.get_result_df() to fetch the results.
+
+        Samples and seeds are always drawn in this process, so for a given seed the
+        result is the same no matter how many jobs are used.
+
+        """
+        with self.phase(SAMPLING):
+            samples = [self.draw_samples() for _ in range(self.draws_num)]
+            seeds = [random.getrandbits(32) for _ in range(self.draws_num)]
+
+        with self.phase(SAMPLE_EVALUATION):
+            if self.n_jobs == 1:
+                results = [
+                    self.evaluate_sample(sample, seed)
+                    for sample, seed in zip(samples, seeds)
+                ]
+            else:
+                # workers attach to data in shared memory and get positions of
+                # sampled points instead of the points
+                samples_positions = [
+                    np.array([self.positions[point.idx] for point in sample])
+                    for sample in samples
+                ]
+                with self.shared_data(), worker_pool(self.n_jobs, self) as executor:
+                    results = list(
+                        executor.map(
+                            partial(call_in_worker, "evaluate_sample_positions"),
+                            samples_positions,
+                            seeds,
+                        )
+                    )
+
+        for sample, result in enumerate(results):
+            new_medoids, new_dissimilarity, sample_telemetry = result
+            if sample_telemetry is not None:
+                self.telemetry.merge(sample_telemetry, sample=sample)
+            self.notify(
+                "sample",
+                sample=sample,
+                dissimilarity=new_dissimilarity,
+                medoids=[int(idx) for idx in new_medoids],
+            )
+
+            # if dissimilarity is less than the current minimum, use this value as
+            # the current minimum and update best medoids set
             if new_dissimilarity < self.best_dissimilarity:
                 self.best_medoids = new_medoids
                 self.best_dissimilarity = new_dissimilarity
+
+        # determine the most similar medoid for each point from dataset
+        self.medoids_indices = list(self.best_medoids)
+        self.update_clusters_assignment()
@@ -0,0 +1,182 @@
+import random
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from clustering_algorithms.distance_matrix import DistanceMatrix
+from clustering_algorithms.distances import DistanceKernel
+from clustering_algorithms.k_medoids_algorithm import KMedoidsAlgorithm
+from clustering_algorithms.point import Point
+from clustering_algorithms.telemetry import (
+    DISTANCE_COMPUTATIONS,
+    SWAP_CANDIDATES,
+    SWAP_SEARCH,
+    Callback,
+    Telemetry,
+)
+from clustering_algorithms.vectorized import compute_swap_costs_fastpam1
+
+
+class CLARANS(KMedoidsAlgorithm):
+    """
+    Clustering Large Applications based on RANdomized Search (Ng & Han, 2002).
+
+    Every set of k medoids is a node of a graph, two nodes are neighbours when they
+    differ by one medoid. Starting from `numlocal` random nodes, the algorithm moves
+    to a random neighbour whenever it lowers the cost and stops the local search
+    after `maxneighbor` consecutive neighbours that do not.
+
+    """
+
+    def __init__(
+        self,
+        points: List[Point] = None,
+        clusters_num: int = 2,
+        labels: List["str"] = None,
+        numlocal: int = 2,
+        maxneighbor: int = None,
+        engine: str = "python",
+        distance_matrix: DistanceMatrix = None,
+        init: str = "random",
+        callbacks: List[Callback] = None,
+        telemetry: Telemetry = None,
+        medoids_index: str = "auto",
+        metric: Union[str, DistanceKernel] = "euclidean",
+        p: float = None,
+    ):
+        super().__init__(
+            points=points,
+            clusters_num=clusters_num,
+            labels=labels,
+            engine=engine,
+            distance_matrix=distance_matrix,
+            init=init,
+            callbacks=callbacks,
+            telemetry=telemetry,
+            medoids_index=medoids_index,
+            metric=metric,
+            p=p,
+        )
+
+        self.numlocal = numlocal
+        # number of neighbours checked before the local search stops
+        if maxneighbor:
+            self.maxneighbor = maxneighbor
+        else:
+            neighbours_num = clusters_num * (len(self.points) - clusters_num)
+            self.maxneighbor = max(250, int(0.0125 * neighbours_num))
+
+        self.best_medoids = list(self.medoids_indices)
+        self.best_cost = np.inf
+
+    def compute_replacement_cost(self, old_medoid: Point, new_medoid: Point) -> float:
+        """
+        Compute cost of replacing `old_medoid` with `new_medoid`. Only distances to
+        `new_medoid` are computed, distances to current medoids are taken from the
+        nearest and second nearest medoid assignment.
+
+        Arguments:
+            old_medoid: medoid that we want to replace
+            new_medoid: point that has a chance to become a new medoid
+
+        Return:
+            Total cost of replacing `old_medoid` with `new_medoid`.
+
+        """
+        if self.engine == "numpy":
+            old_medoid_position = self.positions[old_medoid.idx]
+            candidate_distances = self.compute_distances(
+                np.arange(len(self.points)), np.array([self.positions[new_medoid.idx]])
+            )
+            costs = compute_swap_costs_fastpam1(
+                candidate_distances,
+                self.nearest,
+                self.nearest_distances,
+                self.second_nearest_distances,
+                len(self.medoids_positions),
+            )
+            medoid = np.searchsorted(self.medoids_positions, old_medoid_position)
+            return float(costs[medoid, 0])
+
+        medoids = self.prepare_medoids()
+        self.count(DISTANCE_COMPUTATIONS, len(self.points) - len(medoids) + 1)
+        old_medoid_position = self.positions[old_medoid.idx]
+        medoids_mask = self.medoids_mask.tolist()
+        cost = 0
+        for position, point in enumerate(self.points):
+            is_medoid = medoids_mask[position]
+            if not is_medoid or position == old_medoid_position:
+                cost += point.compute_medoid_replacement_cost(
+                    old_medoid, new_medoid, medoids, is_medoid
+                )
+        return cost
+
+    def draw_neighbour(self) -> Tuple[Point, Point]:
+        """
+        Draw a random neighbour of the current set of medoids.
+
+        Return:
+            Tuple with medoid that should be replaced and point that should replace it.
+
+        """
+        old_medoid_idx = random.choice(self.medoids_indices)
+        medoids_indices = set(self.medoids_indices)
+        while True:
+            new_medoid = random.choice(self.points)
+            if new_medoid.idx not in medoids_indices:
+                break
+        return self.points[self.positions[old_medoid_idx]], new_medoid
+
+    def search_local_minimum(self) -> float:
+        """
+        Move to random neighbours of the current medoids as long as one of
+        `maxneighbor` consecutive neighbours lowers the cost.
+
+        Return:
+            Cost of the local minimum.
+
+        """
+        self.update_clusters_assignment()
+        cost = self.compute_total_cost()
+
+        # every point is a medoid, there are no neighbours
+        if len(self.points) <= self.clusters_num:
+            return cost
+
+        checked_neighbours = 0
+        while checked_neighbours < self.maxneighbor:
+            old_medoid, new_medoid = self.draw_neighbour()
+            self.count(SWAP_CANDIDATES)
+            with self.phase(SWAP_SEARCH):
+                replacement_cost = self.compute_replacement_cost(old_medoid, new_medoid)
+            if replacement_cost < 0:
+                self.swap_medoids(old_medoid, new_medoid)
+                self.update_clusters_assignment_after_swap(old_medoid, new_medoid)
+                cost += replacement_cost
+                checked_neighbours = 0
+            else:
+                checked_neighbours += 1
+
+        return cost
+
+    def run(self) -> None:
+        """
+        Run CLARANS algorithm. Use clarans_instance.get_result_df() to fetch the
+        results.
+
+        """
+        for local in range(self.numlocal):
+            # the first search starts from the initial medoids
+            if local > 0:
+                self.medoids_indices = self.get_initial_medoids_indices(
+                    self.points, self.clusters_num
+                )
+
+            cost = self.search_local_minimum()
+            self.notify("local_minimum", local=local, cost=cost)
+            if cost < self.best_cost:
+                self.best_medoids = list(self.medoids_indices)
+                self.best_cost = cost
+
+        self.medoids_indices = list(self.best_medoids)
+        self.update_clusters_assignment()
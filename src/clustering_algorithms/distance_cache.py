@@ -0,0 +1,178 @@
+import glob
+import hashlib
+import json
+import os
+import uuid
+from typing import List
+
+import numpy as np
+
+from clustering_algorithms.distance_matrix import DTYPES, DistanceMatrix
+
+# default limit of the total size of files in the cache directory
+MAX_CACHE_SIZE = 4 << 30  # 4 GiB
+
+CACHE_FILE_PATTERN = "distances-*.npy"
+
+
+def get_cache_key(
+    coordinates: np.ndarray,
+    metric: str = "euclidean",
+    p: float = None,
+    dtype=np.float64,
+    condensed: bool = False,
+) -> str:
+    """
+    Hash of everything the distance matrix depends on: coordinates (values and
+    shape), metric and its parameter, dtype and layout of the matrix.
+
+    """
+    if not isinstance(metric, str):
+        raise ValueError("Only distances of named metrics can be cached.")
+    coordinates = np.ascontiguousarray(coordinates, dtype=np.float64)
+    digest = hashlib.sha1(coordinates.tobytes())
+    digest.update(
+        json.dumps(
+            [
+                coordinates.shape,
+                metric,
+                p,
+                np.dtype(dtype).name,
+                condensed,
+            ]
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+class DistanceMatrixCache:
+    """
+    Directory with distance matrices saved as .npy files and opened as read-only
+    memory maps, so repeated runs and concurrent processes share one copy of the
+    matrix through the page cache instead of computing it again.
+
+    Total size of the files is limited by `max_size`, files that have not been used
+    for the longest time are removed first (modification time is updated on every
+    use).
+
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = MAX_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"distances-{key}.npy")
+
+    def get(
+        self,
+        coordinates: np.ndarray,
+        condensed: bool = False,
+        dtype=np.float64,
+        metric: str = "euclidean",
+        p: float = None,
+    ) -> DistanceMatrix:
+        """
+        Open the cached distance matrix of given points or compute and save it.
+
+        Arguments:
+            coordinates: (n, d) array of coordinates
+            condensed: store only the upper triangle of the matrix
+            dtype: np.float32 or np.float64
+            metric: name of the metric, see `distances.get_metric`
+            p: power of the Minkowski metric
+
+        Return:
+            DistanceMatrix backed by a read-only memory-mapped file.
+
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype ({dtype}). Available: {DTYPES}.")
+
+        points_num = len(coordinates)
+        path = self.get_path(get_cache_key(coordinates, metric, p, dtype, condensed))
+        if os.path.exists(path):
+            # mark the file as recently used
+            os.utime(path)
+        else:
+            self.save(path, coordinates, condensed, dtype, metric, p)
+            self.evict(keep=path)
+
+        return DistanceMatrix(np.load(path, mmap_mode="r"), points_num, condensed)
+
+    def save(
+        self,
+        path: str,
+        coordinates: np.ndarray,
+        condensed: bool,
+        dtype: np.dtype,
+        metric: str,
+        p: float,
+    ) -> None:
+        """
+        Compute the matrix directly into a temporary memory-mapped file and rename it
+        to `path`. Renaming is atomic, so other processes never open an incomplete
+        file, at worst the same matrix is computed twice.
+
+        """
+        points_num = len(coordinates)
+        shape = (
+            (points_num * (points_num - 1) // 2,)
+            if condensed
+            else (points_num, points_num)
+        )
+        size = int(np.prod(shape)) * dtype.itemsize
+        if size > self.max_size:
+            raise ValueError(
+                f"Distance matrix ({size} B) is larger than the cache ({self.max_size} B)."
+            )
+
+        temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            data = np.lib.format.open_memmap(
+                temporary_path, mode="w+", dtype=dtype, shape=shape
+            )
+            DistanceMatrix.compute_into(data, coordinates, condensed, metric, p)
+            data.flush()
+            del data
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def get_files(self) -> List[str]:
+        """
+        Cache files, from the least to the most recently used.
+        """
+        paths = glob.glob(os.path.join(self.cache_dir, CACHE_FILE_PATTERN))
+        return sorted(paths, key=os.path.getmtime)
+
+    @property
+    def size(self) -> int:
+        return sum(os.path.getsize(path) for path in self.get_files())
+
+    def evict(self, keep: str = None) -> None:
+        """
+        Remove the least recently used files until the total size fits into
+        `max_size`. File `keep` is never removed.
+
+        """
+        paths = self.get_files()
+        total_size = sum(os.path.getsize(path) for path in paths)
+        for path in paths:
+            if total_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+            total_size -= os.path.getsize(path)
+            # file may have been removed by another process
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        for path in self.get_files():
+            os.remove(path)
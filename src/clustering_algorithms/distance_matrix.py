@@ -0,0 +1,286 @@
+from typing import Union
+
+import numpy as np
+
+from clustering_algorithms.distances import DistanceKernel, get_metric
+from clustering_algorithms.shared_arrays import SharedArray
+
+# number of rows computed at once when the matrix is built from coordinates
+ROWS_BLOCK_SIZE = 256
+
+DTYPES = (np.float32, np.float64)
+
+
+def condensed_size_to_points_num(size: int) -> int:
+    """
+    Compute number of points from the length of condensed matrix n * (n - 1) / 2.
+
+    """
+    points_num = int(round((1 + np.sqrt(1 + 8 * size)) / 2))
+    if points_num * (points_num - 1) // 2 != size:
+        raise ValueError(
+            f"Length of condensed matrix ({size}) is not equal to n * (n - 1) / 2."
+        )
+    return points_num
+
+
+class DistanceMatrix:
+    """
+    Precomputed distances between every pair of points.
+
+    Distances are stored either as a full (n, n) array or in condensed form: upper
+    triangle without the diagonal, row by row (the same layout as in
+    scipy.spatial.distance.pdist). Condensed form needs half of the memory, float32
+    dtype halves it again. Values are always returned as float64.
+
+    """
+
+    def __init__(self, data: np.ndarray, points_num: int, condensed: bool = False):
+        self.data = data
+        self.points_num = points_num
+        self.condensed = condensed
+        # SharedArray with `data`, if the matrix is stored in shared memory
+        self.shared_data = None
+
+    @classmethod
+    def from_coordinates(
+        cls,
+        coordinates: np.ndarray,
+        condensed: bool = False,
+        dtype=np.float64,
+        metric: Union[str, DistanceKernel] = "euclidean",
+        p: float = None,
+    ) -> "DistanceMatrix":
+        """
+        Compute distances between all points.
+
+        Arguments:
+            coordinates: (n, d) array of coordinates
+            condensed: store only the upper triangle of the matrix
+            dtype: np.float32 or np.float64
+            metric: name of the metric or distance kernel, see `distances.get_metric`
+            p: power of the Minkowski metric
+
+        Return:
+            DistanceMatrix for given coordinates.
+
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype ({dtype}). Available: {DTYPES}.")
+
+        points_num = len(coordinates)
+        if condensed:
+            data = np.empty(points_num * (points_num - 1) // 2, dtype=dtype)
+        else:
+            data = np.empty((points_num, points_num), dtype=dtype)
+        cls.compute_into(data, coordinates, condensed, metric, p)
+        return cls(data, points_num, condensed)
+
+    @staticmethod
+    def compute_into(
+        data: np.ndarray,
+        coordinates: np.ndarray,
+        condensed: bool = False,
+        metric: Union[str, DistanceKernel] = "euclidean",
+        p: float = None,
+    ) -> None:
+        """
+        Compute distances between all points and write them into preallocated
+        `data` array (ex. memory-mapped file) in blocks of ROWS_BLOCK_SIZE rows, both
+        for the full and the condensed matrix.
+
+        Arguments:
+            data: array of length n * (n - 1) / 2 if `condensed`, (n, n) otherwise
+            coordinates: (n, d) array of coordinates
+            condensed: store only the upper triangle of the matrix
+            metric: name of the metric or distance kernel, see `distances.get_metric`
+            p: power of the Minkowski metric
+
+        """
+        pairwise_distances = get_metric(metric, p)
+        points_num = len(coordinates)
+        if condensed:
+            offset = 0
+            for start in range(0, points_num - 1, ROWS_BLOCK_SIZE):
+                stop = min(start + ROWS_BLOCK_SIZE, points_num - 1)
+                # one kernel call per block, column j is the point start + 1 + j,
+                # so the row of point start + r continues the matrix from column r
+                distances = pairwise_distances(
+                    coordinates[start:stop], coordinates[start + 1 :]
+                )
+                for row in range(stop - start):
+                    length = points_num - 1 - start - row
+                    data[offset : offset + length] = distances[row, row:]
+                    offset += length
+                # the block is freed before the next one is computed
+                del distances
+        else:
+            for start in range(0, points_num, ROWS_BLOCK_SIZE):
+                data[start : start + ROWS_BLOCK_SIZE] = pairwise_distances(
+                    coordinates[start : start + ROWS_BLOCK_SIZE], coordinates
+                )
+
+    @classmethod
+    def from_precomputed(cls, matrix: np.ndarray, dtype=None) -> "DistanceMatrix":
+        """
+        Wrap dissimilarities computed outside of this library.
+
+        Arguments:
+            matrix: square (n, n) matrix or condensed 1-D array of length
+                n * (n - 1) / 2
+            dtype: np.float32 or np.float64, by default dtype of `matrix` is kept if
+                it is supported
+
+        Return:
+            DistanceMatrix with given dissimilarities.
+
+        """
+        matrix = np.asarray(matrix)
+        if dtype is None:
+            dtype = matrix.dtype if matrix.dtype in DTYPES else np.float64
+        dtype = np.dtype(dtype)
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype ({dtype}). Available: {DTYPES}.")
+
+        if matrix.ndim == 1:
+            points_num = condensed_size_to_points_num(len(matrix))
+            condensed = True
+        elif matrix.ndim == 2 and matrix.shape[0] == matrix.shape[1]:
+            points_num = matrix.shape[0]
+            condensed = False
+        else:
+            raise ValueError(
+                "Precomputed matrix needs to be a square matrix or a condensed array."
+            )
+
+        if (matrix < 0).any():
+            raise ValueError("Dissimilarities need to be non-negative.")
+
+        return cls(matrix.astype(dtype, copy=False), points_num, condensed)
+
+    def __len__(self) -> int:
+        return self.points_num
+
+    def is_shared(self) -> bool:
+        """
+        Check if pickled matrix refers to memory shared between processes (shared
+        memory or memory-mapped .npy file) instead of containing the data.
+
+        """
+        filename = getattr(self.data, "filename", None)
+        return self.shared_data is not None or (
+            isinstance(self.data, np.memmap) and str(filename).endswith(".npy")
+        )
+
+    def share(self) -> "DistanceMatrix":
+        """
+        Copy the matrix into shared memory, unless it is already shared. Use
+        `release_shared` to free the memory of the copy.
+
+        Return:
+            DistanceMatrix pickled by name of the shared block.
+
+        """
+        if self.is_shared():
+            return self
+        matrix = DistanceMatrix(None, self.points_num, self.condensed)
+        matrix.shared_data = SharedArray.from_array(self.data)
+        matrix.data = matrix.shared_data.array
+        return matrix
+
+    def release_shared(self) -> None:
+        """
+        Free shared memory used by the matrix, it cannot be used afterwards.
+        """
+        if self.shared_data is not None:
+            self.data = None
+            self.shared_data.release()
+            self.shared_data = None
+
+    def __getstate__(self) -> dict:
+        # memory-mapped .npy file is opened again after unpickling and shared memory
+        # is attached by name, so worker processes share one copy of the data
+        state = dict(self.__dict__)
+        filename = getattr(self.data, "filename", None)
+        if self.shared_data is not None:
+            state["data"] = None
+        elif isinstance(self.data, np.memmap) and str(filename).endswith(".npy"):
+            state["data"] = filename
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        state.setdefault("shared_data", None)
+        if state["shared_data"] is not None:
+            state["data"] = state["shared_data"].array
+        elif isinstance(state["data"], str):
+            state["data"] = np.load(state["data"], mmap_mode="r")
+        self.__dict__.update(state)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def get(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+        Get distances between points at positions `rows` and points at positions
+        `columns`.
+
+        Arguments:
+            rows: positions of points
+            columns: positions of points
+
+        Return:
+            (len(rows), len(columns)) array of distances.
+
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        columns = np.asarray(columns, dtype=np.intp)
+        if not self.condensed:
+            return self.data[np.ix_(rows, columns)].astype(np.float64, copy=False)
+
+        # distances are read for one position of the shorter list at a time, so no
+        # (len(rows), len(columns)) arrays of indices are created
+        if len(columns) <= len(rows):
+            distances = np.empty((len(columns), len(rows)))
+            for column, position in enumerate(columns):
+                distances[column] = self.get_condensed_row(position, rows)
+            return distances.T
+        distances = np.empty((len(rows), len(columns)))
+        for row, position in enumerate(rows):
+            distances[row] = self.get_condensed_row(position, columns)
+        return distances
+
+    def get_condensed_row(self, position: int, positions: np.ndarray) -> np.ndarray:
+        """
+        Get distances between the point at `position` and points at `positions` from
+        the condensed matrix.
+
+        """
+        lower = np.minimum(positions, position)
+        upper = np.maximum(positions, position)
+        diagonal = lower == upper
+        index = self.points_num * lower - lower * (lower + 1) // 2 + upper - lower - 1
+        index[diagonal] = 0
+        distances = self.data[index]
+        distances[diagonal] = 0
+        return distances
+
+    def submatrix(self, positions: np.ndarray) -> "DistanceMatrix":
+        """
+        Prepare matrix with distances between points at given positions only. Layout
+        and dtype are the same as in this matrix.
+
+        Arguments:
+            positions: positions of points
+
+        Return:
+            DistanceMatrix of size len(positions).
+
+        """
+        square = self.get(positions, positions).astype(self.data.dtype)
+        if self.condensed:
+            return DistanceMatrix(
+                square[np.triu_indices(len(positions), 1)], len(positions), True
+            )
+        return DistanceMatrix(square, len(positions), False)
@@ -0,0 +1,123 @@
+import functools
+from typing import Callable, Union
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from clustering_algorithms.vectorized import pairwise_distances
+
+# function(first, second) -> distances, where `first` is (n, d) array, `second` is
+# (m, d) array and distances are (n, m) array. Built-in kernels write distances
+# directly into the result, without (n, m, d) array of differences.
+DistanceKernel = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+# distances are taken from DistanceMatrix instead of being computed
+PRECOMPUTED = "precomputed"
+
+
+def sqeuclidean(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    return cdist(first, second, "sqeuclidean")
+
+
+def manhattan(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    return cdist(first, second, "cityblock")
+
+
+def chebyshev(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    return cdist(first, second, "chebyshev")
+
+
+def cosine(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """
+    1 - cosine similarity of every pair of rows. Similarity of zero vector and any
+    non-zero vector is 0 (distance 1), distance between two zero vectors is 0, so
+    every point is at distance 0 from itself.
+
+    """
+    first_norms = np.linalg.norm(first, axis=1)
+    second_norms = np.linalg.norm(second, axis=1)
+    norms = np.outer(first_norms, second_norms)
+    products = first @ second.T
+    similarity = np.divide(
+        products, norms, out=np.zeros_like(products), where=norms > 0
+    )
+    distances = np.clip(1 - similarity, 0, 2)
+    distances[np.outer(first_norms == 0, second_norms == 0)] = 0
+    return distances
+
+
+def minkowski(first: np.ndarray, second: np.ndarray, p: float) -> np.ndarray:
+    return cdist(first, second, "minkowski", p=p)
+
+
+# name -> kernel, "minkowski" requires `p` and is created by `get_metric`
+METRICS = {
+    "euclidean": pairwise_distances,
+    "sqeuclidean": sqeuclidean,
+    "manhattan": manhattan,
+    "chebyshev": chebyshev,
+    "cosine": cosine,
+}
+
+# metrics with a Minkowski norm, which can be used by KD-tree, name -> p
+MINKOWSKI_P = {"euclidean": 2, "manhattan": 1, "chebyshev": np.inf}
+
+
+def get_metric(metric: Union[str, DistanceKernel], p: float = None) -> DistanceKernel:
+    """
+    Get the batched kernel computing distances between many points at once.
+
+    Arguments:
+        metric: one of METRICS, "minkowski" or a function with the same interface
+            as DistanceKernel
+        p: power of the Minkowski metric, required by "minkowski" only
+
+    Return:
+        Distance kernel.
+
+    """
+    if callable(metric):
+        return metric
+    if metric == "minkowski":
+        if p is None or p < 1:
+            raise ValueError("Minkowski metric requires p >= 1.")
+        return functools.partial(minkowski, p=p)
+    if metric not in METRICS:
+        raise ValueError(
+            f"Unknown metric ({metric}). Available: {(*METRICS, 'minkowski')}."
+        )
+    return METRICS[metric]
+
+
+def get_minkowski_p(metric: Union[str, DistanceKernel], p: float = None) -> float:
+    """
+    Power of the Minkowski norm equal to `metric` or None if `metric` is not
+    a Minkowski norm.
+
+    """
+    if metric == "minkowski":
+        return p
+    if isinstance(metric, str):
+        return MINKOWSKI_P.get(metric)
+    return None
+
+
+def from_pairwise(
+    function: Callable[[np.ndarray, np.ndarray], float],
+) -> DistanceKernel:
+    """
+    Convert function computing distance between two points into a kernel, ex.
+    metric=from_pairwise(lambda x, y: ...). The function is called for every pair,
+    so it is much slower than vectorized kernels.
+
+    """
+
+    @functools.wraps(function)
+    def kernel(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        distances = np.empty((len(first), len(second)))
+        for row, point in enumerate(first):
+            for column, other_point in enumerate(second):
+                distances[row, column] = function(point, other_point)
+        return distances
+
+    return kernel
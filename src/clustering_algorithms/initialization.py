@@ -0,0 +1,152 @@
+import math
+import random
+from typing import Callable, List
+
+import numpy as np
+
+# number of rows of the distance matrix computed at once
+ROWS_BLOCK_SIZE = 256
+
+# function(rows, columns) -> (len(rows), len(columns)) array of distances
+DistanceFunction = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def compute_build_gains(
+    candidates_distances: np.ndarray, nearest_distances: np.ndarray
+) -> np.ndarray:
+    """
+    Compute decrease of total distance after adding each candidate to medoids.
+
+    Arguments:
+        candidates_distances: (c, n) array of distances between candidates and points
+        nearest_distances: distance between each point and its nearest medoid (inf
+            if there are no medoids yet)
+
+    Return:
+        Array of gains, the higher the better. Without medoids the gain is the
+        negative sum of distances, so the most central candidate wins.
+
+    """
+    if np.isinf(nearest_distances).all():
+        return -candidates_distances.sum(axis=1)
+    gains = nearest_distances - candidates_distances
+    np.maximum(gains, 0, out=gains)
+    return gains.sum(axis=1)
+
+
+def build(
+    compute_distances: DistanceFunction, points_num: int, clusters_num: int
+) -> List[int]:
+    """
+    PAM BUILD phase. The first medoid is the point with the lowest sum of distances
+    to all other points, every next medoid is the point that decreases total
+    distance between points and their nearest medoids the most.
+
+    Arguments:
+        compute_distances: function returning distances between points at given
+            positions
+        points_num: number of points
+        clusters_num: number of medoids
+
+    Return:
+        List of medoids' positions.
+
+    """
+    all_points = np.arange(points_num)
+    nearest_distances = np.full(points_num, np.inf)
+    medoids = []
+    for _ in range(clusters_num):
+        gains = np.empty(points_num)
+        for start in range(0, points_num, ROWS_BLOCK_SIZE):
+            candidates = all_points[start : start + ROWS_BLOCK_SIZE]
+            gains[candidates] = compute_build_gains(
+                compute_distances(candidates, all_points), nearest_distances
+            )
+        gains[medoids] = -np.inf
+
+        medoid = int(np.argmax(gains))
+        medoids.append(medoid)
+        nearest_distances = np.minimum(
+            nearest_distances, compute_distances(np.array([medoid]), all_points)[0]
+        )
+
+    return medoids
+
+
+def sample_non_medoids(points_num: int, medoids: List[int], size: int) -> List[int]:
+    """
+    Draw `size` distinct positions of points that are not medoids, without
+    building the list of all non-medoids. Positions are drawn from all points with
+    `size + len(medoids)` extra places for medoids, which are skipped, so the cost
+    does not depend on n.
+
+    """
+    medoids_set = set(medoids)
+    drawn = random.sample(range(points_num), min(size + len(medoids), points_num))
+    return [position for position in drawn if position not in medoids_set][:size]
+
+
+def lab(
+    compute_distances: DistanceFunction, points_num: int, clusters_num: int
+) -> List[int]:
+    """
+    Linear Approximative BUILD (Schubert & Rousseeuw 2019). Each medoid is chosen
+    like in BUILD, but both candidates and points used to compute gains come from a
+    fresh random subset of 10 + ceil(sqrt(n)) non-medoids, so the cost is linear in n.
+
+    Return:
+        List of medoids' positions.
+
+    """
+    subset_size = 10 + math.ceil(math.sqrt(points_num))
+    medoids = []
+    for _ in range(clusters_num):
+        subset = np.array(sorted(sample_non_medoids(points_num, medoids, subset_size)))
+
+        nearest_distances = np.full(len(subset), np.inf)
+        if medoids:
+            nearest_distances = compute_distances(np.array(medoids), subset).min(axis=0)
+
+        gains = compute_build_gains(
+            compute_distances(subset, subset), nearest_distances
+        )
+        medoids.append(int(subset[np.argmax(gains)]))
+
+    return medoids
+
+
+def k_medoids_plus_plus(
+    compute_distances: DistanceFunction, points_num: int, clusters_num: int
+) -> List[int]:
+    """
+    k-medoids++ seeding. The first medoid is chosen at random, every next medoid is
+    sampled with probability proportional to the squared distance between a point
+    and its nearest medoid.
+
+    Return:
+        List of medoids' positions.
+
+    """
+    all_points = np.arange(points_num)
+    medoids = [random.randrange(points_num)]
+    nearest_distances = compute_distances(np.array(medoids), all_points)[0]
+    for _ in range(clusters_num - 1):
+        weights = np.square(nearest_distances)
+        if not weights.sum() > 0:
+            # all points are covered, choose any point that is not a medoid
+            medoid = sample_non_medoids(points_num, medoids, 1)[0]
+        else:
+            medoid = random.choices(range(points_num), weights=weights)[0]
+        medoids.append(medoid)
+        nearest_distances = np.minimum(
+            nearest_distances, compute_distances(np.array([medoid]), all_points)[0]
+        )
+
+    return medoids
+
+
+INITIALIZERS = {
+    "build": build,
+    "lab": lab,
+    "k-medoids++": k_medoids_plus_plus,
+}
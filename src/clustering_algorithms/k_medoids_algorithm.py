@@ -1,27 +1,409 @@
+import contextlib
+import logging
 import random
-from typing import List
+from typing import List, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from clustering_algorithms.point import Point
+from clustering_algorithms.distance_matrix import DistanceMatrix
+from clustering_algorithms.distances import (
+    PRECOMPUTED,
+    DistanceKernel,
+    get_metric,
+    get_minkowski_p,
+)
+from clustering_algorithms.initialization import INITIALIZERS
+from clustering_algorithms.medoids_index import (
+    INDEX_MAX_DIMENSIONS,
+    INDEX_MIN_CLUSTERS,
+    MEDOIDS_INDEXES,
+    MedoidsIndex,
+)
+from clustering_algorithms.memory_planner import (
+    CONDENSED,
+    FULL,
+    ROW_CACHE,
+    MemoryPlan,
+    plan_memory,
+)
+from clustering_algorithms.point import Point, get_coordinates_array
+from clustering_algorithms.point_set import MISSING, PointSet
+from clustering_algorithms.row_cache import DistanceRowCache
+from clustering_algorithms.shared_arrays import SharedArray
+from clustering_algorithms.telemetry import (
+    ASSIGNMENT,
+    DISTANCE_COMPUTATIONS,
+    Callback,
+    Telemetry,
+)
+from clustering_algorithms.vectorized import (
+    assign_to_medoids_blocked,
+    assign_to_medoids_in_blocks,
+)
+
+# "python" evaluates everything point by point, "numpy" uses batched array operations
+ENGINES = ("python", "numpy")
+
+# "random" samples medoids uniformly, the rest are defined in initialization.py.
+# init=None skips initialization, medoids_indices need to be set before the run.
+INITIALIZATIONS = ("random", *INITIALIZERS)
+
+# number of new points assigned to medoids at once by `predict`
+PREDICT_BLOCK_SIZE = 4096
+
+# number of points assigned to medoids at once by `assign_coordinates`
+ROWS_BLOCK_SIZE = 1024
+
+# maximal number of coordinates differences created at once by
+# `compute_distance_rows`
+DISTANCE_ROWS_BLOCK_ELEMENTS = 1 << 22
+
+# metrics assigned by `vectorized.assign_to_medoids_blocked`, name -> squared
+BLAS_METRICS = {"euclidean": False, "sqeuclidean": True}
+
+# attributes with data of all points, which are replaced with shared memory while
+# the algorithm is pickled inside `shared_data` context
+SHARED_STATE = (
+    "points",
+    "positions",
+    "_coordinates",
+    "medoids_mask",
+    "medoids_positions",
+    "nearest",
+    "nearest_distances",
+    "second_nearest",
+    "second_nearest_distances",
+    "row_cache",
+)
+
+# context used instead of telemetry phases when telemetry is disabled
+NO_PHASE = contextlib.nullcontext()
+
+logger = logging.getLogger(__name__)
+
+
+def get_points_from_distance_matrix(distance_matrix: DistanceMatrix) -> List[Point]:
+    """
+    Prepare points without coordinates for a precomputed distance matrix. Point's
+    idx is equal to its position in the matrix.
+
+    """
+    return [
+        Point(idx=idx, coordinates=np.empty(0), coordinates_names=[])
+        for idx in range(len(distance_matrix))
+    ]
 
 
 class KMedoidsAlgorithm:
+    # swap strategy of the numpy engine, used by the memory planner (PAM sets it
+    # before calling this constructor)
+    swap_strategy = "pam"
+
     def __init__(
-        self, points: List[Point], clusters_num: int = 2, labels: List["str"] = None
+        self,
+        points: List[Point] = None,
+        clusters_num: int = 2,
+        labels: List["str"] = None,
+        engine: str = "python",
+        distance_matrix: DistanceMatrix = None,
+        init: str = "random",
+        callbacks: List[Callback] = None,
+        telemetry: Telemetry = None,
+        medoids_index: str = "auto",
+        metric: Union[str, DistanceKernel] = "euclidean",
+        p: float = None,
+        row_cache_size: int = None,
+        memory_budget: Union[int, str] = None,
     ):
         if labels and not len(labels) == clusters_num:
             raise ValueError(
                 "Number of labels needs to be the same as the number of clusters."
             )
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine ({engine}). Available: {ENGINES}.")
+        if init is not None and init not in INITIALIZATIONS:
+            raise ValueError(
+                f"Unknown initialization ({init}). Available: {INITIALIZATIONS}."
+            )
+
+        if medoids_index not in MEDOIDS_INDEXES:
+            raise ValueError(
+                f"Unknown medoids index ({medoids_index}). Available: {MEDOIDS_INDEXES}."
+            )
+        if medoids_index == "kdtree" and engine != "numpy":
+            # python engine is the reference implementation, it always compares
+            # points with all medoids
+            raise ValueError("Medoids index can be used only by numpy engine.")
+
+        if metric == PRECOMPUTED and distance_matrix is None:
+            raise ValueError("Precomputed metric requires distance matrix.")
+        if metric not in ("euclidean", PRECOMPUTED) and engine != "numpy":
+            raise ValueError(f"Metric {metric} requires numpy engine.")
+
+        if distance_matrix is not None:
+            if engine != "numpy":
+                raise ValueError("Distance matrix can be used only by numpy engine.")
+            if metric not in ("euclidean", PRECOMPUTED):
+                raise ValueError(
+                    f"Metric {metric} cannot be used with distance matrix."
+                )
+            if points is None:
+                points = get_points_from_distance_matrix(distance_matrix)
+            elif len(points) != len(distance_matrix):
+                raise ValueError(
+                    "Distance matrix needs to have the same size as list of points."
+                )
+            if medoids_index == "kdtree":
+                raise ValueError("Medoids index requires coordinates of points.")
+        elif points is None:
+            raise ValueError("Either points or distance matrix needs to be given.")
+
+        if row_cache_size is not None:
+            if engine != "numpy":
+                raise ValueError("Row cache can be used only by numpy engine.")
+            if distance_matrix is not None:
+                raise ValueError("Row cache cannot be used with distance matrix.")
+        if memory_budget is not None:
+            if engine != "numpy":
+                raise ValueError("Memory planner can be used only by numpy engine.")
+            if distance_matrix is not None or row_cache_size is not None:
+                raise ValueError(
+                    "Memory planner cannot be used with distance matrix or row cache."
+                )
+
+        if distance_matrix is None:
+            distance_function = get_metric(metric, p)
+            # KD-tree measures distances with Minkowski norms only
+            minkowski_p = get_minkowski_p(metric, p)
+            if medoids_index == "kdtree" and minkowski_p is None:
+                raise ValueError(f"Medoids index cannot be used with metric {metric}.")
+        else:
+            distance_function = None
+            minkowski_p = None
 
         self.points = points
         self.clusters_num = clusters_num
         self.labels = labels
+        self.engine = engine
+        self.distance_matrix = distance_matrix
+        self.init = init
+        # distances between points are computed with `distance_function` or taken
+        # from `distance_matrix` for "precomputed" metric
+        self.metric = PRECOMPUTED if distance_matrix is not None else metric
+        self.p = p
+        self.distance_function = distance_function
+        self.minkowski_p = minkowski_p
+        # functions called with a record (dictionary) of every event
+        self.callbacks = list(callbacks or [])
+        # counters and timings are collected only if telemetry is given
+        self.telemetry = telemetry
+        # KD-tree over current medoids, built on first use after medoids change
+        self.medoids_index = medoids_index
+        self._medoids_index = None
+
+        # position of each point in self.points
+        if isinstance(points, PointSet):
+            self.positions = dict(zip(points.indices.tolist(), range(len(points))))
+        else:
+            self.positions = {
+                point.idx: position for position, point in enumerate(points)
+            }
+        self._coordinates = None
+        # data in shared memory used by pickled algorithm, see `shared_data`
+        self._shared = None
 
-        self.medoids_indices = self.get_initial_medoids_indices(
-            self.points, clusters_num
+        # strategy of getting distances chosen for `memory_budget` bytes ("auto"
+        # for available memory), see `memory_planner.plan_memory`
+        self.memory_plan = None
+        if memory_budget is not None:
+            self.memory_plan = self.plan_memory(
+                None if memory_budget == "auto" else memory_budget
+            )
+            if self.memory_plan.strategy in (FULL, CONDENSED):
+                condensed = self.memory_plan.strategy == CONDENSED
+                self.distance_matrix = DistanceMatrix.from_coordinates(
+                    self.coordinates,
+                    condensed=condensed,
+                    dtype=np.float32 if condensed else np.float64,
+                    metric=metric,
+                    p=p,
+                )
+            elif self.memory_plan.strategy == ROW_CACHE:
+                row_cache_size = self.memory_plan.row_cache_size
+
+        # rows of the distance matrix computed on demand and kept within
+        # `row_cache_size` bytes, used instead of the full distance matrix
+        self.row_cache = None
+        if row_cache_size is not None:
+            self.row_cache = DistanceRowCache(
+                self.compute_distance_rows, len(points), row_cache_size
+            )
+
+        if init is None:
+            # medoids are set before the run, ex. by a warm start
+            self.medoids_indices = []
+        elif init == "random":
+            self.medoids_indices = self.get_initial_medoids_indices(
+                self.points, clusters_num
+            )
+        else:
+            self.medoids_indices = [
+                self.points[position].idx
+                for position in INITIALIZERS[init](
+                    self.compute_distances, len(self.points), clusters_num
+                )
+            ]
+
+    @contextlib.contextmanager
+    def shared_data(self):
+        """
+        Context in which coordinates, indices of points and distance matrix are kept
+        in shared memory. Algorithm pickled inside the context (ex. sent to worker
+        processes) refers to shared memory instead of containing the data, worker
+        attaches to it without copying and gets PointSet with its own assignment
+        to medoids. Shared memory is freed when the context ends, data which is
+        already shared (see `PointSet.share`, `DistanceMatrix.share`) is reused.
+
+        """
+        if isinstance(self.points, PointSet):
+            coordinates_names = self.points.coordinates_names
+            shared_arrays = dict(self.points.shared_arrays)
+        else:
+            coordinates_names = self.points[0].coordinates_names
+            shared_arrays = {}
+        created = []
+        if "coordinates" not in shared_arrays:
+            shared_arrays["coordinates"] = SharedArray.from_array(self.coordinates)
+            created.append(shared_arrays["coordinates"])
+        if "indices" not in shared_arrays:
+            shared_arrays["indices"] = SharedArray.from_array(
+                np.array([point.idx for point in self.points], dtype=np.int64)
+            )
+            created.append(shared_arrays["indices"])
+
+        distance_matrix = self.distance_matrix
+        if distance_matrix is not None:
+            distance_matrix = distance_matrix.share()
+
+        self._shared = {
+            "coordinates": shared_arrays["coordinates"],
+            "indices": shared_arrays["indices"],
+            "coordinates_names": coordinates_names,
+            "distance_matrix": distance_matrix,
+        }
+        try:
+            yield
+        finally:
+            self._shared = None
+            for shared_array in created:
+                shared_array.release()
+            if distance_matrix is not self.distance_matrix:
+                distance_matrix.release_shared()
+
+    def __getstate__(self) -> dict:
+        # callbacks are called only in the main process and may not be picklable
+        state = {**self.__dict__, "callbacks": []}
+        if self._shared is not None:
+            for name in SHARED_STATE:
+                state.pop(name, None)
+            state["distance_matrix"] = self._shared["distance_matrix"]
+            # rows are not sent, the worker starts with an empty cache of this size
+            state["row_cache"] = (
+                None if self.row_cache is None else self.row_cache.max_bytes
+            )
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self._shared is None:
+            return
+        self.points = PointSet(
+            self._shared["coordinates"].array,
+            self._shared["coordinates_names"],
+            self._shared["indices"].array,
         )
+        self._coordinates = self.points.coordinates
+        self.positions = dict(
+            zip(self.points.indices.tolist(), range(len(self.points)))
+        )
+        self.medoids_indices = self._medoids_indices
+        if self.row_cache is not None:
+            self.row_cache = DistanceRowCache(
+                self.compute_distance_rows, len(self.points), self.row_cache
+            )
+        self._shared = None
+
+    def plan_memory(self, memory_budget: int = None) -> MemoryPlan:
+        """
+        Choose the fastest strategy of getting distances between self.points that
+        fits in `memory_budget` bytes (part of available memory by default). The
+        decision is logged and reported as "memory_plan" event.
+
+        Raises ValueError with estimated memory usage if no strategy fits.
+
+        """
+        points_num, dimensions = self.coordinates.shape
+        plan = plan_memory(
+            points_num,
+            dimensions,
+            self.clusters_num,
+            memory_budget,
+            swap_strategy=self.swap_strategy,
+            init=self.init,
+        )
+        logger.info("Memory plan: %s", plan)
+        self.notify(
+            "memory_plan",
+            strategy=plan.strategy,
+            estimate=plan.estimate,
+            budget=plan.budget,
+            row_cache_size=plan.row_cache_size,
+        )
+        return plan
+
+    def is_observed(self) -> bool:
+        """
+        Check if events need to be reported, so their data is worth computing.
+        """
+        return self.telemetry is not None or bool(self.callbacks)
+
+    def notify(self, event: str, **data) -> None:
+        """
+        Report the event to telemetry and callbacks. Record contains name of the
+        event, name of the algorithm, given data and current values of counters.
+
+        """
+        if not self.is_observed():
+            return
+        record = {"event": event, "algorithm": type(self).__name__, **data}
+        if self.telemetry is not None:
+            record.update(self.telemetry.counters)
+            self.telemetry.record(record)
+        for callback in self.callbacks:
+            callback(record)
+
+    def count(self, name: str, value: int = 1) -> None:
+        if self.telemetry is not None:
+            self.telemetry.count(name, value)
+
+    def phase(self, name: str):
+        """
+        Context measuring time of the `name` phase, if telemetry is enabled.
+        """
+        if self.telemetry is None:
+            return NO_PHASE
+        return self.telemetry.phase(name)
+
+    def compute_total_cost(self) -> float:
+        """
+        Sum of distances between points and their nearest medoids. Requires up-to-date
+        clusters assignment.
+
+        """
+        if self.engine == "numpy":
+            return float(self.nearest_distances.sum())
+        return float(sum(point.nearest_medoid_distance for point in self.points))
 
     @staticmethod
     def get_initial_medoids_indices(
@@ -39,9 +421,135 @@ class KMedoidsAlgorithm:
             List of points' indices.
 
         """
-        points_indices = [point.idx for point in source_points]
+        if isinstance(source_points, PointSet):
+            points_indices = source_points.indices.tolist()
+        else:
+            points_indices = [point.idx for point in source_points]
         return random.sample(points_indices, clusters_num)
 
+    @property
+    def medoids_indices(self) -> List[int]:
+        return self._medoids_indices
+
+    @medoids_indices.setter
+    def medoids_indices(self, medoids_indices: List[int]) -> None:
+        self._medoids_indices = medoids_indices
+        self._medoids_index = None
+        # medoids_mask[position] is True if point at this position is a medoid
+        self.medoids_mask = np.zeros(len(self.points), dtype=bool)
+        self.medoids_mask[[self.positions[idx] for idx in medoids_indices]] = True
+
+    def is_medoid(self, point: Point) -> bool:
+        """
+        Check if `point` is one of the medoids in constant time.
+
+        """
+        return bool(self.medoids_mask[self.positions[point.idx]])
+
+    def uses_medoids_index(self, medoids_num: int = None) -> bool:
+        """
+        Check if nearest medoids should be found with the KD-tree instead of
+        comparing points with all `medoids_num` medoids (self.clusters_num by
+        default). The index is used only by numpy engine.
+
+        """
+        if (
+            self.engine != "numpy"
+            or self.medoids_index == "linear"
+            or self.minkowski_p is None
+        ):
+            return False
+        if self.medoids_index == "kdtree":
+            return True
+        return (
+            medoids_num or self.clusters_num
+        ) >= INDEX_MIN_CLUSTERS and self.coordinates.shape[1] <= INDEX_MAX_DIMENSIONS
+
+    def get_medoids_index(self) -> MedoidsIndex:
+        """
+        KD-tree over current medoids, in the order of `get_medoids_positions`. It is
+        rebuilt only after medoids have changed.
+
+        """
+        if self._medoids_index is None:
+            self._medoids_index = MedoidsIndex(
+                self.coordinates[self.get_medoids_positions()], self.minkowski_p
+            )
+        return self._medoids_index
+
+    def query_medoids_index(
+        self, medoids_index: MedoidsIndex, coordinates: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the nearest and the second nearest medoid with the KD-tree, see
+        `MedoidsIndex.query`. Distances computed inside the tree cannot be counted,
+        only distances to the returned medoids are added to the counter.
+
+        """
+        self.count(
+            DISTANCE_COMPUTATIONS, len(coordinates) * min(2, medoids_index.medoids_num)
+        )
+        return medoids_index.query(coordinates)
+
+    def find_nearest_medoids(
+        self, rows: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the nearest and the second nearest of current medoids for points at
+        positions `rows`, see `vectorized.assign_to_medoids`. Returned positions
+        refer to `get_medoids_positions`.
+
+        """
+        medoids_positions = self.get_medoids_positions()
+        if self.uses_medoids_index():
+            return self.query_medoids_index(
+                self.get_medoids_index(), self.coordinates[rows]
+            )
+        if self.distance_matrix is None:
+            return self.assign_coordinates(
+                self.coordinates[rows], self.coordinates[medoids_positions]
+            )
+        return assign_to_medoids_in_blocks(
+            len(rows),
+            lambda block: self.compute_distances(rows[block], medoids_positions),
+            ROWS_BLOCK_SIZE,
+        )
+
+    def assign_coordinates(
+        self,
+        coordinates: np.ndarray,
+        medoids_coordinates: np.ndarray,
+        block_size: int = ROWS_BLOCK_SIZE,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the nearest and the second nearest medoid for points given by their
+        coordinates, with the configured metric. Points are processed in blocks, so
+        (n, k) matrix of distances is never created. Euclidean distances are computed
+        with matrix multiplication, see `vectorized.assign_to_medoids_blocked`.
+
+        Arguments:
+            coordinates: (n, d) array of coordinates of points
+            medoids_coordinates: (k, d) array of coordinates of medoids
+            block_size: number of points assigned at once (for metrics other than
+                Euclidean)
+
+        Return:
+            The same tuple as returned by `vectorized.assign_to_medoids`.
+
+        """
+        self.count(DISTANCE_COMPUTATIONS, len(coordinates) * len(medoids_coordinates))
+        if self.metric in BLAS_METRICS:
+            return assign_to_medoids_blocked(
+                coordinates, medoids_coordinates, squared=BLAS_METRICS[self.metric]
+            )
+        return assign_to_medoids_in_blocks(
+            len(coordinates),
+            lambda block: self.distance_function(
+                coordinates[block], medoids_coordinates
+            ),
+            block_size,
+        )
+
     def prepare_medoids(self) -> List[Point]:
         """
         Prepare list of points that have been marked as medoids.
@@ -50,16 +558,263 @@ class KMedoidsAlgorithm:
             List of medoids as Points.
 
         """
-        return [point for point in self.points if point.idx in self.medoids_indices]
+        return [self.points[position] for position in np.flatnonzero(self.medoids_mask)]
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """
+        (n, d) array with coordinates of self.points, built on first use.
+        """
+        if self._coordinates is None:
+            if isinstance(self.points, PointSet):
+                self._coordinates = self.points.coordinates
+            else:
+                self._coordinates = get_coordinates_array(self.points)
+        return self._coordinates
+
+    def get_medoids_positions(self) -> np.ndarray:
+        """
+        Prepare positions of medoids in self.points. Positions are sorted, so medoids
+        are in the same order as in `prepare_medoids`.
+
+        Return:
+            Array of medoids' positions.
+
+        """
+        return np.flatnonzero(self.medoids_mask)
+
+    def compute_distances(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+        Compute distances between points at positions `rows` and points at positions
+        `columns`.
+
+        Arguments:
+            rows: positions of points in self.points
+            columns: positions of points in self.points
+
+        Return:
+            (len(rows), len(columns)) array of distances.
+
+        """
+        if self.row_cache is not None:
+            # only rows missing in the cache are counted
+            return self.row_cache.get(rows, columns)
+        self.count(DISTANCE_COMPUTATIONS, len(rows) * len(columns))
+        if self.distance_matrix is not None:
+            return self.distance_matrix.get(rows, columns)
+        return self.distance_function(self.coordinates[rows], self.coordinates[columns])
+
+    def compute_distance_rows(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Compute distances between points at `positions` and all points, rows are
+        computed in blocks of at most DISTANCE_ROWS_BLOCK_ELEMENTS differences.
+
+        Return:
+            (len(positions), n) array of distances.
+
+        """
+        points_num, dimensions = self.coordinates.shape
+        self.count(DISTANCE_COMPUTATIONS, len(positions) * points_num)
+        block_size = max(
+            1, DISTANCE_ROWS_BLOCK_ELEMENTS // max(points_num * dimensions, 1)
+        )
+        rows = np.empty((len(positions), points_num))
+        for start in range(0, len(positions), block_size):
+            block = slice(start, start + block_size)
+            rows[block] = self.distance_function(
+                self.coordinates[positions[block]], self.coordinates
+            )
+        return rows
 
     def update_clusters_assignment(self) -> None:
         """
         Assign points to the medoids, which indices are stored in self.medoids_indices.
 
         """
-        medoids = self.prepare_medoids()
-        for point in self.points:
-            point.update_cluster_assignment(medoids)
+        with self.phase(ASSIGNMENT):
+            if self.engine == "numpy":
+                self.update_clusters_assignment_vectorized()
+                return
+
+            medoids = self.prepare_medoids()
+            self.count(DISTANCE_COMPUTATIONS, len(self.points) * len(medoids))
+            for point in self.points:
+                point.update_cluster_assignment(medoids)
+
+    def update_clusters_assignment_vectorized(self) -> None:
+        """
+        Assign points to the medoids with batched distance computation and copy the
+        assignment into points' attributes.
+
+        """
+        self.assign_medoids_vectorized()
+        self.store_assignment_in_points()
+
+    def assign_medoids_vectorized(self) -> None:
+        """
+        Assign points to the medoids with batched distance computation. Assignment is
+        stored in self.nearest, self.nearest_distances, self.second_nearest and
+        self.second_nearest_distances (positions refer to self.medoids_positions).
+        Points' attributes are not updated.
+
+        """
+        self.medoids_positions = self.get_medoids_positions()
+        (
+            self.nearest,
+            self.nearest_distances,
+            self.second_nearest,
+            self.second_nearest_distances,
+        ) = self.find_nearest_medoids(np.arange(len(self.points)))
+
+    def store_assignment_in_points(self, positions: np.ndarray = None) -> None:
+        """
+        Copy assignment computed by `assign_medoids_vectorized` into points'
+        nearest_medoid and second_nearest_medoid attributes.
+
+        Arguments:
+            positions: positions of points that should be updated, all points are
+                updated by default
+
+        """
+        if positions is None:
+            positions = np.arange(len(self.points))
+
+        if isinstance(self.points, PointSet):
+            self.store_assignment_in_point_set(positions)
+            return
+
+        medoids = [self.points[position] for position in self.medoids_positions]
+        for position in positions:
+            point = self.points[position]
+            point.nearest_medoid = medoids[self.nearest[position]]
+            point.nearest_medoid_distance = self.nearest_distances[position]
+            if self.second_nearest[position] < 0:
+                point.second_nearest_medoid = np.nan
+            else:
+                point.second_nearest_medoid = medoids[self.second_nearest[position]]
+            point.second_nearest_medoid_distance = self.second_nearest_distances[
+                position
+            ]
+
+    def store_assignment_in_point_set(self, positions: np.ndarray) -> None:
+        """
+        Copy assignment computed by `assign_medoids_vectorized` directly into arrays
+        of self.points, when points are stored in PointSet.
+
+        """
+        point_set = self.points
+        second_nearest = self.second_nearest[positions]
+        point_set.nearest_medoid[positions] = self.medoids_positions[
+            self.nearest[positions]
+        ]
+        point_set.nearest_medoid_distance[positions] = self.nearest_distances[positions]
+        point_set.second_nearest_medoid[positions] = np.where(
+            second_nearest < 0, MISSING, self.medoids_positions[second_nearest]
+        )
+        point_set.second_nearest_medoid_distance[positions] = (
+            self.second_nearest_distances[positions]
+        )
+
+    def update_clusters_assignment_after_swap(
+        self, old_medoid: Point, new_medoid: Point
+    ) -> None:
+        """
+        Update clusters assignment after `swap_medoids(old_medoid, new_medoid)`.
+        Distances to all medoids are computed again only for points whose nearest or
+        second nearest medoid has been removed, other points are compared with the
+        new medoid only.
+
+        Arguments:
+            old_medoid: medoid that has been removed
+            new_medoid: medoid that has been added
+
+        """
+        with self.phase(ASSIGNMENT):
+            if self.engine == "numpy":
+                self.update_clusters_assignment_after_swap_vectorized(
+                    self.positions[old_medoid.idx], self.positions[new_medoid.idx]
+                )
+                return
+
+            medoids = self.prepare_medoids()
+            if self.telemetry is not None:
+                # points assigned to the removed medoid compare all medoids again
+                rescanned = sum(
+                    point.nearest_medoid == old_medoid
+                    or point.second_nearest_medoid == old_medoid
+                    for point in self.points
+                )
+                self.count(
+                    DISTANCE_COMPUTATIONS,
+                    len(self.points) + rescanned * (len(medoids) - 1),
+                )
+            for point in self.points:
+                point.update_cluster_assignment_after_swap(
+                    old_medoid, new_medoid, medoids
+                )
+
+    def update_clusters_assignment_after_swap_vectorized(
+        self, old_medoid_position: int, new_medoid_position: int
+    ) -> None:
+        """
+        Batched version of `update_clusters_assignment_after_swap`. Arrays are
+        updated for all points, attributes only for points whose assignment changed.
+
+        Arguments:
+            old_medoid_position: position of removed medoid in self.points
+            new_medoid_position: position of added medoid in self.points
+
+        """
+        old_medoids_positions = self.medoids_positions
+        self.medoids_positions = self.get_medoids_positions()
+
+        # positions of medoids change after the swap, removed medoid is mapped to -1
+        mapper = np.searchsorted(self.medoids_positions, old_medoids_positions)
+        mapper[old_medoids_positions == old_medoid_position] = -1
+        new_medoid = np.searchsorted(self.medoids_positions, new_medoid_position)
+
+        nearest = mapper[self.nearest]
+        second_nearest = np.where(
+            self.second_nearest >= 0, mapper[self.second_nearest], -2
+        )
+        rescan = (nearest == -1) | (second_nearest == -1)
+        second_nearest[second_nearest == -2] = -1
+
+        new_medoid_distances = self.compute_distances(
+            np.arange(len(self.points)), np.array([new_medoid_position])
+        )[:, 0]
+        closer = ~rescan & (new_medoid_distances < self.nearest_distances)
+        second_closer = (
+            ~rescan
+            & ~closer
+            & (
+                (second_nearest < 0)
+                | (new_medoid_distances < self.second_nearest_distances)
+            )
+        )
+
+        second_nearest[closer] = nearest[closer]
+        self.second_nearest_distances[closer] = self.nearest_distances[closer]
+        nearest[closer] = new_medoid
+        self.nearest_distances[closer] = new_medoid_distances[closer]
+
+        second_nearest[second_closer] = new_medoid
+        self.second_nearest_distances[second_closer] = new_medoid_distances[
+            second_closer
+        ]
+
+        rescanned = np.flatnonzero(rescan)
+        if len(rescanned):
+            (
+                nearest[rescanned],
+                self.nearest_distances[rescanned],
+                second_nearest[rescanned],
+                self.second_nearest_distances[rescanned],
+            ) = self.find_nearest_medoids(rescanned)
+
+        self.nearest = nearest
+        self.second_nearest = second_nearest
+        self.store_assignment_in_points(np.flatnonzero(rescan | closer | second_closer))
 
     def get_labels_mapper(self) -> dict:
         """
@@ -78,6 +833,71 @@ class KMedoidsAlgorithm:
             }
         return {medoid_idx: idx for idx, medoid_idx in enumerate(self.medoids_indices)}
 
+    def predict(
+        self,
+        coordinates: np.ndarray,
+        return_distances: bool = False,
+        block_size: int = PREDICT_BLOCK_SIZE,
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Assign new points to the current medoids. Points are processed in blocks of
+        `block_size` rows, so at most (block_size, k) distances are kept in memory.
+        Ties are resolved the same way as in `update_clusters_assignment`.
+
+        Arguments:
+            coordinates: (m, d) array with coordinates of new points, in the same
+                order as coordinates of self.points
+            return_distances: if True, distances to the nearest and second nearest
+                medoid are returned as well
+            block_size: number of points assigned at once
+
+        Return:
+            Array of clusters' labels (see `get_labels_mapper`) or, with
+            `return_distances`, tuple with labels, distances to the nearest medoids
+            and distances to the second nearest medoids (nan if k == 1).
+
+        """
+        if self.coordinates.shape[1] == 0:
+            raise ValueError("Points without coordinates cannot be used to predict.")
+        coordinates = np.asarray(coordinates, dtype=float)
+        if coordinates.ndim != 2 or coordinates.shape[1] != self.coordinates.shape[1]:
+            raise ValueError(
+                f"Coordinates need to be a (m, {self.coordinates.shape[1]}) array."
+            )
+
+        medoids_positions = self.get_medoids_positions()
+        medoids_coordinates = self.coordinates[medoids_positions]
+        if self.uses_medoids_index():
+            medoids_index = self.get_medoids_index()
+        mapper = self.get_labels_mapper()
+        medoids_labels = np.array(
+            [mapper[self.points[position].idx] for position in medoids_positions]
+        )
+
+        points_num = len(coordinates)
+        labels = np.empty(points_num, dtype=medoids_labels.dtype)
+        nearest_distances = np.empty(points_num)
+        second_nearest_distances = np.empty(points_num)
+        for start in range(0, points_num, block_size):
+            block = slice(start, start + block_size)
+            if self.uses_medoids_index():
+                assignment = self.query_medoids_index(medoids_index, coordinates[block])
+            else:
+                assignment = self.assign_coordinates(
+                    coordinates[block], medoids_coordinates
+                )
+            (
+                nearest,
+                nearest_distances[block],
+                _,
+                second_nearest_distances[block],
+            ) = assignment
+            labels[block] = medoids_labels[nearest]
+
+        if return_distances:
+            return labels, nearest_distances, second_nearest_distances
+        return labels
+
     def get_result_df(self) -> pd.DataFrame:
         """
         Convert Points from self.points into DataFrame.
@@ -93,14 +913,16 @@ class KMedoidsAlgorithm:
                 * all coordinates with their names as keys
                 * cluster
         """
-        rows = {column: [] for column in self.points[0].get_data().keys()}
-        for point in self.points:
-            for key, value in point.get_data().items():
-                rows[key].append(value)
+        if isinstance(self.points, PointSet):
+            rows = self.points.get_data()
+        else:
+            rows = {column: [] for column in self.points[0].get_data().keys()}
+            for point in self.points:
+                for key, value in point.get_data().items():
+                    rows[key].append(value)
 
         result = pd.DataFrame(rows)
-        result["cluster"] = result["nearest_medoid"]
-        result["cluster"].replace(self.get_labels_mapper(), inplace=True)
+        result["cluster"] = result["nearest_medoid"].replace(self.get_labels_mapper())
 
         return result
 
@@ -111,3 +933,6 @@ class KMedoidsAlgorithm:
         """
         self.medoids_indices.remove(old_medoid.idx)
         self.medoids_indices.append(new_medoid.idx)
+        self.medoids_mask[self.positions[old_medoid.idx]] = False
+        self.medoids_mask[self.positions[new_medoid.idx]] = True
+        self._medoids_index = None
@@ -0,0 +1,215 @@
+import random
+from typing import Callable, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from clustering_algorithms.initialization import DistanceFunction
+from clustering_algorithms.k_medoids_algorithm import KMedoidsAlgorithm
+from clustering_algorithms.pam import PAM
+from clustering_algorithms.point import Point
+from clustering_algorithms.point_set import PointSet
+from clustering_algorithms.quality import (
+    silhouette,
+    simplified_silhouette,
+    total_deviation,
+)
+from clustering_algorithms.shared_arrays import SharedArray
+from clustering_algorithms.workers import resolve_n_jobs, worker_pool
+
+# scores which can be used to choose k, the higher the better
+CRITERIA = ("simplified_silhouette", "silhouette")
+
+
+def select_k(
+    points: List[Point],
+    k_range: Iterable[int],
+    algorithm: Callable[..., KMedoidsAlgorithm] = PAM,
+    criterion: str = "simplified_silhouette",
+    warm_start: bool = True,
+    n_jobs: int = 1,
+    **kwargs,
+) -> Tuple[int, pd.DataFrame]:
+    """
+    Run the algorithm for every number of clusters from `k_range` and choose the
+    one with the highest score.
+
+    Sorted numbers of clusters are split into `n_jobs` ranges, which are run in
+    parallel processes (with coordinates in shared memory). With `warm_start`, the
+    run for k starts from medoids found for the previous k in the same range,
+    extended with the farthest points one by one, and the algorithm is created
+    with init=None, so its own initialization is skipped. It requires an
+    algorithm that starts from initial medoids (PAM, CLARANS). Seeds are drawn in
+    this process, so for a given seed and `n_jobs` the result is always the same.
+
+    Arguments:
+        points: list of points or PointSet
+        k_range: numbers of clusters, at least 2
+        algorithm: function(points, clusters_num, **kwargs) creating the algorithm,
+            ex. PAM or CLARANS (it needs to be picklable if n_jobs > 1)
+        criterion: one of CRITERIA, full silhouette needs O(n^2) distance
+            computations
+        warm_start: start from medoids found for the previous smaller k
+        n_jobs: number of worker processes, -1 uses all CPUs
+        kwargs: passed to `algorithm`
+
+    Return:
+        Tuple with the best k and DataFrame indexed by k with columns "cost" (total
+        distance to the nearest medoids), "simplified_silhouette", "silhouette"
+        (only for `criterion="silhouette"`) and "medoids".
+
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"Unknown criterion ({criterion}). Available: {CRITERIA}.")
+    k_range = sorted(set(k_range))
+    if not k_range or k_range[0] < 2 or k_range[-1] > len(points):
+        raise ValueError("Numbers of clusters need to be between 2 and n.")
+    n_jobs = resolve_n_jobs(n_jobs)
+
+    if isinstance(points, PointSet):
+        coordinates = points.coordinates
+        coordinates_names = points.coordinates_names
+        indices = points.indices
+    else:
+        coordinates = np.array([point.coordinates for point in points], dtype=float)
+        coordinates_names = points[0].coordinates_names
+        indices = np.array([point.idx for point in points], dtype=np.int64)
+
+    task = {
+        "algorithm": algorithm,
+        "criterion": criterion,
+        "warm_start": warm_start,
+        "coordinates_names": coordinates_names,
+        "kwargs": kwargs,
+    }
+    seeds = {k: random.getrandbits(32) for k in k_range}
+    ranges = [
+        list(k_subrange)
+        for k_subrange in np.array_split(k_range, min(n_jobs, len(k_range)))
+    ]
+
+    if n_jobs == 1:
+        # algorithms use the global random generator, its state is restored
+        state = random.getstate()
+        try:
+            scores = evaluate_k_range(
+                {**task, "coordinates": coordinates, "indices": indices},
+                k_range,
+                seeds,
+            )
+        finally:
+            random.setstate(state)
+    else:
+        shared_coordinates = SharedArray.from_array(coordinates)
+        shared_indices = SharedArray.from_array(indices)
+        task.update(coordinates=shared_coordinates, indices=shared_indices)
+        distance_matrix = kwargs.get("distance_matrix")
+        if distance_matrix is not None:
+            task["kwargs"] = {**kwargs, "distance_matrix": distance_matrix.share()}
+        try:
+            with worker_pool(n_jobs) as executor:
+                results = executor.map(
+                    evaluate_k_range,
+                    [task] * len(ranges),
+                    ranges,
+                    [seeds] * len(ranges),
+                )
+                scores = [score for result in results for score in result]
+        finally:
+            shared_coordinates.release()
+            shared_indices.release()
+            if distance_matrix is not None:
+                task["kwargs"]["distance_matrix"].release_shared()
+
+    scores = pd.DataFrame(scores).set_index("k")
+    return int(scores[criterion].idxmax()), scores
+
+
+def evaluate_k_range(task: dict, k_range: List[int], seeds: dict) -> List[dict]:
+    """
+    Run the algorithm for increasing numbers of clusters, see `select_k`.
+
+    Return:
+        List of scores for every k.
+
+    """
+    coordinates, indices = task["coordinates"], task["indices"]
+    if isinstance(coordinates, SharedArray):
+        coordinates, indices = coordinates.array, indices.array
+
+    scores = []
+    # result for the previous k
+    medoids_positions = nearest_distances = None
+    for k in k_range:
+        random.seed(seeds[k])
+        points = PointSet(coordinates, task["coordinates_names"], indices)
+        warm_start = task["warm_start"] and medoids_positions is not None
+        kwargs = {**task["kwargs"], "init": None} if warm_start else task["kwargs"]
+        algorithm = task["algorithm"](points, k, **kwargs)
+        if warm_start:
+            algorithm.medoids_indices = [
+                int(indices[position])
+                for position in add_farthest_points(
+                    algorithm.compute_distances, medoids_positions, nearest_distances, k
+                )
+            ]
+        algorithm.run()
+        if len(algorithm.medoids_indices) != k:
+            raise ValueError(
+                f"{type(algorithm).__name__} found "
+                f"{len(algorithm.medoids_indices)} medoids for k={k}."
+            )
+
+        medoids_indices = [int(idx) for idx in algorithm.medoids_indices]
+        medoids_positions = [algorithm.positions[idx] for idx in medoids_indices]
+        nearest_distances = points.nearest_medoid_distance
+        score = {
+            "k": k,
+            "cost": total_deviation(nearest_distances),
+            "simplified_silhouette": simplified_silhouette(
+                nearest_distances, points.second_nearest_medoid_distance
+            ),
+            "medoids": medoids_indices,
+        }
+        if task["criterion"] == "silhouette":
+            score["silhouette"] = silhouette(
+                algorithm.compute_distances, points.nearest_medoid
+            )
+        scores.append(score)
+    return scores
+
+
+def add_farthest_points(
+    compute_distances: DistanceFunction,
+    medoids_positions: List[int],
+    nearest_distances: np.ndarray,
+    clusters_num: int,
+) -> List[int]:
+    """
+    Extend medoids to `clusters_num` with the point farthest from its nearest
+    medoid, one point at a time. Distances to the nearest medoid are updated after
+    each point is added.
+
+    Arguments:
+        compute_distances: function returning distances between points at given
+            positions
+        medoids_positions: positions of current medoids
+        nearest_distances: distance between each point and its nearest medoid
+        clusters_num: number of medoids to return
+
+    Return:
+        List of medoids' positions.
+
+    """
+    medoids_positions = list(medoids_positions)
+    all_points = np.arange(len(nearest_distances))
+    nearest_distances = np.array(nearest_distances, dtype=float)
+    nearest_distances[medoids_positions] = -np.inf
+    while len(medoids_positions) < clusters_num:
+        farthest = int(np.argmax(nearest_distances))
+        medoids_positions.append(farthest)
+        nearest_distances = np.minimum(
+            nearest_distances, compute_distances(np.array([farthest]), all_points)[0]
+        )
+        nearest_distances[farthest] = -np.inf
+    return medoids_positions
@@ -0,0 +1,95 @@
+from typing import Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
+
+from clustering_algorithms.vectorized import assign_to_medoids
+
+# "auto" uses the index with numpy engine if there are at least INDEX_MIN_CLUSTERS
+# medoids and at most INDEX_MAX_DIMENSIONS coordinates, "kdtree" always uses the
+# index, "linear" always compares points with all medoids
+MEDOIDS_INDEXES = ("auto", "kdtree", "linear")
+
+# for fewer medoids a linear scan is faster than querying the tree
+INDEX_MIN_CLUSTERS = 32
+
+# in more dimensions the tree prunes few medoids and is slower than a linear scan
+INDEX_MAX_DIMENSIONS = 16
+
+# number of points queried at once
+QUERY_BLOCK_SIZE = 65536
+
+
+class MedoidsIndex:
+    """
+    KD-tree over coordinates of medoids, which finds the nearest and the second
+    nearest medoid of a point without computing distances to all medoids. Supports
+    metrics given by Minkowski p-norm (Euclidean for p = 2).
+
+    """
+
+    def __init__(self, medoids_coordinates: np.ndarray, p: float = 2):
+        self.medoids_num = len(medoids_coordinates)
+        self.p = p
+        self.tree = cKDTree(medoids_coordinates)
+
+    def query(
+        self, coordinates: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the nearest and the second nearest medoid of every point. Result has the
+        same form as the result of `vectorized.assign_to_medoids`. Ties between the
+        two nearest medoids are resolved in favour of the medoid that comes first.
+
+        Arguments:
+            coordinates: (n, d) array of coordinates of points
+
+        Return:
+            Tuple with four arrays of length n:
+                * position of the nearest medoid
+                * distance to the nearest medoid
+                * position of the second nearest medoid (-1 if there is only one
+                  medoid)
+                * distance to the second nearest medoid (nan if there is only one
+                  medoid)
+
+        """
+        points_num = len(coordinates)
+        if self.medoids_num < 2:
+            distances, nearest = self.tree.query(coordinates, k=1, p=self.p)
+            return (
+                nearest.astype(np.intp),
+                distances,
+                np.full(points_num, -1, dtype=np.intp),
+                np.full(points_num, np.nan),
+            )
+
+        # the third medoid shows if the second nearest one is tied with others
+        neighbours_num = min(3, self.medoids_num)
+        distances = np.empty((points_num, neighbours_num))
+        medoids = np.empty((points_num, neighbours_num), dtype=np.intp)
+        for start in range(0, points_num, QUERY_BLOCK_SIZE):
+            block = slice(start, start + QUERY_BLOCK_SIZE)
+            distances[block], medoids[block] = self.tree.query(
+                coordinates[block], k=neighbours_num, p=self.p
+            )
+
+        # the tree does not guarantee any order of equally distant medoids, so
+        # points with ties are compared with all medoids
+        tied = distances[:, 0] == distances[:, 1]
+        if neighbours_num == 3:
+            tied |= distances[:, 1] == distances[:, 2]
+        tied = np.flatnonzero(tied)
+        nearest, nearest_distances = medoids[:, 0], distances[:, 0]
+        second_nearest, second_nearest_distances = medoids[:, 1], distances[:, 1]
+        if len(tied):
+            (
+                nearest[tied],
+                nearest_distances[tied],
+                second_nearest[tied],
+                second_nearest_distances[tied],
+            ) = assign_to_medoids(
+                cdist(coordinates[tied], self.tree.data, metric="minkowski", p=self.p)
+            )
+        return nearest, nearest_distances, second_nearest, second_nearest_distances
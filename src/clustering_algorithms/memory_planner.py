@@ -0,0 +1,250 @@
+import math
+import numbers
+import os
+from typing import Dict, NamedTuple, Optional
+
+from clustering_algorithms.distance_matrix import ROWS_BLOCK_SIZE
+from clustering_algorithms.initialization import ROWS_BLOCK_SIZE as BUILD_BLOCK_SIZE
+from clustering_algorithms.vectorized import CANDIDATES_BLOCK_SIZE
+
+# strategies of getting distances between points, from the fastest:
+# "full" - (n, n) float64 distance matrix computed before the run
+# "condensed" - upper triangle of the distance matrix stored as float32
+# "row_cache" - rows of the matrix computed on demand, some of them are cached
+# "on_the_fly" - distances computed whenever they are needed
+FULL = "full"
+CONDENSED = "condensed"
+ROW_CACHE = "row_cache"
+ON_THE_FLY = "on_the_fly"
+STRATEGIES = (FULL, CONDENSED, ROW_CACHE, ON_THE_FLY)
+
+# bytes per point of assignment arrays kept by the algorithm and by PointSet
+ASSIGNMENT_BYTES = 64
+# bytes per point of the dictionary mapping points' indices to positions
+POSITIONS_BYTES = 96
+# bytes per point and dimension of temporary coordinates copied while points are
+# assigned to medoids
+SCRATCH_BYTES_PER_DIMENSION = 24
+# bytes per point of other temporary (n,) and (n, k) arrays of the assignment
+SCRATCH_BYTES = 256
+
+# number of candidates evaluated at once by each swap strategy
+SWAP_BLOCK_COLUMNS = {
+    "pam": CANDIDATES_BLOCK_SIZE,
+    "fastpam1": CANDIDATES_BLOCK_SIZE,
+    "fasterpam": 1,
+}
+# (n, candidates) float64 arrays alive at once in the swap kernels, including
+# distances of the block (see `vectorized.compute_swap_costs`)
+SWAP_KERNEL_ARRAYS = {"pam": 4, "fastpam1": 3, "fasterpam": 3}
+# (n, candidates) float64 arrays alive at once while distances of a block are
+# taken for each strategy, including the result, the row cache also keeps computed
+# rows and the block of the distance kernel
+DISTANCES_ARRAYS = {FULL: 1, CONDENSED: 1, ROW_CACHE: 3, ON_THE_FLY: 1}
+# (candidates, n) float64 arrays alive at once in BUILD initialization: distances
+# and gains
+BUILD_ARRAYS = 2
+
+# the row cache is used only if it can keep at least this part of the rows, with
+# fewer rows most of the distances are computed anyway and on-the-fly computation
+# is faster (a quarter of the rows takes as much memory as the condensed matrix, so
+# the cache is chosen when it can keep between 10% and 25% of the rows)
+MIN_ROW_CACHE_FRACTION = 0.1
+
+# part of available memory used when the budget is not given
+AVAILABLE_MEMORY_FRACTION = 0.8
+
+
+class MemoryPlan(NamedTuple):
+    """
+    Strategy chosen by `plan_memory` with estimated peak memory usage in bytes.
+    """
+
+    strategy: str
+    estimate: int
+    budget: int
+    # strategy -> estimated peak memory usage
+    estimates: Dict[str, int]
+    # size of the row cache in bytes, used only by "row_cache" strategy
+    row_cache_size: Optional[int] = None
+
+    def __str__(self) -> str:
+        return (
+            f"{self.strategy} (estimated {format_bytes(self.estimate)}, "
+            f"budget {format_bytes(self.budget)})"
+        )
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def get_available_memory() -> Optional[int]:
+    """
+    Memory that can be used without swapping (MemAvailable on Linux), None if it
+    cannot be read.
+
+    """
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def estimate_memory(
+    strategy: str,
+    points_num: int,
+    dimensions: int,
+    clusters_num: int,
+    row_cache_size: int = 0,
+    swap_strategy: str = "pam",
+    init: str = "random",
+) -> int:
+    """
+    Estimate peak memory used by the numpy engine of PAM. Temporary arrays of the
+    matrix building, the initialization and the swap search are modelled for the
+    distance kernels, which write distances directly into the result (all built-in
+    metrics except "cosine").
+
+    Arguments:
+        strategy: one of STRATEGIES
+        points_num: number of points
+        dimensions: number of coordinates of every point
+        clusters_num: number of medoids
+        row_cache_size: size of the row cache in bytes ("row_cache" only)
+        swap_strategy: swap strategy of PAM
+        init: initialization of PAM
+
+    Return:
+        Number of bytes.
+
+    """
+    if strategy not in DISTANCES_ARRAYS:
+        raise ValueError(
+            f"Unknown strategy ({strategy}). Available: {tuple(DISTANCES_ARRAYS)}."
+        )
+
+    def get_block_size(columns: int) -> int:
+        # bytes of (n, columns) float64 array
+        return 8 * points_num * min(columns, points_num)
+
+    # coordinates, assignment, positions and costs of all swaps of one iteration
+    base = points_num * (
+        8 * dimensions + ASSIGNMENT_BYTES + POSITIONS_BYTES + 8 * clusters_num
+    )
+    scratch = points_num * (SCRATCH_BYTES_PER_DIMENSION * dimensions + SCRATCH_BYTES)
+
+    if strategy == FULL:
+        storage = 8 * points_num * points_num
+    elif strategy == CONDENSED:
+        storage = 4 * points_num * (points_num - 1) // 2
+    elif strategy == ROW_CACHE:
+        storage = row_cache_size
+    else:
+        storage = 0
+    # matrices are computed in blocks of rows, which are copied into the matrix
+    building = get_block_size(ROWS_BLOCK_SIZE) if strategy in (FULL, CONDENSED) else 0
+
+    initialization = 0
+    if init == "build":
+        initialization = max(BUILD_ARRAYS, DISTANCES_ARRAYS[strategy]) * (
+            get_block_size(BUILD_BLOCK_SIZE)
+        )
+
+    block_size = get_block_size(SWAP_BLOCK_COLUMNS[swap_strategy])
+    swap = max(SWAP_KERNEL_ARRAYS[swap_strategy], DISTANCES_ARRAYS[strategy])
+    swap *= block_size
+
+    return base + storage + max(building, initialization, swap) + scratch
+
+
+def plan_memory(
+    points_num: int,
+    dimensions: int,
+    clusters_num: int,
+    memory_budget: int = None,
+    swap_strategy: str = "pam",
+    init: str = "random",
+) -> MemoryPlan:
+    """
+    Choose the fastest strategy of getting distances, which fits in the budget.
+    Row cache is used only if it can keep MIN_ROW_CACHE_FRACTION of the rows, all
+    remaining memory is given to it.
+
+    Arguments:
+        points_num: number of points
+        dimensions: number of coordinates of every point
+        clusters_num: number of medoids
+        memory_budget: number of bytes, AVAILABLE_MEMORY_FRACTION of available
+            memory by default
+        swap_strategy: swap strategy of PAM
+        init: initialization of PAM
+
+    Return:
+        Chosen plan.
+
+    """
+    if memory_budget is None:
+        available_memory = get_available_memory()
+        if available_memory is None:
+            raise ValueError(
+                "Available memory cannot be read, memory budget needs to be given."
+            )
+        memory_budget = int(available_memory * AVAILABLE_MEMORY_FRACTION)
+    if isinstance(memory_budget, bool) or not isinstance(memory_budget, numbers.Real):
+        raise ValueError(
+            f'Memory budget needs to be a number of bytes or "auto", got '
+            f"{memory_budget!r}."
+        )
+    memory_budget = int(memory_budget)
+    if memory_budget <= 0:
+        raise ValueError("Memory budget needs to be positive.")
+
+    def estimate(strategy: str, row_cache_size: int = 0) -> int:
+        return estimate_memory(
+            strategy,
+            points_num,
+            dimensions,
+            clusters_num,
+            row_cache_size,
+            swap_strategy,
+            init,
+        )
+
+    row_bytes = 8 * points_num
+    min_row_cache_size = math.ceil(MIN_ROW_CACHE_FRACTION * points_num) * row_bytes
+    row_cache_size = min(
+        (memory_budget - estimate(ROW_CACHE)) // row_bytes * row_bytes,
+        points_num * row_bytes,
+    )
+    row_cache_size = max(row_cache_size, min_row_cache_size)
+    estimates = {
+        strategy: estimate(strategy, row_cache_size) for strategy in STRATEGIES
+    }
+
+    for strategy in STRATEGIES:
+        if estimates[strategy] <= memory_budget:
+            return MemoryPlan(
+                strategy,
+                estimates[strategy],
+                memory_budget,
+                estimates,
+                row_cache_size if strategy == ROW_CACHE else None,
+            )
+
+    raise ValueError(
+        f"Clustering of {points_num} points needs at least "
+        f"{format_bytes(min(estimates.values()))}, memory budget is "
+        f"{format_bytes(memory_budget)}."
+    )
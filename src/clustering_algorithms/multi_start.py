@@ -0,0 +1,227 @@
+import random
+from concurrent.futures import as_completed
+from typing import List, Optional, Tuple, Union
+
+from clustering_algorithms.distance_matrix import DistanceMatrix
+from clustering_algorithms.distances import DistanceKernel
+from clustering_algorithms.k_medoids_algorithm import (
+    INITIALIZATIONS,
+    KMedoidsAlgorithm,
+)
+from clustering_algorithms.pam import PAM
+from clustering_algorithms.point import Point
+from clustering_algorithms.point_set import PointSet
+from clustering_algorithms.telemetry import STARTS, Callback, Telemetry
+from clustering_algorithms.workers import call_in_worker, resolve_n_jobs, worker_pool
+
+# initializations which give the same medoids for every seed
+DETERMINISTIC_INITIALIZATIONS = ("build",)
+
+
+class MultiStartPAM(KMedoidsAlgorithm):
+    """
+    PAM run `starts_num` times from different random initial medoids, the medoids
+    with the lowest total cost are kept. Starts are independent, so they can be run
+    in `n_jobs` worker processes. Initialization needs to be random ("random",
+    "lab" or "k-medoids++").
+
+    """
+
+    def __init__(
+        self,
+        points: List[Point] = None,
+        clusters_num: int = 2,
+        labels: List["str"] = None,
+        starts_num: int = 4,
+        engine: str = "python",
+        distance_matrix: DistanceMatrix = None,
+        swap_strategy: str = "pam",
+        init: str = "random",
+        n_jobs: int = 1,
+        target_cost: float = None,
+        callbacks: List[Callback] = None,
+        telemetry: Telemetry = None,
+        medoids_index: str = "auto",
+        metric: Union[str, DistanceKernel] = "euclidean",
+        p: float = None,
+        max_iter: int = None,
+        time_budget: float = None,
+        tol: float = 0.0,
+    ):
+        if init not in INITIALIZATIONS:
+            raise ValueError(
+                f"Unknown initialization ({init}). Available: {INITIALIZATIONS}."
+            )
+        if init in DETERMINISTIC_INITIALIZATIONS:
+            raise ValueError(
+                f"Initialization {init} is deterministic, every start would find "
+                "the same medoids."
+            )
+
+        # initial medoids are chosen by every start, so the global random
+        # generator is not used before seeds are drawn
+        super().__init__(
+            points=points,
+            clusters_num=clusters_num,
+            labels=labels,
+            engine=engine,
+            distance_matrix=distance_matrix,
+            init=None,
+            callbacks=callbacks,
+            telemetry=telemetry,
+            medoids_index=medoids_index,
+            metric=metric,
+            p=p,
+        )
+        if starts_num < 1:
+            raise ValueError("Number of starts needs to be positive.")
+
+        self.starts_num = starts_num
+        # number of worker processes, -1 uses all CPUs
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        # starts that have not been run yet are cancelled once a start finds medoids
+        # with total cost not greater than `target_cost`
+        self.target_cost = target_cost
+
+        # options of PAM run by every start
+        self.pam_options = {
+            "swap_strategy": swap_strategy,
+            "init": init,
+            "medoids_index": medoids_index,
+            "metric": self.metric,
+            "p": p,
+            "max_iter": max_iter,
+            "time_budget": time_budget,
+            "tol": tol,
+        }
+
+        # total cost found by every start (None if the start was cancelled), index
+        # of the best start and its cost
+        self.costs: List[Optional[float]] = []
+        self.best_start = None
+        self.cost = None
+
+    def get_start_points(self) -> PointSet:
+        """
+        Points clustered by a single start, with coordinates of self.points (not
+        copied) and separate assignment to medoids.
+
+        """
+        if isinstance(self.points, PointSet):
+            return PointSet(
+                self.points.coordinates,
+                self.points.coordinates_names,
+                self.points.indices,
+            )
+        return PointSet(
+            self.coordinates,
+            self.points[0].coordinates_names,
+            [point.idx for point in self.points],
+        )
+
+    def run_start(self, seed: int) -> Tuple[List[int], float, Optional[Telemetry]]:
+        """
+        Run PAM with the global random generator seeded with `seed`.
+
+        Return:
+            Tuple with medoids' indices, their total cost and telemetry collected by
+            PAM (None if telemetry is disabled).
+
+        """
+        random.seed(seed)
+        telemetry = Telemetry() if self.telemetry is not None else None
+        pam = PAM(
+            points=self.get_start_points(),
+            clusters_num=self.clusters_num,
+            labels=self.labels,
+            engine=self.engine,
+            distance_matrix=self.distance_matrix,
+            telemetry=telemetry,
+            **self.pam_options,
+        )
+        pam.run()
+        return list(pam.medoids_indices), pam.cost, telemetry
+
+    def is_target_reached(self, cost: float) -> bool:
+        return self.target_cost is not None and cost <= self.target_cost
+
+    def run_starts(
+        self, seeds: List[int]
+    ) -> List[Optional[Tuple[List[int], float, Optional[Telemetry]]]]:
+        """
+        Run PAM with every seed, until the target cost is reached.
+
+        Return:
+            Result of `run_start` for every seed, None for cancelled starts.
+
+        """
+        results = [None] * len(seeds)
+        if self.n_jobs == 1:
+            # PAM uses the global random generator, its state is restored afterwards
+            state = random.getstate()
+            try:
+                for start, seed in enumerate(seeds):
+                    results[start] = self.run_start(seed)
+                    if self.is_target_reached(results[start][1]):
+                        break
+            finally:
+                random.setstate(state)
+            return results
+
+        # workers attach to data in shared memory instead of receiving a copy
+        with self.shared_data(), worker_pool(self.n_jobs, self) as executor:
+            futures = {
+                executor.submit(call_in_worker, "run_start", seed): start
+                for start, seed in enumerate(seeds)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if self.is_target_reached(future.result()[1]):
+                    # starts that are already running cannot be cancelled
+                    for other_future in futures:
+                        other_future.cancel()
+                    break
+
+            for future, start in futures.items():
+                if results[start] is None and not future.cancelled():
+                    results[start] = future.result()
+        return results
+
+    def run(self) -> None:
+        """
+        Run all starts and keep the medoids with the lowest total cost. Use
+        get_result_df() to fetch the results, costs of all starts are stored in
+        self.costs.
+
+        Seeds are drawn in this process, so without `target_cost` the result is the
+        same no matter how many jobs are used.
+
+        """
+        seeds = [random.getrandbits(32) for _ in range(self.starts_num)]
+        with self.phase(STARTS):
+            results = self.run_starts(seeds)
+
+        self.costs = []
+        best_medoids = None
+        for start, result in enumerate(results):
+            if result is None:
+                self.costs.append(None)
+                continue
+
+            medoids_indices, cost, start_telemetry = result
+            self.costs.append(cost)
+            if start_telemetry is not None:
+                self.telemetry.merge(start_telemetry, start=start)
+            self.notify(
+                "start",
+                start=start,
+                cost=cost,
+                medoids=[int(idx) for idx in medoids_indices],
+            )
+            if best_medoids is None or cost < self.costs[self.best_start]:
+                best_medoids = medoids_indices
+                self.best_start = start
+
+        self.medoids_indices = list(best_medoids)
+        self.update_clusters_assignment()
+        self.cost = self.compute_total_cost()
@@ -1,16 +1,113 @@
-from typing import List, Tuple
+import logging
+import time
+from typing import List, Tuple, Union
 
+import numpy as np
+
+from clustering_algorithms.distance_matrix import DistanceMatrix
+from clustering_algorithms.distances import DistanceKernel
 from clustering_algorithms.k_medoids_algorithm import KMedoidsAlgorithm
 from clustering_algorithms.point import Point
+from clustering_algorithms.telemetry import (
+    DISTANCE_COMPUTATIONS,
+    SWAP_CANDIDATES,
+    SWAP_SEARCH,
+    Callback,
+    Telemetry,
+)
+from clustering_algorithms.vectorized import (
+    CANDIDATES_BLOCK_SIZE,
+    compute_swap_costs,
+    compute_swap_costs_fastpam1,
+)
+
+# "pam" - the best swap of the whole iteration, each medoid evaluated separately
+# "fastpam1" - the same swap, costs of all medoids computed in one pass per candidate
+# "fasterpam" - the first improving swap is applied immediately (eager)
+SWAP_STRATEGIES = ("pam", "fastpam1", "fasterpam")
+
+# reasons of stopping the run, stored in PAM.stop_reason
+CONVERGED = "converged"  # there is no swap that lowers the cost
+MAX_ITER = "max_iter"  # `max_iter` iterations have been done
+TIME_BUDGET = "time_budget"  # `time_budget` seconds have passed
+TOLERANCE = "tol"  # the last iteration lowered the cost less than `tol`
+
+logger = logging.getLogger(__name__)
 
 
 class PAM(KMedoidsAlgorithm):
     def __init__(
-        self, points: List[Point], clusters_num: int = 2, labels: List["str"] = None
+        self,
+        points: List[Point] = None,
+        clusters_num: int = 2,
+        labels: List["str"] = None,
+        engine: str = "python",
+        distance_matrix: DistanceMatrix = None,
+        swap_strategy: str = "pam",
+        init: str = "random",
+        callbacks: List[Callback] = None,
+        telemetry: Telemetry = None,
+        medoids_index: str = "auto",
+        metric: Union[str, DistanceKernel] = "euclidean",
+        p: float = None,
+        max_iter: int = None,
+        time_budget: float = None,
+        tol: float = 0.0,
+        row_cache_size: int = None,
+        memory_budget: Union[int, str] = None,
     ):
-        super().__init__(points=points, clusters_num=clusters_num, labels=labels)
+        if swap_strategy not in SWAP_STRATEGIES:
+            raise ValueError(
+                f"Unknown swap strategy ({swap_strategy}). "
+                f"Available: {SWAP_STRATEGIES}."
+            )
+        if swap_strategy != "pam" and engine != "numpy":
+            raise ValueError(f"Swap strategy {swap_strategy} requires numpy engine.")
+        # swap kernels' temporary arrays are part of the memory plan
+        self.swap_strategy = swap_strategy
+        super().__init__(
+            points=points,
+            clusters_num=clusters_num,
+            labels=labels,
+            engine=engine,
+            distance_matrix=distance_matrix,
+            init=init,
+            callbacks=callbacks,
+            telemetry=telemetry,
+            medoids_index=medoids_index,
+            metric=metric,
+            p=p,
+            row_cache_size=row_cache_size,
+            memory_budget=memory_budget,
+        )
+        if max_iter is not None and max_iter < 1:
+            raise ValueError("Maximal number of iterations needs to be positive.")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("Time budget needs to be positive.")
+        if tol < 0:
+            raise ValueError("Tolerance cannot be negative.")
+
         self.medoids = self.prepare_medoids()
 
+        # the run stops after `max_iter` iterations, after `time_budget` seconds or
+        # when an iteration lowers the cost by less than `tol` * cost, the medoids
+        # found so far are kept
+        self.max_iter = max_iter
+        self.time_budget = time_budget
+        self.tol = tol
+        self.deadline = None
+
+        # number of iterations, reason of stopping and total cost of the last run
+        self.iterations = 0
+        self.stop_reason = None
+        self.cost = None
+
+    def is_time_up(self) -> bool:
+        """
+        Check if the time budget of the current run has been used.
+        """
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
     def compute_replacement_cost(self, old_medoid: Point, new_medoid: Point) -> float:
         """
         Compute cost replacing `old_medoid` with `new_medoid`.
@@ -23,11 +120,16 @@ class PAM(KMedoidsAlgorithm):
             Total cost of replacing `old_medoid` with `new_medoid`.
 
         """
+        # distance to `new_medoid` is computed for every point except other medoids
+        self.count(DISTANCE_COMPUTATIONS, len(self.points) - len(self.medoids) + 1)
+        old_medoid_position = self.positions[old_medoid.idx]
+        medoids_mask = self.medoids_mask.tolist()
         cost = 0
-        for point in self.points:
-            if point not in self.medoids or point is old_medoid:
+        for position, point in enumerate(self.points):
+            is_medoid = medoids_mask[position]
+            if not is_medoid or position == old_medoid_position:
                 cost += point.compute_medoid_replacement_cost(
-                    old_medoid, new_medoid, self.medoids
+                    old_medoid, new_medoid, self.medoids, is_medoid
                 )
 
         return cost
@@ -48,38 +150,227 @@ class PAM(KMedoidsAlgorithm):
         """
         replacements = []
         for new_medoid in self.points:
-            if new_medoid not in self.medoids and new_medoid is not old_medoid:
+            if not self.is_medoid(new_medoid) and new_medoid != old_medoid:
+                self.count(SWAP_CANDIDATES)
                 cost = self.compute_replacement_cost(old_medoid, new_medoid)
                 replacements.append({"cost": cost, "new_medoid": new_medoid})
 
         best_replacement = min(replacements, key=lambda x: x["cost"])
         return best_replacement["new_medoid"], best_replacement["cost"]
 
-    def run(self) -> None:
+    def get_best_swap(self) -> Tuple[float, Point, Point]:
         """
-        Run PAM algorithm to find the best clusters. Use pam_instance.get_result_df()
-        to fetch the results.
+        Find (old_medoid, new_medoid) pair, that gives the lowest replacement cost.
+
+        Return:
+            Tuple with cost of the replacement, medoid that should be replaced and
+            point that should replace it.
 
         """
-        iteration = 1
-        while True:
-            print(f"Iteration {iteration}")
-            iteration += 1
-            # prepare list of currently used medoids
-            self.medoids = self.prepare_medoids()
-            self.update_clusters_assignment()
+        with self.phase(SWAP_SEARCH):
+            if self.engine == "numpy":
+                return self.get_best_swap_vectorized()
 
-            # get the best replacement for each medoid
+            # get the best replacement for each medoid, if the time is up, only
+            # medoids checked so far are considered
             replacements = []
             for old_medoid in self.medoids:
                 new_medoid, cost = self.get_best_replacement_for_medoid(old_medoid)
                 replacements.append((cost, old_medoid, new_medoid))
+                if self.is_time_up():
+                    break
+
+            return min(replacements, key=lambda x: x[0])
+
+    def get_best_swap_vectorized(self) -> Tuple[float, Point, Point]:
+        """
+        Batched version of `get_best_swap`. Costs of all (medoid, candidate) pairs are
+        computed in blocks of candidates, so distances and temporary arrays of swap
+        kernels have at most (n, CANDIDATES_BLOCK_SIZE) elements, independently of
+        the number of coordinates. If the time is up, only candidates checked so
+        far are considered. Requires up-to-date clusters assignment.
+
+        Return:
+            Tuple with cost of the replacement, medoid that should be replaced and
+            point that should replace it.
+
+        """
+        points_positions = np.arange(len(self.points))
+        costs = np.full((len(self.medoids_positions), len(self.points)), np.inf)
+        for start in range(0, len(self.points), CANDIDATES_BLOCK_SIZE):
+            candidates = points_positions[start : start + CANDIDATES_BLOCK_SIZE]
+            costs[:, candidates] = self.compute_swap_costs(candidates)
+            if self.is_time_up():
+                break
+        # medoids cannot be chosen as replacements
+        costs[:, self.medoids_positions] = np.inf
+
+        # the first minimum in row-major order, the same as in `get_best_swap`
+        medoid, candidate = np.unravel_index(np.argmin(costs), costs.shape)
+        return (
+            costs[medoid, candidate],
+            self.points[self.medoids_positions[medoid]],
+            self.points[candidate],
+        )
+
+    def compute_swap_costs(self, candidates: np.ndarray) -> np.ndarray:
+        """
+        Compute cost of replacing each medoid with each of `candidates`, using the
+        kernel of the chosen swap strategy.
+
+        Arguments:
+            candidates: positions of candidates in self.points
+
+        Return:
+            (k, len(candidates)) array of replacement costs.
+
+        """
+        self.count(SWAP_CANDIDATES, len(self.medoids_positions) * len(candidates))
+        candidates_distances = self.compute_distances(
+            np.arange(len(self.points)), candidates
+        )
+        if self.swap_strategy == "pam":
+            return compute_swap_costs(
+                candidates_distances,
+                self.nearest,
+                self.nearest_distances,
+                self.second_nearest_distances,
+                self.medoids_positions,
+            )
+        return compute_swap_costs_fastpam1(
+            candidates_distances,
+            self.nearest,
+            self.nearest_distances,
+            self.second_nearest_distances,
+            len(self.medoids_positions),
+        )
+
+    def apply_eager_swaps(self) -> bool:
+        """
+        Visit every point once (FasterPAM). If replacing any medoid with the visited
+        point lowers the cost, swap the medoid giving the lowest cost immediately and
+        update clusters assignment before visiting the next point. Visiting stops
+        when the time is up.
 
-            # swap (old_medoid, new_medoid) pair, that gives the best result
-            best_replacement = min(replacements, key=lambda x: x[0])
-            self.swap_medoids(best_replacement[1], best_replacement[2])
+        Return:
+            True if at least one swap has been applied.
+
+        """
+        swapped = False
+        for candidate in range(len(self.points)):
+            if candidate in self.medoids_positions:
+                continue
 
-            # stop calculations when cost is no longer negative
-            if best_replacement[0] >= 0:
+            with self.phase(SWAP_SEARCH):
+                costs = self.compute_swap_costs(np.array([candidate]))[:, 0]
+                medoid = np.argmin(costs)
+            if costs[medoid] < 0:
+                old_medoid = self.points[self.medoids_positions[medoid]]
+                self.swap_medoids(old_medoid, self.points[candidate])
+                self.update_clusters_assignment_after_swap(
+                    old_medoid, self.points[candidate]
+                )
+                swapped = True
+            if self.is_time_up():
                 break
+
+        return swapped
+
+    def run_iteration(self) -> float:
+        """
+        Apply the best swap or, for FasterPAM, all eager swaps of one pass.
+
+        Return:
+            Decrease of the total cost, 0 if no swap lowers the cost.
+
+        """
+        # prepare list of currently used medoids
+        self.medoids = self.prepare_medoids()
+
+        if self.swap_strategy == "fasterpam":
+            cost = self.compute_total_cost()
+            if not self.apply_eager_swaps():
+                return 0.0
+            return cost - self.compute_total_cost()
+
+        cost, old_medoid, new_medoid = self.get_best_swap()
+
+        # stop calculations when cost is no longer negative
+        if cost >= 0:
+            return 0.0
+
+        # swap (old_medoid, new_medoid) pair, that gives the best result
+        self.swap_medoids(old_medoid, new_medoid)
+        self.update_clusters_assignment_after_swap(old_medoid, new_medoid)
+        return -float(cost)
+
+    def run(self) -> None:
+        """
+        Run PAM algorithm to find the best clusters. Use pam_instance.get_result_df()
+        to fetch the results. Reason of stopping is stored in self.stop_reason and
+        total cost of found medoids in self.cost.
+
+        Every swap lowers the cost, so when the run is stopped early by `max_iter`,
+        `time_budget` or `tol`, the current medoids are the best found so far.
+
+        """
+        if self.time_budget is not None:
+            self.deadline = time.perf_counter() + self.time_budget
+        self.update_clusters_assignment()
+        self.iterations = 0
+        self.stop_reason = None
+        self.cost = self.compute_total_cost()
+
+        while self.stop_reason is None:
+            if self.max_iter is not None and self.iterations >= self.max_iter:
+                self.stop_reason = MAX_ITER
+                break
+            if self.is_time_up():
+                self.stop_reason = TIME_BUDGET
+                break
+
+            self.iterations += 1
+            logger.info("Iteration %d", self.iterations)
+            improvement = self.run_iteration()
+            self.cost -= improvement
+            self.notify_iteration()
+
+            if improvement <= 0:
+                self.stop_reason = CONVERGED
+            elif improvement < self.tol * (self.cost + improvement):
+                self.stop_reason = TOLERANCE
+
+        self.deadline = None
         self.update_clusters_assignment()
+        self.cost = self.compute_total_cost()
+        logger.info("Stopped (%s), cost %f", self.stop_reason, self.cost)
+        row_cache = {}
+        if self.row_cache is not None:
+            row_cache = {
+                "row_cache_hits": self.row_cache.hits,
+                "row_cache_misses": self.row_cache.misses,
+            }
+            logger.info(
+                "Row cache: %d hits, %d misses",
+                self.row_cache.hits,
+                self.row_cache.misses,
+            )
+        self.notify(
+            "finished",
+            iterations=self.iterations,
+            cost=self.cost,
+            stop_reason=self.stop_reason,
+            **row_cache,
+        )
+
+    def notify_iteration(self) -> None:
+        """
+        Report the end of iteration with the total cost after it.
+        """
+        if self.is_observed():
+            self.notify(
+                "iteration",
+                iteration=self.iterations,
+                cost=self.cost,
+                medoids=[int(idx) for idx in self.medoids_indices],
+            )
@@ -6,18 +6,40 @@ from numpy.linalg import norm
 
 
 def get_initial_points(df: pd.DataFrame, coordinates_names=["x", "y"]):
-    points = []
-    for item in df.iterrows():
-        idx, row = item
-        coordinates = np.array([float(row[name]) for name in coordinates_names])
-        point = Point(
-            idx=idx, coordinates=coordinates, coordinates_names=coordinates_names
-        )
-        points.append(point)
-    return points
+    # coordinates of all points are converted to floats at once
+    coordinates = df[coordinates_names].to_numpy(dtype=float)
+    return [
+        Point(idx=idx, coordinates=row, coordinates_names=coordinates_names)
+        for idx, row in zip(df.index, coordinates)
+    ]
+
+
+def get_coordinates_array(points: List["Point"]) -> np.ndarray:
+    """
+    Stack coordinates of given points into a single array.
+
+    Arguments:
+        points: list of points
+
+    Return:
+        (n, d) array of floats, i-th row holds coordinates of i-th point.
+
+    """
+    return np.array([point.coordinates for point in points], dtype=float)
 
 
 class Point:
+    # no __dict__, so lists of many points and PointView objects stay small
+    __slots__ = (
+        "idx",
+        "coordinates",
+        "coordinates_names",
+        "nearest_medoid",
+        "nearest_medoid_distance",
+        "second_nearest_medoid",
+        "second_nearest_medoid_distance",
+    )
+
     def __init__(
         self, idx: int, coordinates: List[float], coordinates_names: List[str]
     ):
@@ -117,8 +139,47 @@ class Point:
                 self.second_nearest_medoid = medoid
                 self.second_nearest_medoid_distance = distance
 
-    def compute_medoid_replacement_cost(
+    def update_cluster_assignment_after_swap(
         self, old_medoid: "Point", new_medoid: "Point", medoids: List["Point"]
+    ) -> None:
+        """
+        Update point's nearest_medoid and second_nearest_medoid after `old_medoid`
+        has been replaced with `new_medoid`. Only if `old_medoid` was one of them,
+        all `medoids` are scanned again. Otherwise only distance to `new_medoid` is
+        computed.
+
+        Arguments:
+            old_medoid: medoid that has been removed
+            new_medoid: medoid that has been added
+            medoids: list of available medoids (after the swap)
+
+        """
+        if (
+            self.nearest_medoid == old_medoid
+            or self.second_nearest_medoid == old_medoid
+        ):
+            self.update_cluster_assignment(medoids)
+            return
+
+        distance = self.compute_distance(new_medoid)
+        if distance < self.nearest_medoid_distance:
+            self.second_nearest_medoid = self.nearest_medoid
+            self.second_nearest_medoid_distance = self.nearest_medoid_distance
+            self.nearest_medoid = new_medoid
+            self.nearest_medoid_distance = distance
+        elif (
+            self.second_nearest_medoid is np.nan
+            or distance < self.second_nearest_medoid_distance
+        ):
+            self.second_nearest_medoid = new_medoid
+            self.second_nearest_medoid_distance = distance
+
+    def compute_medoid_replacement_cost(
+        self,
+        old_medoid: "Point",
+        new_medoid: "Point",
+        medoids: List["Point"],
+        is_medoid: bool = None,
     ) -> float:
         """
         Compute partial cost of replacing `old_medoid` by `new_medoid`.
@@ -127,13 +188,17 @@ class Point:
             old_medoid: medoid that we want to replace
             new_medoid: point that could replace old medoid
             medoids: list of currently available medoids
+            is_medoid: whether the point is one of `medoids`, if the caller already
+                knows it (e.g. from `medoids_mask`), `medoids` are not scanned
 
         Return:
             Cost of replacing `old_medoid` with `new_medoid`.
 
         """
+        if is_medoid is None:
+            is_medoid = self in medoids
         # medoid's cluster will not change, so cost is equal to 0
-        if self in medoids and self is not old_medoid:
+        if is_medoid and self != old_medoid:
             return 0
 
         # distance to the new medoid
@@ -0,0 +1,302 @@
+from collections.abc import Sequence
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from clustering_algorithms.point import Point
+from clustering_algorithms.shared_arrays import SharedArray
+
+# arrays of PointSet, which are moved to shared memory by `PointSet.share`
+ARRAYS = (
+    "coordinates",
+    "indices",
+    "nearest_medoid",
+    "nearest_medoid_distance",
+    "second_nearest_medoid",
+    "second_nearest_medoid_distance",
+)
+
+# values stored in medoid arrays when a point has no medoid assigned
+UNASSIGNED = -1  # Point's attribute is None
+MISSING = -2  # Point's attribute is np.nan
+
+
+class PointSet(Sequence):
+    """
+    Compact container of points. Coordinates, indices and assignment to medoids are
+    kept in contiguous arrays, one row per point. Indexing and iteration return
+    `PointView` objects, which behave like `Point` but read and write the arrays,
+    so the container can be used everywhere a list of points is expected.
+
+    Medoids are stored as positions of points in the set. Views are created on the
+    first access and reused afterwards, so loops of the python engine do not
+    allocate a new object for every access.
+
+    """
+
+    def __init__(
+        self,
+        coordinates: np.ndarray,
+        coordinates_names: List[str],
+        indices: np.ndarray = None,
+    ):
+        coordinates = np.ascontiguousarray(coordinates, dtype=np.float64)
+        if coordinates.ndim != 2 or coordinates.shape[1] != len(coordinates_names):
+            raise ValueError(
+                "Coordinates need to be a (n, d) array, where d is the number of "
+                "coordinates's names."
+            )
+        points_num = len(coordinates)
+        if indices is None:
+            indices = np.arange(points_num)
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.shape != (points_num,):
+            raise ValueError("There needs to be exactly one index for each point.")
+
+        self.coordinates = coordinates
+        self.coordinates_names = list(coordinates_names)
+        self.indices = indices
+
+        self.nearest_medoid = np.full(points_num, UNASSIGNED, dtype=np.intp)
+        self.nearest_medoid_distance = np.full(points_num, np.nan)
+        self.second_nearest_medoid = np.full(points_num, UNASSIGNED, dtype=np.intp)
+        self.second_nearest_medoid_distance = np.full(points_num, np.nan)
+        # name of array -> SharedArray, if arrays are stored in shared memory
+        self.shared_arrays = {}
+        # position -> PointView, created by `get_view`
+        self.views = None
+
+    def share(self) -> "PointSet":
+        """
+        Copy all arrays (coordinates and assignment to medoids) into shared memory.
+        The copy is pickled by names of shared blocks, so worker processes attach to
+        the same memory and see each other's changes of the assignment. Use
+        `release_shared` to free the memory.
+
+        Return:
+            PointSet with arrays in shared memory.
+
+        """
+        if self.shared_arrays:
+            return self
+        point_set = PointSet.__new__(PointSet)
+        point_set.coordinates_names = list(self.coordinates_names)
+        point_set.views = None
+        point_set.shared_arrays = {
+            name: SharedArray.from_array(getattr(self, name)) for name in ARRAYS
+        }
+        for name, shared_array in point_set.shared_arrays.items():
+            setattr(point_set, name, shared_array.array)
+        return point_set
+
+    def release_shared(self) -> None:
+        """
+        Free shared memory used by the arrays, the set cannot be used afterwards.
+        """
+        for name, shared_array in self.shared_arrays.items():
+            setattr(self, name, None)
+            shared_array.release()
+        self.shared_arrays = {}
+
+    def __getstate__(self) -> dict:
+        # shared arrays are attached again after unpickling
+        state = dict(self.__dict__)
+        for name in self.shared_arrays:
+            state[name] = None
+        state["views"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        for name, shared_array in self.shared_arrays.items():
+            setattr(self, name, shared_array.array)
+
+    @classmethod
+    def from_dataframe(
+        cls, df: pd.DataFrame, coordinates_names: List[str] = ["x", "y"]
+    ) -> "PointSet":
+        """
+        Build PointSet from `coordinates_names` columns of `df` in one step. Index of
+        `df` is used as points' indices.
+
+        """
+        return cls(
+            coordinates=df[coordinates_names].to_numpy(dtype=float),
+            coordinates_names=coordinates_names,
+            indices=df.index.to_numpy(),
+        )
+
+    @classmethod
+    def from_points(cls, points: List[Point]) -> "PointSet":
+        """
+        Copy coordinates and indices of given points into a new PointSet. Assignment
+        to medoids is not copied.
+
+        """
+        return cls(
+            coordinates=np.array([point.coordinates for point in points], dtype=float),
+            coordinates_names=points[0].coordinates_names,
+            indices=[point.idx for point in points],
+        )
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[item] for item in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("PointSet index out of range")
+        return self.get_view(position)
+
+    def __iter__(self) -> Iterator["PointView"]:
+        # loops of the python engine iterate over all points many times, so views
+        # are taken from the list directly instead of going through __getitem__
+        if self.views is None:
+            self.views = [None] * len(self)
+        views = self.views
+        for position, view in enumerate(views):
+            if view is None:
+                view = views[position] = PointView(self, position)
+            yield view
+
+    def get_view(self, position: int) -> "PointView":
+        """
+        View of the point at `position`, the same object is returned every time.
+        """
+        if self.views is None:
+            self.views = [None] * len(self)
+        view = self.views[position]
+        if view is None:
+            view = self.views[position] = PointView(self, position)
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by the arrays.
+        """
+        return sum(getattr(self, name).nbytes for name in ARRAYS)
+
+    def get_data(self) -> dict:
+        """
+        Get info about all points at once, the same as `Point.get_data` does for a
+        single point.
+
+        Return:
+            Dictionary with arrays:
+                * idx
+                * nearest_medoid
+                * nearest_medoid_distance
+                * second_nearest_medoid
+                * second_nearest_medoid_distance
+                * all coordinates with their names as keys
+
+        """
+        if (self.nearest_medoid < 0).any() or (self.second_nearest_medoid < 0).any():
+            raise ValueError("All points need to have two nearest medoids assigned.")
+
+        data = {
+            "idx": self.indices,
+            "nearest_medoid": self.indices[self.nearest_medoid],
+            "nearest_medoid_distance": self.nearest_medoid_distance,
+            "second_nearest_medoid": self.indices[self.second_nearest_medoid],
+            "second_nearest_medoid_distance": self.second_nearest_medoid_distance,
+        }
+        data.update(
+            {
+                name: self.coordinates[:, column]
+                for column, name in enumerate(self.coordinates_names)
+            }
+        )
+        return data
+
+
+def medoid_property(name: str) -> property:
+    """
+    Property exposing a medoid stored in the `name` array of PointSet as PointView.
+    """
+
+    def getter(view: "PointView"):
+        position = getattr(view.point_set, name)[view.position]
+        if position == UNASSIGNED:
+            return None
+        if position == MISSING:
+            return np.nan
+        return view.point_set.get_view(position)
+
+    def setter(view: "PointView", medoid):
+        if medoid is None:
+            position = UNASSIGNED
+        elif medoid is np.nan:
+            position = MISSING
+        elif isinstance(medoid, PointView) and medoid.point_set is view.point_set:
+            position = medoid.position
+        else:
+            raise ValueError("Medoid needs to be a point from the same PointSet.")
+        getattr(view.point_set, name)[view.position] = position
+
+    return property(getter, setter)
+
+
+def array_property(name: str) -> property:
+    """
+    Property exposing the value stored in the `name` array of PointSet.
+    """
+
+    def getter(view: "PointView"):
+        return getattr(view.point_set, name)[view.position]
+
+    def setter(view: "PointView", value):
+        getattr(view.point_set, name)[view.position] = (
+            np.nan if value is None else value
+        )
+
+    return property(getter, setter)
+
+
+class PointView(Point):
+    """
+    Lightweight view of a single point stored in PointSet. It has no __dict__ and
+    slots of Point are not used, values are read from arrays of the set. Views of
+    the same point are equal, even if they are different objects.
+
+    """
+
+    __slots__ = ("point_set", "position")
+
+    def __init__(self, point_set: PointSet, position: int):
+        self.point_set = point_set
+        self.position = int(position)
+
+    def __eq__(self, other):
+        if not isinstance(other, PointView):
+            return NotImplemented
+        return self.point_set is other.point_set and self.position == other.position
+
+    def __hash__(self):
+        return hash((id(self.point_set), self.position))
+
+    def __reduce__(self):
+        # slots of Point are shadowed by properties, only the position is pickled
+        return PointView, (self.point_set, self.position)
+
+    @property
+    def idx(self) -> int:
+        return int(self.point_set.indices[self.position])
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        return self.point_set.coordinates[self.position]
+
+    @property
+    def coordinates_names(self) -> List[str]:
+        return self.point_set.coordinates_names
+
+    nearest_medoid = medoid_property("nearest_medoid")
+    second_nearest_medoid = medoid_property("second_nearest_medoid")
+    nearest_medoid_distance = array_property("nearest_medoid_distance")
+    second_nearest_medoid_distance = array_property("second_nearest_medoid_distance")
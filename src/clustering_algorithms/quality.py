@@ -0,0 +1,299 @@
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+
+from clustering_algorithms.initialization import DistanceFunction
+from clustering_algorithms.point_set import PointSet
+
+if TYPE_CHECKING:
+    from clustering_algorithms.k_medoids_algorithm import KMedoidsAlgorithm
+
+# number of rows of the distance matrix computed at once by `silhouette`
+SILHOUETTE_BLOCK_SIZE = 256
+
+# number of points processed at once by `davies_bouldin`
+POINTS_BLOCK_SIZE = 65536
+
+
+def get_silhouette_values(own: np.ndarray, other: np.ndarray) -> np.ndarray:
+    """
+    (b - a) / max(a, b) for every point, 0 if both distances are 0.
+    """
+    denominators = np.maximum(own, other)
+    return np.divide(
+        other - own,
+        denominators,
+        out=np.zeros_like(denominators, dtype=float),
+        where=denominators > 0,
+    )
+
+
+def simplified_silhouette(
+    nearest_distances: np.ndarray, second_nearest_distances: np.ndarray
+) -> float:
+    """
+    Mean simplified silhouette, in which mean distances to points of the own and
+    of the nearest other cluster are replaced with distances to the nearest and to
+    the second nearest medoid. It needs no additional distance computations.
+
+    Arguments:
+        nearest_distances: distance between each point and its nearest medoid
+        second_nearest_distances: distance between each point and its second
+            nearest medoid
+
+    Return:
+        Value between -1 and 1, the higher the better.
+
+    """
+    return float(
+        get_silhouette_values(
+            np.asarray(nearest_distances), np.asarray(second_nearest_distances)
+        ).mean()
+    )
+
+
+def silhouette(
+    compute_distances: DistanceFunction,
+    labels: np.ndarray,
+    block_size: int = SILHOUETTE_BLOCK_SIZE,
+) -> float:
+    """
+    Mean silhouette of all points. Distances are computed in blocks of
+    `block_size` rows, so at most (block_size, n) distances are kept in memory.
+    Silhouette of a point in a single-point cluster is 0.
+
+    Arguments:
+        compute_distances: function returning distances between points at given
+            positions, ex. KMedoidsAlgorithm.compute_distances
+        labels: cluster of every point
+        block_size: number of points processed at once
+
+    Return:
+        Value between -1 and 1, the higher the better.
+
+    """
+    _, clusters = np.unique(labels, return_inverse=True)
+    clusters = clusters.ravel()
+    sizes = np.bincount(clusters)
+    if len(sizes) < 2:
+        raise ValueError("Silhouette requires at least two clusters.")
+
+    # columns are sorted by cluster, so distances to each cluster are summed with
+    # a single `reduceat`
+    columns = np.argsort(clusters, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    points_num = len(clusters)
+    total = 0.0
+    for start in range(0, points_num, block_size):
+        rows = np.arange(start, min(start + block_size, points_num))
+        sums = np.add.reduceat(compute_distances(rows, columns), starts, axis=1)
+        own_clusters = clusters[rows]
+        own_sizes = sizes[own_clusters]
+
+        own = sums[np.arange(len(rows)), own_clusters] / np.maximum(own_sizes - 1, 1)
+        means = sums / sizes
+        means[np.arange(len(rows)), own_clusters] = np.inf
+        values = get_silhouette_values(own, means.min(axis=1))
+        values[own_sizes == 1] = 0
+        total += values.sum()
+    return float(total / points_num)
+
+
+def total_deviation(nearest_distances: np.ndarray) -> float:
+    """
+    Sum of distances between points and their nearest medoids, the cost minimized
+    by k-medoids algorithms.
+
+    """
+    return float(np.sum(nearest_distances))
+
+
+def davies_bouldin(
+    coordinates: np.ndarray,
+    labels: np.ndarray,
+    centers: np.ndarray = None,
+    block_size: int = POINTS_BLOCK_SIZE,
+) -> float:
+    """
+    Davies-Bouldin index with Euclidean distances: mean over clusters of the
+    maximal (S_i + S_j) / d(c_i, c_j), where S_i is the mean distance between
+    points of cluster i and its center c_i.
+
+    Arguments:
+        coordinates: (n, d) array of coordinates
+        labels: cluster of every point
+        centers: (k, d) array with centers of clusters in the order of sorted
+            labels, ex. coordinates of medoids, centroids by default
+        block_size: number of points processed at once
+
+    Return:
+        Non-negative value, the lower the better.
+
+    """
+    _, clusters = np.unique(labels, return_inverse=True)
+    clusters = clusters.ravel()
+    sizes = np.bincount(clusters)
+    clusters_num = len(sizes)
+    if clusters_num < 2:
+        raise ValueError("Davies-Bouldin index requires at least two clusters.")
+
+    if centers is None:
+        centers = np.column_stack(
+            [
+                np.bincount(clusters, coordinates[:, column], minlength=clusters_num)
+                for column in range(coordinates.shape[1])
+            ]
+        )
+        centers /= sizes[:, np.newaxis]
+
+    scatter = np.zeros(clusters_num)
+    for start in range(0, len(coordinates), block_size):
+        block = slice(start, start + block_size)
+        distances = np.linalg.norm(
+            coordinates[block] - centers[clusters[block]], axis=1
+        )
+        scatter += np.bincount(clusters[block], distances, minlength=clusters_num)
+    scatter /= sizes
+
+    centers_distances = np.linalg.norm(
+        centers[:, np.newaxis, :] - centers[np.newaxis, :, :], axis=-1
+    )
+    np.fill_diagonal(centers_distances, np.inf)
+    ratios = (scatter[:, np.newaxis] + scatter[np.newaxis, :]) / centers_distances
+    return float(ratios.max(axis=1).mean())
+
+
+def get_contingency_table(classes: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """
+    (number of classes, number of clusters) array with number of points of each
+    class in each cluster.
+
+    """
+    _, classes = np.unique(classes, return_inverse=True)
+    _, labels = np.unique(labels, return_inverse=True)
+    classes, labels = classes.ravel(), labels.ravel()
+    if len(classes) != len(labels):
+        raise ValueError("There needs to be exactly one class for each point.")
+    clusters_num = labels.max() + 1
+    return np.bincount(
+        classes * clusters_num + labels, minlength=(classes.max() + 1) * clusters_num
+    ).reshape(-1, clusters_num)
+
+
+def count_pairs(counts: np.ndarray) -> float:
+    counts = counts.astype(float)
+    return float((counts * (counts - 1) / 2).sum())
+
+
+def adjusted_rand_index(classes: np.ndarray, labels: np.ndarray) -> float:
+    """
+    Adjusted Rand index of clusters and true classes.
+
+    Return:
+        1 for identical partitions, around 0 for random clusters.
+
+    """
+    table = get_contingency_table(classes, labels)
+    pairs = count_pairs(np.array(table.sum()))
+    index = count_pairs(table)
+    classes_pairs = count_pairs(table.sum(axis=1))
+    labels_pairs = count_pairs(table.sum(axis=0))
+
+    expected = classes_pairs * labels_pairs / pairs if pairs else 0.0
+    maximum = (classes_pairs + labels_pairs) / 2
+    if maximum == expected:
+        # both partitions are trivial (single cluster or single points)
+        return 1.0
+    return float((index - expected) / (maximum - expected))
+
+
+def purity(classes: np.ndarray, labels: np.ndarray) -> float:
+    """
+    Fraction of points which belong to the most frequent class of their cluster.
+    """
+    table = get_contingency_table(classes, labels)
+    return float(table.max(axis=0).sum() / table.sum())
+
+
+def get_assignment(
+    algorithm: "KMedoidsAlgorithm",
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Read the assignment to medoids without building data of every point.
+
+    Return:
+        Tuple with arrays: position of the nearest medoid in `algorithm.points`,
+        distance to the nearest medoid and distance to the second nearest medoid.
+
+    """
+    if algorithm.engine == "numpy":
+        return (
+            algorithm.medoids_positions[algorithm.nearest],
+            algorithm.nearest_distances,
+            algorithm.second_nearest_distances,
+        )
+    if isinstance(algorithm.points, PointSet):
+        return (
+            algorithm.points.nearest_medoid,
+            algorithm.points.nearest_medoid_distance,
+            algorithm.points.second_nearest_medoid_distance,
+        )
+    return (
+        np.array(
+            [
+                algorithm.positions[point.nearest_medoid.idx]
+                for point in algorithm.points
+            ]
+        ),
+        np.array([point.nearest_medoid_distance for point in algorithm.points]),
+        np.array(
+            [point.second_nearest_medoid_distance for point in algorithm.points],
+            dtype=float,
+        ),
+    )
+
+
+def evaluate(
+    algorithm: "KMedoidsAlgorithm",
+    classes: np.ndarray = None,
+    full_silhouette: bool = False,
+) -> dict:
+    """
+    Compute quality metrics of the clusters found by the algorithm (after `run`).
+
+    Arguments:
+        algorithm: algorithm with up-to-date assignment to medoids
+        classes: true class of every point (ex. class column of data returned by
+            `load_data`), used by adjusted Rand index and purity
+        full_silhouette: compute silhouette, which needs O(n^2) distances
+
+    Return:
+        Dictionary with "total_deviation", "simplified_silhouette", "silhouette",
+        "davies_bouldin", "adjusted_rand_index" and "purity". Values which cannot
+        be computed (ex. Davies-Bouldin index without coordinates) are None.
+
+    """
+    labels, nearest_distances, second_nearest_distances = get_assignment(algorithm)
+    metrics = {
+        "total_deviation": total_deviation(nearest_distances),
+        "simplified_silhouette": simplified_silhouette(
+            nearest_distances, second_nearest_distances
+        ),
+        "silhouette": None,
+        "davies_bouldin": None,
+        "adjusted_rand_index": None,
+        "purity": None,
+    }
+    if full_silhouette:
+        metrics["silhouette"] = silhouette(algorithm.compute_distances, labels)
+    if algorithm.coordinates.shape[1] > 0:
+        medoids_positions = np.unique(labels)
+        metrics["davies_bouldin"] = davies_bouldin(
+            algorithm.coordinates, labels, algorithm.coordinates[medoids_positions]
+        )
+    if classes is not None:
+        classes = np.asarray(classes)
+        metrics["adjusted_rand_index"] = adjusted_rand_index(classes, labels)
+        metrics["purity"] = purity(classes, labels)
+    return metrics
@@ -0,0 +1,121 @@
+from typing import Callable, Dict
+
+import numpy as np
+
+# function(positions) -> (len(positions), n) array of distances between points at
+# `positions` and all points
+RowsFunction = Callable[[np.ndarray], np.ndarray]
+
+
+class DistanceRowCache:
+    """
+    Rows of the distance matrix (distances between one point and all points) kept
+    within a budget of `max_bytes`. Missing rows are computed on demand by
+    `compute_rows`, so the full matrix never has to fit in memory.
+
+    Rows are cached in order of the first request until the budget is used, rows
+    requested later are computed every time. Swap search asks for rows of all
+    candidates in the same order in every iteration, so evicting the least
+    recently used row would always drop the row needed next and give no hits
+    unless the whole matrix fits. With a fixed set of rows, `max_rows / n` of every
+    sweep is served from the cache.
+
+    Provides the same `get` method as DistanceMatrix, distances are assumed to be
+    symmetric.
+
+    """
+
+    def __init__(self, compute_rows: RowsFunction, points_num: int, max_bytes: int):
+        if max_bytes < 0:
+            raise ValueError("Size of the cache cannot be negative.")
+        self.compute_rows = compute_rows
+        self.points_num = points_num
+        self.max_bytes = max_bytes
+        # every row is an array of float64
+        self.row_bytes = points_num * np.dtype(np.float64).itemsize
+        self.max_rows = max_bytes // self.row_bytes if self.row_bytes else 0
+
+        self.rows: Dict[int, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self.points_num
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.rows) * self.row_bytes
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def get_rows(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Get rows of the distance matrix, missing rows are computed in one call of
+        `compute_rows` and cached.
+
+        Arguments:
+            positions: positions of points
+
+        Return:
+            (len(positions), n) array of distances.
+
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        result = np.empty((len(positions), self.points_num))
+        missing = {}
+        for row, position in enumerate(positions.tolist()):
+            cached = self.rows.get(position)
+            if cached is None:
+                missing.setdefault(position, []).append(row)
+                self.misses += 1
+            else:
+                result[row] = cached
+                self.hits += 1
+
+        if missing:
+            computed = self.compute_rows(np.fromiter(missing, dtype=np.intp))
+            for (position, rows), distances in zip(missing.items(), computed):
+                result[rows] = distances
+                self.put(position, distances)
+        return result
+
+    def put(self, position: int, distances: np.ndarray) -> None:
+        # when the cache is full, the row is not kept and nothing is evicted
+        if len(self.rows) < self.max_rows:
+            self.rows[position] = np.array(distances, dtype=np.float64)
+
+    def get(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+        Get distances between points at positions `rows` and points at positions
+        `columns`. Rows of the matrix are fetched for the shorter of both lists.
+
+        Return:
+            (len(rows), len(columns)) array of distances.
+
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        columns = np.asarray(columns, dtype=np.intp)
+        if len(columns) <= len(rows):
+            distances = self.get_rows(columns)
+            # distances to all points in order (e.g. of swap candidates) are used
+            # without copying
+            if not self.are_all_points(rows):
+                distances = distances[:, rows]
+            return distances.T
+        distances = self.get_rows(rows)
+        if not self.are_all_points(columns):
+            distances = distances[:, columns]
+        return distances
+
+    def are_all_points(self, positions: np.ndarray) -> bool:
+        return len(positions) == self.points_num and bool(
+            (positions == np.arange(self.points_num)).all()
+        )
+
+    def clear(self) -> None:
+        self.rows.clear()
+        self.hits = 0
+        self.misses = 0
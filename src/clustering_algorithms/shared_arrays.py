@@ -0,0 +1,93 @@
+import atexit
+import os
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+
+import numpy as np
+
+# blocks of shared memory opened by this process, name -> block. Blocks stay open
+# until they are released, so arrays using their memory are always valid.
+_blocks: Dict[str, shared_memory.SharedMemory] = {}
+# blocks created by this process (name -> pid of the creator, forked processes
+# inherit it), which are removed at exit if they have not been released
+_created: Dict[str, int] = {}
+
+
+class SharedArray:
+    """
+    Numpy array stored in a block of shared memory. It is pickled by name of the
+    block, so a worker process which unpickles it attaches to the same memory
+    instead of receiving a copy of the data.
+
+    The process that created the array owns the block and removes it with
+    `release`, other processes only close it.
+
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype=np.float64, name: str = None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+        if self.owner:
+            # blocks cannot be empty
+            size = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            _created[block.name] = os.getpid()
+        elif name in _blocks:
+            block = _blocks[name]
+        else:
+            block = shared_memory.SharedMemory(name=name)
+        _blocks[block.name] = block
+        self.name = block.name
+        # the array holds the buffer of the block, so the block cannot be closed
+        # while the array or its views exist
+        self.array = np.frombuffer(
+            block.buf, dtype=self.dtype, count=int(np.prod(self.shape))
+        ).reshape(self.shape)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "SharedArray":
+        """
+        Copy `array` into a new block of shared memory.
+        """
+        shared = cls(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    def __getstate__(self) -> dict:
+        return {"shape": self.shape, "dtype": self.dtype.str, "name": self.name}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["shape"], state["dtype"], state["name"])
+
+    def release(self) -> None:
+        """
+        Close the block and remove it if this process owns it. The array cannot be
+        used afterwards.
+
+        """
+        self.array = None
+        release_block(self.name, self.owner)
+
+
+def release_block(name: str, unlink: bool) -> None:
+    block = _blocks.get(name)
+    if block is None:
+        return
+    if unlink:
+        block.unlink()
+        _created.pop(name, None)
+    try:
+        block.close()
+    except BufferError:
+        # views of the array still exist, the block stays open until the process
+        # exits
+        return
+    del _blocks[name]
+
+
+@atexit.register
+def release_created_blocks() -> None:
+    for name, pid in list(_created.items()):
+        if pid == os.getpid():
+            release_block(name, True)
@@ -0,0 +1,105 @@
+import contextlib
+import json
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+# function(record) called by algorithms on every event, see `Telemetry.record`
+Callback = Callable[[dict], None]
+
+# counters updated by algorithms
+DISTANCE_COMPUTATIONS = "distance_computations"
+SWAP_CANDIDATES = "swap_candidates"
+
+# phases measured by algorithms
+ASSIGNMENT = "assignment"
+SWAP_SEARCH = "swap_search"
+SAMPLING = "sampling"
+SAMPLE_EVALUATION = "sample_evaluation"
+STARTS = "starts"
+
+
+class Telemetry:
+    """
+    Collector of counters, per-phase timings and records of events emitted by
+    clustering algorithms. Pass an instance to the algorithm to enable it, an
+    algorithm without telemetry only checks that it is None.
+
+    Records are dictionaries with at least "event" and "algorithm" keys, ex.
+    {"event": "iteration", "algorithm": "PAM", "iteration": 2, "cost": 10.5, ...}.
+
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, int] = defaultdict(int)
+        # phase -> total time in seconds and number of measurements
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.records: List[dict] = []
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += int(value)
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """
+        Measure time spent inside the context and add it to the `name` phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+            self.calls[name] += 1
+
+    def record(self, record: dict) -> None:
+        self.records.append(record)
+
+    def merge(self, other: "Telemetry", **source) -> None:
+        """
+        Add counters, timings and records collected by `other`, ex. by PAM run on
+        a sample.
+
+        Arguments:
+            other: telemetry to merge
+            source: keys added to every merged record to tell where it comes from,
+                ex. sample=2
+
+        """
+        for name, value in other.counters.items():
+            self.counters[name] += value
+        for name, value in other.timings.items():
+            self.timings[name] += value
+        for name, value in other.calls.items():
+            self.calls[name] += value
+        self.records.extend({**record, **source} for record in other.records)
+
+    def to_dict(self) -> dict:
+        """
+        Export collected data.
+
+        Return:
+            Dictionary with "counters", "timings" (phase -> {"total", "calls"}) and
+            "records" keys, which can be serialized to JSON.
+
+        """
+        return {
+            "counters": dict(self.counters),
+            "timings": {
+                name: {"total": total, "calls": self.calls[name]}
+                for name, total in self.timings.items()
+            },
+            "records": list(self.records),
+        }
+
+    def to_json(self, filename: str) -> None:
+        with open(filename, "w") as output_file:
+            json.dump(self.to_dict(), output_file, indent=2, default=float)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Records as DataFrame, one row per event.
+        """
+        return pd.DataFrame(self.records)
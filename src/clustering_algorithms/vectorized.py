@@ -0,0 +1,340 @@
+from typing import Callable, Tuple
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+# number of candidate medoids evaluated at once by `compute_swap_costs`
+CANDIDATES_BLOCK_SIZE = 256
+
+# number of distances in a single block computed by `assign_to_medoids_blocked`
+# (512 KiB of float64, so a block fits in the L2 cache)
+ASSIGNMENT_BLOCK_ELEMENTS = 65536
+
+
+def pairwise_distances(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """
+    Compute Euclidean distances between every pair of rows from `first` and `second`.
+    Distances are written directly into the (n, m) result, (n, m, d) array of
+    differences is never created.
+
+    Arguments:
+        first: (n, d) array of coordinates
+        second: (m, d) array of coordinates
+
+    Return:
+        (n, m) array of distances.
+
+    """
+    return cdist(first, second)
+
+
+def euclidean_distances_blas(
+    first: np.ndarray,
+    second: np.ndarray,
+    first_squared_norms: np.ndarray = None,
+    second_squared_norms: np.ndarray = None,
+    squared: bool = False,
+) -> np.ndarray:
+    """
+    Compute Euclidean distances between every pair of rows as
+    ||x||^2 - 2 x.y + ||y||^2, so the main cost is a single matrix multiplication.
+    Faster than `pairwise_distances`, but less accurate for points close to each
+    other. Negative values caused by rounding errors are clamped to 0.
+
+    Arguments:
+        first: (n, d) array of coordinates
+        second: (m, d) array of coordinates
+        first_squared_norms: squared norms of rows of `first`, computed if not given
+        second_squared_norms: squared norms of rows of `second`, computed if not
+            given
+        squared: return squared distances
+
+    Return:
+        (n, m) array of distances.
+
+    """
+    if first_squared_norms is None:
+        first_squared_norms = np.einsum("ij,ij->i", first, first)
+    if second_squared_norms is None:
+        second_squared_norms = np.einsum("ij,ij->i", second, second)
+
+    distances = first @ second.T
+    distances *= -2
+    distances += first_squared_norms[:, np.newaxis]
+    distances += second_squared_norms[np.newaxis, :]
+    np.maximum(distances, 0, out=distances)
+    if squared:
+        return distances
+    return np.sqrt(distances, out=distances)
+
+
+def assign_to_medoids_blocked(
+    coordinates: np.ndarray, medoids_coordinates: np.ndarray, squared: bool = False
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Choose nearest and second nearest medoid for every point with Euclidean (or
+    squared Euclidean) distance. Points are processed in blocks of rows, distances
+    of a block are computed by `euclidean_distances_blas` and reduced to the two
+    nearest medoids before the next block, so (n, k) matrix of distances is never
+    created. Distances to the chosen medoids are computed again exactly.
+
+    Arguments:
+        coordinates: (n, d) array of coordinates of points
+        medoids_coordinates: (k, d) array of coordinates of medoids
+        squared: use squared Euclidean distance
+
+    Return:
+        The same tuple as returned by `assign_to_medoids`.
+
+    """
+    points_num, medoids_num = len(coordinates), len(medoids_coordinates)
+    if medoids_num < 2:
+        distances = np.square(coordinates - medoids_coordinates).sum(axis=1)
+        return (
+            np.zeros(points_num, dtype=np.intp),
+            distances if squared else np.sqrt(distances),
+            np.full(points_num, -1, dtype=np.intp),
+            np.full(points_num, np.nan),
+        )
+
+    nearest = np.empty(points_num, dtype=np.intp)
+    second_nearest = np.empty(points_num, dtype=np.intp)
+    medoids_squared_norms = np.einsum(
+        "ij,ij->i", medoids_coordinates, medoids_coordinates
+    )
+    block_size = max(1, ASSIGNMENT_BLOCK_ELEMENTS // medoids_num)
+    for start in range(0, points_num, block_size):
+        block = slice(start, start + block_size)
+        # squared distances have the same order and need no square root
+        distances = euclidean_distances_blas(
+            coordinates[block],
+            medoids_coordinates,
+            second_squared_norms=medoids_squared_norms,
+            squared=True,
+        )
+        rows = np.arange(len(distances))
+        # argmin returns the first minimum, so ties are resolved as in
+        # `assign_to_medoids`
+        nearest[block] = np.argmin(distances, axis=1)
+        distances[rows, nearest[block]] = np.inf
+        second_nearest[block] = np.argmin(distances, axis=1)
+
+    nearest_distances = np.square(coordinates - medoids_coordinates[nearest]).sum(
+        axis=1
+    )
+    second_nearest_distances = np.square(
+        coordinates - medoids_coordinates[second_nearest]
+    ).sum(axis=1)
+
+    # exact distances can change the order of medoids that were almost equally far
+    swapped = (second_nearest_distances < nearest_distances) | (
+        (second_nearest_distances == nearest_distances) & (second_nearest < nearest)
+    )
+    nearest[swapped], second_nearest[swapped] = (
+        second_nearest[swapped],
+        nearest[swapped],
+    )
+    nearest_distances[swapped], second_nearest_distances[swapped] = (
+        second_nearest_distances[swapped],
+        nearest_distances[swapped],
+    )
+
+    if not squared:
+        nearest_distances = np.sqrt(nearest_distances)
+        second_nearest_distances = np.sqrt(second_nearest_distances)
+    return nearest, nearest_distances, second_nearest, second_nearest_distances
+
+
+def assign_to_medoids(
+    distances: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Choose nearest and second nearest medoid for every point. Ties are resolved in
+    favour of the medoid that comes first, the same way as in
+    `Point.update_cluster_assignment`.
+
+    Arguments:
+        distances: (n, k) array of distances between points and medoids
+
+    Return:
+        Tuple with four arrays of length n:
+            * position of the nearest medoid (column of `distances`)
+            * distance to the nearest medoid
+            * position of the second nearest medoid (-1 if there is only one medoid)
+            * distance to the second nearest medoid (nan if there is only one medoid)
+
+    """
+    points_num, medoids_num = distances.shape
+    rows = np.arange(points_num)
+
+    if medoids_num < 2:
+        nearest = np.zeros(points_num, dtype=np.intp)
+        return (
+            nearest,
+            distances[rows, nearest],
+            np.full(points_num, -1, dtype=np.intp),
+            np.full(points_num, np.nan),
+        )
+
+    order = np.argsort(distances, axis=1, kind="stable")
+    nearest, second_nearest = order[:, 0], order[:, 1]
+    return (
+        nearest,
+        distances[rows, nearest],
+        second_nearest,
+        distances[rows, second_nearest],
+    )
+
+
+def assign_to_medoids_in_blocks(
+    points_num: int,
+    get_distances: Callable[[slice], np.ndarray],
+    block_size: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run `assign_to_medoids` on blocks of `block_size` points, so distances of only
+    one block are kept in memory.
+
+    Arguments:
+        points_num: number of points
+        get_distances: function(block) -> (block_size, k) array of distances between
+            points in the `block` slice and medoids
+        block_size: number of points in a block
+
+    Return:
+        The same tuple as returned by `assign_to_medoids`.
+
+    """
+    assignment = (
+        np.empty(points_num, dtype=np.intp),
+        np.empty(points_num),
+        np.empty(points_num, dtype=np.intp),
+        np.empty(points_num),
+    )
+    for start in range(0, points_num, block_size):
+        block = slice(start, start + block_size)
+        for array, block_array in zip(
+            assignment, assign_to_medoids(get_distances(block))
+        ):
+            array[block] = block_array
+    return assignment
+
+
+def compute_other_cost(
+    candidates_distances: np.ndarray, nearest_distances: np.ndarray
+) -> np.ndarray:
+    """
+    Cost of a point that keeps its nearest medoid unless the candidate is closer.
+    Computed in place, so the only (n, c) array allocated is the result.
+
+    """
+    other_cost = candidates_distances - nearest_distances[:, np.newaxis]
+    np.minimum(other_cost, 0, out=other_cost)
+    return other_cost
+
+
+def compute_own_cost(
+    candidates_distances: np.ndarray,
+    nearest_distances: np.ndarray,
+    second_nearest_distances: np.ndarray,
+) -> np.ndarray:
+    """
+    Cost of a point whose nearest medoid is being replaced. Computed in place, so
+    the only (n, c) array allocated is the result.
+
+    """
+    # fmin ignores nan second nearest distance when there is only one medoid
+    own_cost = np.fmin(candidates_distances, second_nearest_distances[:, np.newaxis])
+    own_cost -= nearest_distances[:, np.newaxis]
+    return own_cost
+
+
+def compute_swap_costs(
+    candidates_distances: np.ndarray,
+    nearest: np.ndarray,
+    nearest_distances: np.ndarray,
+    second_nearest_distances: np.ndarray,
+    medoids_positions: np.ndarray,
+) -> np.ndarray:
+    """
+    Compute cost of replacing each medoid with each of the given candidates. This is
+    a batched version of `PAM.compute_replacement_cost`: points that are medoids are
+    skipped unless they are the medoid being replaced.
+
+    Arguments:
+        candidates_distances: (n, c) array of distances between points and candidates
+        nearest: position of each point's nearest medoid in `medoids_positions`
+        nearest_distances: distance between each point and its nearest medoid
+        second_nearest_distances: distance between each point and its second
+            nearest medoid
+        medoids_positions: positions of medoids in the list of points
+
+    Return:
+        (k, c) array with total cost of replacing k-th medoid with c-th candidate.
+
+    """
+    points_num = candidates_distances.shape[0]
+    is_medoid = np.zeros(points_num, dtype=bool)
+    is_medoid[medoids_positions] = True
+
+    # cost of a point that keeps its nearest medoid unless the candidate is closer
+    other_cost = compute_other_cost(candidates_distances, nearest_distances)
+    # cost of a point whose nearest medoid is being replaced
+    own_cost = compute_own_cost(
+        candidates_distances, nearest_distances, second_nearest_distances
+    )
+
+    costs = np.empty((len(medoids_positions), candidates_distances.shape[1]))
+    for medoid, medoid_position in enumerate(medoids_positions):
+        included = ~is_medoid
+        included[medoid_position] = True
+        in_cluster = nearest == medoid
+        costs[medoid] = np.where(in_cluster[:, np.newaxis], own_cost, other_cost).sum(
+            axis=0, where=included[:, np.newaxis]
+        )
+
+    return costs
+
+
+def compute_swap_costs_fastpam1(
+    candidates_distances: np.ndarray,
+    nearest: np.ndarray,
+    nearest_distances: np.ndarray,
+    second_nearest_distances: np.ndarray,
+    medoids_num: int,
+) -> np.ndarray:
+    """
+    Compute cost of replacing each medoid with each of the given candidates in one
+    pass over the points (FastPAM1, Schubert & Rousseeuw 2019). Cost shared by all
+    medoids (points that move to the candidate) is computed once, then for every
+    point the difference between losing its own medoid and keeping it is added to
+    the row of its nearest medoid only. The result is equal to `compute_swap_costs`
+    for metric dissimilarities.
+
+    Arguments:
+        candidates_distances: (n, c) array of distances between points and candidates
+        nearest: position of each point's nearest medoid
+        nearest_distances: distance between each point and its nearest medoid
+        second_nearest_distances: distance between each point and its second
+            nearest medoid
+        medoids_num: number of medoids
+
+    Return:
+        (k, c) array with total cost of replacing k-th medoid with c-th candidate.
+
+    """
+    other_cost = compute_other_cost(candidates_distances, nearest_distances)
+    own_cost = compute_own_cost(
+        candidates_distances, nearest_distances, second_nearest_distances
+    )
+
+    # losses are summed separately for points of each cluster, own costs are not
+    # needed afterwards, so they are overwritten
+    losses = own_cost
+    losses -= other_cost
+    removal_losses = np.empty((medoids_num, candidates_distances.shape[1]))
+    for candidate in range(candidates_distances.shape[1]):
+        removal_losses[:, candidate] = np.bincount(
+            nearest, weights=losses[:, candidate], minlength=medoids_num
+        )
+    return other_cost.sum(axis=0) + removal_losses
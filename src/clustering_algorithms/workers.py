@@ -0,0 +1,42 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# algorithm sent once to every worker process by `worker_pool`
+_worker_algorithm = None
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """
+    Number of worker processes for `n_jobs` option, -1 uses all CPUs.
+    """
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+    if n_jobs < 1:
+        raise ValueError("Number of jobs needs to be positive or -1.")
+    return n_jobs
+
+
+def set_worker_algorithm(algorithm) -> None:
+    global _worker_algorithm
+    _worker_algorithm = algorithm
+
+
+def worker_pool(n_jobs: int, algorithm=None) -> ProcessPoolExecutor:
+    """
+    Pool of `n_jobs` worker processes. If `algorithm` is given, it is pickled once
+    for every worker (not for every task), and `call_in_worker` runs its methods.
+
+    """
+    if algorithm is None:
+        return ProcessPoolExecutor(max_workers=n_jobs)
+    return ProcessPoolExecutor(
+        max_workers=n_jobs,
+        initializer=set_worker_algorithm,
+        initargs=(algorithm,),
+    )
+
+
+def call_in_worker(method: str, *args):
+    """
+    Call `method` of the algorithm sent to this worker by `worker_pool`.
+    """
+    return getattr(_worker_algorithm, method)(*args)
@@ -0,0 +1,55 @@
+from typing import Sequence
+
+import numpy as np
+import pytest
+
+from clustering_algorithms import Point, PointSet
+
+COORDINATES_NAMES = ["x", "y", "z"]
+
+
+@pytest.fixture
+def make_blobs():
+    """
+    Factory of test data: `cluster_size` points drawn from the normal distribution
+    around each of `centers`. The same arguments always give the same data.
+
+    Arguments of the factory:
+        cluster_size: number of points around every center
+        centers: centers of clusters, the same value is used in every dimension
+        scale: standard deviation of every cluster
+        dimensions: number of coordinates, at most 3
+        seed: seed of the random generator
+        kind: "point_set" for PointSet, "points" for a list of Point or
+            "coordinates" for (n, d) array
+
+    """
+
+    def make(
+        cluster_size: int = 30,
+        centers: Sequence[float] = (0,),
+        scale: float = 1.0,
+        dimensions: int = 2,
+        seed: int = 0,
+        kind: str = "point_set",
+    ):
+        rng = np.random.default_rng(seed)
+        coordinates = np.concatenate(
+            [
+                rng.normal(center, scale, size=(cluster_size, dimensions))
+                for center in centers
+            ]
+        )
+        coordinates_names = COORDINATES_NAMES[:dimensions]
+        if kind == "coordinates":
+            return coordinates
+        if kind == "point_set":
+            return PointSet(coordinates, coordinates_names)
+        if kind == "points":
+            return [
+                Point(idx=idx, coordinates=row, coordinates_names=coordinates_names)
+                for idx, row in enumerate(coordinates)
+            ]
+        raise ValueError(f"Unknown kind of test data ({kind}).")
+
+    return make
@@ -1 +1,3 @@
+from .arff_stream import iter_blocks, load_data_streaming
 from .data_loader import load_data
+from .synthetic import make_blobs
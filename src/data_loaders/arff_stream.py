@@ -0,0 +1,220 @@
+import re
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_loaders.data_loader import (
+    choose_class_column_name,
+    choose_coordinates_columns_names,
+)
+
+# number of data rows parsed at once
+BLOCK_SIZE = 65536
+
+NUMERIC_TYPES = {"numeric", "real", "integer"}
+
+ATTRIBUTE_PATTERN = re.compile(
+    r"@attribute\s+('[^']*'|\"[^\"]*\"|\S+)\s+(.+)$", re.IGNORECASE
+)
+
+
+class ArffHeader:
+    """
+    Attributes parsed from the header of .arff file. Supports the part of
+    scipy.io.arff.MetaData interface used by `choose_class_column_name` and
+    `choose_coordinates_columns_names`: names() and meta[name] returning tuple
+    (type, values), where values is a tuple of nominal values or None.
+
+    """
+
+    def __init__(self, attributes: List[Tuple[str, str, tuple]]):
+        self.attributes = {name: (kind, values) for name, kind, values in attributes}
+        self._names = [name for name, _, _ in attributes]
+
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def __getitem__(self, name: str) -> tuple:
+        return self.attributes[name]
+
+
+def parse_attribute(line: str) -> Tuple[str, str, tuple]:
+    """
+    Parse "@attribute name type" line.
+
+    Return:
+        Tuple with name, type ("numeric", "nominal", "string" or "date") and nominal
+        values (None for other types).
+
+    """
+    match = ATTRIBUTE_PATTERN.match(line.strip())
+    if not match:
+        raise ValueError(f"Incorrect attribute definition: {line.strip()}")
+    name, kind = match.group(1).strip("'\""), match.group(2).strip()
+
+    if kind.startswith("{"):
+        values = tuple(
+            value.strip().strip("'\"") for value in kind.strip("{}").split(",")
+        )
+        return name, "nominal", values
+    kind = kind.split()[0].lower()
+    if kind in NUMERIC_TYPES:
+        return name, "numeric", None
+    return name, kind, None
+
+
+def read_header(file) -> ArffHeader:
+    """
+    Read header of .arff file. After this call `file` is positioned at the first
+    line after @data.
+
+    """
+    attributes = []
+    for line in iter(file.readline, ""):
+        lowered = line.strip().lower()
+        if lowered.startswith("@attribute"):
+            attributes.append(parse_attribute(line))
+        elif lowered.startswith("@data"):
+            return ArffHeader(attributes)
+    raise ValueError("There is no @data section in given file.")
+
+
+def count_rows(filename: str) -> int:
+    """
+    Count data rows (without comments and empty lines) of .arff file.
+
+    """
+    with open(filename) as file:
+        read_header(file)
+        return sum(
+            1 for line in file if line.strip() and not line.lstrip().startswith("%")
+        )
+
+
+def iter_blocks(
+    filename: str,
+    coordinates_columns: List[str] = None,
+    class_column: str = None,
+    block_size: int = BLOCK_SIZE,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Read data rows of .arff file in blocks of `block_size` rows. Only one block is
+    kept in memory at a time.
+
+    Arguments:
+        filename: .arff file with dataset
+        coordinates_columns: names of columns with coordinates, guessed the same way
+            as in `load_data` if not given
+        class_column: class, label, guessed the same way as in `load_data` if not
+            given
+
+    Return:
+        Iterator over tuples with (block_size, d) array of coordinates and array of
+        labels' codes (position of the label in the list of possible classes, -1 for
+        missing or unknown labels).
+
+    """
+    with open(filename) as file:
+        header = read_header(file)
+        class_column = choose_class_column_name(header, class_column)
+        coordinates_columns = choose_coordinates_columns_names(
+            header, coordinates_columns
+        )
+        classes = list(header[class_column][1] or [])
+
+        reader = pd.read_csv(
+            file,
+            header=None,
+            names=header.names(),
+            usecols=list(coordinates_columns) + [class_column],
+            dtype={class_column: str},
+            comment="%",
+            quotechar="'",
+            na_values=["?"],
+            skipinitialspace=True,
+            skip_blank_lines=True,
+            chunksize=block_size,
+        )
+        for chunk in reader:
+            coordinates = chunk[list(coordinates_columns)].to_numpy(dtype=float)
+            # unknown labels are replaced with missing ones, both get code -1
+            labels = chunk[class_column]
+            labels = labels.where(labels.isin(classes))
+            labels = pd.Categorical(labels, categories=classes).codes
+            yield coordinates, labels.astype(np.int32)
+
+
+def load_data_streaming(
+    filename: str,
+    coordinates_columns: List[str] = None,
+    class_column: str = None,
+    memmap_path: str = None,
+    block_size: int = BLOCK_SIZE,
+) -> dict:
+    """
+    Load coordinates from .arff file without reading the whole file into memory.
+    Rows are counted first, then blocks of rows are written into a preallocated
+    array, so peak memory is the size of coordinates plus one block. With
+    `memmap_path` coordinates are written into a memory-mapped file instead.
+    ValueError is raised if the parsed rows do not match the counted lines.
+
+    Arguments:
+        filename: .arff file with dataset
+        coordinates_columns: names of columns with coordinates
+        class_column: class, label
+        memmap_path: path of the file that will hold coordinates (float64, C order)
+        block_size: number of rows parsed at once
+
+    Returns:
+        Dictionary with data required for clustering algorithms:
+        "coordinates": (n, d) array of coordinates (np.memmap if `memmap_path`)
+        "labels": array of labels' codes, see `iter_blocks`
+        "class_column": name of column with labels
+        "coordinates_columns": list of columns with coordinates
+        "classes": list of possible class values
+
+    """
+    with open(filename) as file:
+        header = read_header(file)
+    class_column = choose_class_column_name(header, class_column)
+    coordinates_columns = list(
+        choose_coordinates_columns_names(header, coordinates_columns)
+    )
+
+    shape = (count_rows(filename), len(coordinates_columns))
+    if memmap_path:
+        coordinates = np.memmap(memmap_path, dtype=np.float64, mode="w+", shape=shape)
+    else:
+        coordinates = np.empty(shape)
+    labels = np.empty(shape[0], dtype=np.int32)
+
+    offset = 0
+    for block, block_labels in iter_blocks(
+        filename, coordinates_columns, class_column, block_size
+    ):
+        if offset + len(block) > shape[0]:
+            raise ValueError(
+                f"{filename} has more data rows than {shape[0]} counted before "
+                "parsing, it cannot be read by streaming."
+            )
+        coordinates[offset : offset + len(block)] = block
+        labels[offset : offset + len(block)] = block_labels
+        offset += len(block)
+    if offset != shape[0]:
+        # ex. quoted values spanning multiple lines
+        raise ValueError(
+            f"{filename} has {offset} data rows, but {shape[0]} were counted before "
+            "parsing, it cannot be read by streaming."
+        )
+
+    if memmap_path:
+        coordinates.flush()
+
+    return {
+        "coordinates": coordinates,
+        "labels": labels,
+        "class_column": class_column,
+        "coordinates_columns": coordinates_columns,
+        "classes": list(header[class_column][1] or []),
+    }
@@ -1,5 +1,9 @@
+import hashlib
+import json
+import os
 from typing import List
 
+import numpy as np
 import pandas as pd
 from scipy.io import arff
 
@@ -38,7 +42,97 @@ def choose_coordinates_columns_names(
     return coordinates_columns
 
 
-def load_data(filename, coordinates_columns=None, class_column=None):
+def get_cache_paths(
+    filename: str, cache_dir: str, coordinates_columns=None, class_column=None
+) -> dict:
+    """
+    Prepare paths of cache files for `filename`. Cache key depends on the absolute
+    path, modification time and size of the source file and on requested columns,
+    so the cache is not used after the source file changes.
+
+    Return:
+        Dictionary with paths: "coordinates", "labels" (.npy files) and
+        "metadata" (.json sidecar).
+
+    """
+    stat = os.stat(filename)
+    key = hashlib.sha1(
+        json.dumps(
+            [
+                os.path.abspath(filename),
+                stat.st_mtime_ns,
+                stat.st_size,
+                coordinates_columns,
+                class_column,
+            ]
+        ).encode()
+    ).hexdigest()[:16]
+    prefix = os.path.join(
+        cache_dir, f"{os.path.splitext(os.path.basename(filename))[0]}-{key}"
+    )
+    return {
+        "coordinates": f"{prefix}.coordinates.npy",
+        "labels": f"{prefix}.labels.npy",
+        "metadata": f"{prefix}.json",
+    }
+
+
+def load_cached_data(paths: dict):
+    """
+    Load data saved by `save_cached_data`.
+
+    Return:
+        The same dictionary as `load_data` returns or None if cache files do not
+        exist.
+
+    """
+    if not all(os.path.exists(path) for path in paths.values()):
+        return None
+
+    with open(paths["metadata"]) as metadata_file:
+        metadata = json.load(metadata_file)
+    coordinates = np.load(paths["coordinates"], allow_pickle=False)
+    labels = np.load(paths["labels"], allow_pickle=False)
+
+    df = pd.DataFrame(coordinates, columns=metadata["coordinates_columns"])
+    df[metadata["class_column"]] = labels.astype(object)
+    return {
+        "df": df,
+        "class_column": metadata["class_column"],
+        "coordinates_columns": metadata["coordinates_columns"],
+        "classes": metadata["classes"],
+        "coordinates": coordinates,
+    }
+
+
+def save_cached_data(paths: dict, data: dict, filename: str) -> None:
+    """
+    Save coordinates and labels as .npy files and the rest of `data` as a .json
+    sidecar. Metadata is written last, so incomplete cache is never used.
+
+    """
+    os.makedirs(os.path.dirname(paths["metadata"]) or ".", exist_ok=True)
+    np.save(paths["coordinates"], data["coordinates"], allow_pickle=False)
+    np.save(
+        paths["labels"],
+        data["df"][data["class_column"]].to_numpy(dtype=str),
+        allow_pickle=False,
+    )
+
+    stat = os.stat(filename)
+    metadata = {
+        "source": os.path.abspath(filename),
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_size": stat.st_size,
+        "class_column": data["class_column"],
+        "coordinates_columns": data["coordinates_columns"],
+        "classes": data["classes"],
+    }
+    with open(paths["metadata"], "w") as metadata_file:
+        json.dump(metadata, metadata_file)
+
+
+def load_data(filename, coordinates_columns=None, class_column=None, cache_dir=None):
     """
     Load data from .arff file called `filename`.
 
@@ -46,6 +140,10 @@ def load_data(filename, coordinates_columns=None, class_column=None):
         filename: .arff file with dataset
         coordinates_columns: names of columns with coordinates
         class_column: class, label
+        cache_dir: directory for binary copies of loaded data. When given, the
+            .arff file is parsed only once, later calls load coordinates from .npy
+            files until the source file is modified. Dataframe loaded from cache
+            contains only coordinates and class columns.
 
     Returns:
         Dictionary with data required for clustering algorithms:
@@ -53,9 +151,16 @@ def load_data(filename, coordinates_columns=None, class_column=None):
         "class_column": name of column with labels
         "coordinates_columns": list of columns with coordinates
         "possible_classes": list of possible class values
+        "coordinates": (n, d) array of floats with coordinates of points
         Dataframe with data, possible classes (ex. "1", "2", "3", etc.).
 
     """
+    if cache_dir:
+        paths = get_cache_paths(filename, cache_dir, coordinates_columns, class_column)
+        result = load_cached_data(paths)
+        if result is not None:
+            return result
+
     # load data from .arff file
     data, meta = arff.loadarff(filename)
 
@@ -73,5 +178,9 @@ def load_data(filename, coordinates_columns=None, class_column=None):
         "class_column": class_column,
         "coordinates_columns": list(coordinates_columns),
         "classes": list(meta[class_column][1]),
+        "coordinates": df[list(coordinates_columns)].to_numpy(dtype=float),
     }
+
+    if cache_dir:
+        save_cached_data(paths, result, filename)
     return result
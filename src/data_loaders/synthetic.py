@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+
+def make_blobs(
+    points_num: int,
+    dimensions: int = 2,
+    clusters_num: int = 3,
+    seed: int = 0,
+    cluster_std: float = 1.0,
+    center_box: float = 10.0,
+) -> dict:
+    """
+    Generate a synthetic dataset of `clusters_num` Gaussian blobs. The same
+    parameters always give the same dataset.
+
+    Arguments:
+        points_num: number of points
+        dimensions: number of coordinates of every point
+        clusters_num: number of blobs
+        seed: seed of the random generator
+        cluster_std: standard deviation of every blob
+        center_box: centers are drawn uniformly from [-center_box, center_box]
+
+    Returns:
+        Dictionary with the same keys as `load_data` returns:
+        "df": dataset with coordinates "x0", "x1", ... and "class" column
+        "class_column": "class"
+        "coordinates_columns": list of columns with coordinates
+        "classes": list of possible class values ("0", "1", ...)
+        "coordinates": (n, d) array of coordinates
+
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-center_box, center_box, size=(clusters_num, dimensions))
+    labels = rng.integers(clusters_num, size=points_num)
+    coordinates = centers[labels] + rng.normal(
+        scale=cluster_std, size=(points_num, dimensions)
+    )
+
+    coordinates_columns = [f"x{dimension}" for dimension in range(dimensions)]
+    classes = [str(label) for label in range(clusters_num)]
+    df = pd.DataFrame(coordinates, columns=coordinates_columns)
+    df["class"] = [classes[label] for label in labels]
+
+    return {
+        "df": df,
+        "class_column": "class",
+        "coordinates_columns": coordinates_columns,
+        "classes": classes,
+        "coordinates": coordinates,
+    }
@@ -1,4 +1,6 @@
-from clustering_algorithms import CLARA, PAM, get_initial_points
+import logging
+
+from clustering_algorithms import CLARA, CLARANS, PAM, PointSet, select_k
 from data_loaders import load_data
 from timer import Timer
 from visualizers import plot_data
@@ -8,26 +10,50 @@ FILENAME = "datasets/artificial/zelnik4.arff"
 # FILENAME = "datasets/artificial/xclara.arff"
 # FILENAME = "datasets/real-world/glass.arff"
 
+# binary copies of loaded datasets
+CACHE_DIR = "datasets/.cache"
+
 
 def run_clara(data, points):
-    clara = CLARA(points, len(data["classes"]), labels=data["classes"])
+    clara = CLARA(points, len(data["classes"]), labels=data["classes"], engine="numpy")
     clara.run()
     return clara.get_result_df()
 
 
+def run_clarans(data, points):
+    clarans = CLARANS(
+        points, len(data["classes"]), labels=data["classes"], engine="numpy"
+    )
+    clarans.run()
+    return clarans.get_result_df()
+
+
 def run_pam(data, points):
-    pam = PAM(points, len(data["classes"]), labels=data["classes"])
+    pam = PAM(points, len(data["classes"]), labels=data["classes"], engine="numpy")
+    pam.run()
+    return pam.get_result_df()
+
+
+def run_pam_with_selected_k(points, k_range=range(2, 11)):
+    # for data without classes the number of clusters is chosen by silhouette
+    clusters_num, scores = select_k(points, k_range, engine="numpy")
+    print(scores.drop(columns="medoids"))
+    pam = PAM(points, clusters_num, engine="numpy")
     pam.run()
     return pam.get_result_df()
 
 
 if __name__ == "__main__":
-    data = load_data(FILENAME)
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    data = load_data(FILENAME, cache_dir=CACHE_DIR)
     # plot_data(data["df"], data["classes"], data["class_column"])
 
-    points = get_initial_points(data["df"], data["coordinates_columns"])
+    # PointSet keeps points in arrays, which are used directly by the numpy engine
+    points = PointSet(data["coordinates"], data["coordinates_columns"])
     # result = run_clara(data, points)
+    # result = run_clarans(data, points)
     result = run_pam(data, points)
+    # result = run_pam_with_selected_k(points)
     plot_data(
         result, data["classes"], "cluster", attributes_names=data["coordinates_columns"]
     )
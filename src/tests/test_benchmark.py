@@ -0,0 +1,51 @@
+import numpy as np
+
+from benchmark import compare_results, parse_args, run_benchmark
+from data_loaders import make_blobs
+
+
+def test_make_blobs_is_reproducible():
+    first = make_blobs(50, dimensions=3, clusters_num=4, seed=1)
+    second = make_blobs(50, dimensions=3, clusters_num=4, seed=1)
+    other = make_blobs(50, dimensions=3, clusters_num=4, seed=2)
+
+    assert first["coordinates"].shape == (50, 3)
+    assert first["coordinates_columns"] == ["x0", "x1", "x2"]
+    assert first["classes"] == ["0", "1", "2", "3"]
+    assert np.array_equal(first["coordinates"], second["coordinates"])
+    assert not np.array_equal(first["coordinates"], other["coordinates"])
+
+
+def test_run_benchmark():
+    args = parse_args(
+        ["--quick", "--algorithms", "pam-numpy", "fasterpam", "--repeats", "2"]
+    )
+    results = run_benchmark(args)
+
+    assert [result["algorithm"] for result in results["results"]] == [
+        "pam-numpy",
+        "fasterpam",
+    ]
+    for result in results["results"]:
+        assert len(result["times"]) == 2
+        assert result["distance_computations"] > 0
+        assert result["iterations"] > 0
+        assert result["peak_memory"] > 0
+
+
+def test_compare_results():
+    def result(min_time, distance_computations=100, cost=10.0):
+        return {
+            "algorithm": "pam",
+            "n": 100,
+            "d": 2,
+            "k": 3,
+            "min_time": min_time,
+            "distance_computations": distance_computations,
+            "cost": cost,
+        }
+
+    baseline = {"results": [result(1.0)]}
+    assert compare_results({"results": [result(1.1)]}, baseline) == []
+    assert len(compare_results({"results": [result(1.5)]}, baseline)) == 1
+    assert len(compare_results({"results": [result(1.0, 200, 11.0)]}, baseline)) == 2
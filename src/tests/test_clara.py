@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from clustering_algorithms import CLARA, PAM, Telemetry
+
+
+class TestClara:
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    def test_parallel_run_gives_the_same_result_as_serial_run(self, engine, make_blobs):
+        results = []
+        for n_jobs in [1, 2]:
+            random.seed(0)
+            clara = CLARA(
+                make_blobs(centers=(0, 10, 20), kind="points"),
+                3,
+                samples_num=20,
+                engine=engine,
+                n_jobs=n_jobs,
+            )
+            clara.run()
+            results.append((clara.best_medoids, clara.best_dissimilarity))
+
+        assert results[0] == results[1]
+
+    def test_draws_num(self, monkeypatch, make_blobs):
+        clara = CLARA(
+            make_blobs(centers=(0, 10, 20), kind="points"),
+            3,
+            samples_num=20,
+            engine="numpy",
+            draws_num=7,
+        )
+        calls = []
+        evaluate_sample = clara.evaluate_sample
+
+        def count_calls(sample, seed):
+            calls.append(seed)
+            return evaluate_sample(sample, seed)
+
+        monkeypatch.setattr(clara, "evaluate_sample", count_calls)
+        clara.run()
+        assert len(calls) == 7
+
+    def test_best_medoids_are_used_after_run(self, make_blobs):
+        random.seed(0)
+        clara = CLARA(
+            make_blobs(centers=(0, 10, 20), kind="points"),
+            3,
+            samples_num=20,
+            engine="numpy",
+        )
+        clara.run()
+
+        assert clara.medoids_indices == clara.best_medoids
+        assert clara.calculate_dissimilarity() == pytest.approx(
+            clara.best_dissimilarity
+        )
+
+    def test_state_is_restored_when_sample_fails(self, monkeypatch, make_blobs):
+        telemetry = Telemetry()
+        clara = CLARA(
+            make_blobs(centers=(0, 10, 20), kind="points"),
+            3,
+            samples_num=20,
+            engine="numpy",
+            telemetry=telemetry,
+        )
+
+        def fail(pam):
+            raise RuntimeError("failed")
+
+        monkeypatch.setattr(PAM, "run", fail)
+        sample = clara.draw_samples()
+        state = random.getstate()
+        with pytest.raises(RuntimeError):
+            clara.evaluate_sample(sample, 1234)
+
+        assert random.getstate() == state
+        assert clara.telemetry is telemetry
+
+    def test_incorrect_number_of_jobs(self, make_blobs):
+        with pytest.raises(ValueError):
+            CLARA(make_blobs(centers=(0, 10, 20), kind="points"), 3, n_jobs=0)
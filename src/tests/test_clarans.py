@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from clustering_algorithms import CLARANS, PAM
+
+
+class TestClarans:
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    def test_compute_replacement_cost_is_the_same_as_in_pam(self, engine, make_blobs):
+        points = make_blobs(20, centers=(0, 10, 20), kind="points")
+        pam = PAM(points, 3)
+        clarans = CLARANS(points, 3, engine=engine)
+        pam.medoids_indices = [0, 1, 30]
+        clarans.medoids_indices = [0, 1, 30]
+
+        pam.medoids = pam.prepare_medoids()
+        pam.update_clusters_assignment()
+        expected = pam.compute_replacement_cost(points[1], points[50])
+
+        clarans.update_clusters_assignment()
+        cost = clarans.compute_replacement_cost(points[1], points[50])
+        assert cost == pytest.approx(expected)
+
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    def test_run_finds_separated_clusters(self, engine, make_blobs):
+        random.seed(0)
+        clarans = CLARANS(
+            make_blobs(20, centers=(0, 10, 20), kind="points"),
+            3,
+            labels=["a", "b", "c"],
+            numlocal=2,
+            engine=engine,
+        )
+        clarans.run()
+
+        df = clarans.get_result_df()
+        clusters = [set(df["cluster"][start : start + 20]) for start in (0, 20, 40)]
+        assert all(len(cluster) == 1 for cluster in clusters)
+        assert len(set.union(*clusters)) == 3
+        assert clarans.best_cost == pytest.approx(df["nearest_medoid_distance"].sum())
+
+    def test_default_maxneighbor(self, make_blobs):
+        clarans = CLARANS(make_blobs(20, centers=(0, 10, 20), kind="points"), 3)
+        assert clarans.maxneighbor == 250
@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+import pytest
+
+from data_loaders import (
+    arff_stream,
+    data_loader,
+    iter_blocks,
+    load_data,
+    load_data_streaming,
+)
+
+ARFF = """@relation test
+@attribute x numeric
+@attribute y numeric
+@attribute class {a,b}
+@data
+0.5,1.5,a
+2.0,3.0,b
+4.5,5.0,a
+"""
+
+
+@pytest.fixture
+def arff_file(tmp_path):
+    path = tmp_path / "test.arff"
+    path.write_text(ARFF)
+    return str(path)
+
+
+def test_load_data(arff_file):
+    data = load_data(arff_file)
+
+    assert data["class_column"] == "class"
+    assert data["coordinates_columns"] == ["x", "y"]
+    assert data["classes"] == ["a", "b"]
+    assert (data["coordinates"] == [[0.5, 1.5], [2.0, 3.0], [4.5, 5.0]]).all()
+    assert data["df"]["class"].tolist() == ["a", "b", "a"]
+
+
+def test_load_data_from_cache(arff_file, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    data = load_data(arff_file, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 3
+
+    # the second call can not parse .arff file
+    def fail(filename):
+        raise AssertionError("File should be loaded from cache.")
+
+    monkeypatch.setattr(data_loader.arff, "loadarff", fail)
+    cached = load_data(arff_file, cache_dir=cache_dir)
+
+    assert cached["class_column"] == data["class_column"]
+    assert cached["coordinates_columns"] == data["coordinates_columns"]
+    assert cached["classes"] == data["classes"]
+    assert np.array_equal(cached["coordinates"], data["coordinates"])
+    assert cached["df"]["class"].tolist() == data["df"]["class"].tolist()
+    assert cached["df"]["x"].tolist() == data["df"]["x"].tolist()
+
+
+def test_cache_is_not_used_after_file_modification(arff_file, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    load_data(arff_file, cache_dir=cache_dir)
+
+    with open(arff_file, "a") as file:
+        file.write("7.0,8.0,b\n")
+    stat = os.stat(arff_file)
+    os.utime(arff_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    data = load_data(arff_file, cache_dir=cache_dir)
+    assert len(data["coordinates"]) == 4
+
+
+def test_load_data_streaming(arff_file, tmp_path):
+    expected = load_data(arff_file)
+
+    for memmap_path in [None, str(tmp_path / "coordinates.dat")]:
+        data = load_data_streaming(arff_file, memmap_path=memmap_path, block_size=2)
+
+        assert data["class_column"] == expected["class_column"]
+        assert data["coordinates_columns"] == expected["coordinates_columns"]
+        assert data["classes"] == expected["classes"]
+        assert np.array_equal(data["coordinates"], expected["coordinates"])
+        assert [data["classes"][code] for code in data["labels"]] == expected["df"][
+            "class"
+        ].tolist()
+
+
+def test_iter_blocks(tmp_path):
+    path = tmp_path / "blocks.arff"
+    path.write_text(
+        "% comment\n"
+        "@RELATION blocks\n"
+        "@ATTRIBUTE 'first x' REAL\n"
+        "@ATTRIBUTE y INTEGER\n"
+        "@ATTRIBUTE label {'one', 'two'}\n"
+        "@DATA\n"
+        "1.0, 2, 'one'\n"
+        "% comment inside data\n"
+        "\n"
+        "3.0, ?, two\n"
+        "5.0, 6, two\n"
+    )
+    blocks = list(iter_blocks(str(path), class_column="label", block_size=2))
+
+    assert [len(coordinates) for coordinates, _ in blocks] == [2, 1]
+    coordinates = np.concatenate([coordinates for coordinates, _ in blocks])
+    labels = np.concatenate([labels for _, labels in blocks])
+    assert np.array_equal(
+        coordinates, [[1.0, 2.0], [3.0, np.nan], [5.0, 6.0]], equal_nan=True
+    )
+    assert labels.tolist() == [0, 1, 1]
+
+
+def test_iter_blocks_without_class_column(tmp_path):
+    path = tmp_path / "no_class.arff"
+    path.write_text("@relation x\n@attribute x numeric\n@data\n1.0\n")
+    with pytest.raises(ValueError):
+        list(iter_blocks(str(path)))
+
+
+def test_load_data_streaming_with_rows_not_matching_lines(arff_file, monkeypatch):
+    # a quoted value spanning two lines gives fewer rows than lines
+    path = os.path.join(os.path.dirname(arff_file), "multiline.arff")
+    with open(path, "w") as file:
+        file.write(ARFF.replace("4.5,5.0,a", "4.5,5.0,'a\nb'"))
+    with pytest.raises(ValueError, match="3 data rows"):
+        load_data_streaming(path)
+
+    # more parsed rows than counted ones cannot be written into the array
+    monkeypatch.setattr(arff_stream, "count_rows", lambda filename: 2)
+    with pytest.raises(ValueError, match="more data rows"):
+        load_data_streaming(arff_file, block_size=2)
@@ -0,0 +1,105 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from clustering_algorithms import PAM, DistanceMatrix, DistanceMatrixCache
+
+
+class TestDistanceMatrixCache:
+    @pytest.mark.parametrize("condensed", [False, True])
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_cached_matrix_is_the_same_as_computed_matrix(
+        self, tmp_path, condensed, dtype, make_blobs
+    ):
+        coordinates = make_blobs(kind="coordinates")
+        cache = DistanceMatrixCache(str(tmp_path))
+        positions = np.arange(len(coordinates))
+
+        cached = cache.get(coordinates, condensed=condensed, dtype=dtype)
+        computed = DistanceMatrix.from_coordinates(
+            coordinates, condensed=condensed, dtype=dtype
+        )
+        assert isinstance(cached.data, np.memmap)
+        assert cached.data.dtype == dtype
+        assert np.array_equal(
+            cached.get(positions, positions), computed.get(positions, positions)
+        )
+
+    def test_matrix_is_computed_once(self, tmp_path, monkeypatch, make_blobs):
+        coordinates = make_blobs(kind="coordinates")
+        cache = DistanceMatrixCache(str(tmp_path))
+        first = cache.get(coordinates, metric="manhattan")
+
+        def compute_into(*args, **kwargs):
+            raise AssertionError("Cached matrix should be used.")
+
+        monkeypatch.setattr(DistanceMatrix, "compute_into", compute_into)
+        second = DistanceMatrixCache(str(tmp_path)).get(
+            coordinates.copy(), metric="manhattan"
+        )
+        assert np.array_equal(first.data, second.data)
+        with pytest.raises(AssertionError):
+            cache.get(coordinates, metric="euclidean")
+
+    def test_key_depends_on_coordinates_metric_and_dtype(self, tmp_path, make_blobs):
+        cache = DistanceMatrixCache(str(tmp_path))
+        cache.get(make_blobs(kind="coordinates"))
+        cache.get(make_blobs(seed=1, kind="coordinates"))
+        cache.get(make_blobs(kind="coordinates"), metric="cosine")
+        cache.get(make_blobs(kind="coordinates"), dtype=np.float32)
+        cache.get(make_blobs(kind="coordinates"))
+
+        assert len(cache.get_files()) == 4
+
+    def test_least_recently_used_files_are_evicted(self, tmp_path, make_blobs):
+        matrix_size = 30 * 30 * 8
+        cache = DistanceMatrixCache(str(tmp_path), max_size=2 * matrix_size + 1000)
+        first = cache.get(make_blobs(seed=0, kind="coordinates"))
+        cache.get(make_blobs(seed=1, kind="coordinates"))
+        # make sure modification times differ
+        os.utime(first.data.filename, (0, 0))
+        cache.get(make_blobs(seed=0, kind="coordinates"))
+        cache.get(make_blobs(seed=2, kind="coordinates"))
+
+        remaining = cache.get_files()
+        assert len(remaining) == 2
+        assert first.data.filename in remaining
+        assert cache.size <= cache.max_size
+
+    def test_too_large_matrix(self, tmp_path, make_blobs):
+        cache = DistanceMatrixCache(str(tmp_path), max_size=100)
+        with pytest.raises(ValueError):
+            cache.get(make_blobs(kind="coordinates"))
+        assert cache.get_files() == []
+
+    def test_callable_metric_cannot_be_cached(self, tmp_path, make_blobs):
+        cache = DistanceMatrixCache(str(tmp_path))
+        with pytest.raises(ValueError):
+            cache.get(
+                make_blobs(kind="coordinates"),
+                metric=lambda first, second: first @ second.T,
+            )
+
+    def test_pickled_matrix_opens_the_same_file(self, tmp_path, make_blobs):
+        matrix = DistanceMatrixCache(str(tmp_path)).get(make_blobs(kind="coordinates"))
+        unpickled = pickle.loads(pickle.dumps(matrix))
+
+        assert isinstance(unpickled.data, np.memmap)
+        assert unpickled.data.filename == matrix.data.filename
+        assert np.array_equal(unpickled.data, matrix.data)
+
+    def test_pam_with_cached_matrix(self, tmp_path, make_blobs):
+        coordinates = make_blobs(kind="coordinates")
+        results = []
+        for distance_matrix in [
+            DistanceMatrix.from_coordinates(coordinates),
+            DistanceMatrixCache(str(tmp_path)).get(coordinates),
+        ]:
+            pam = PAM(clusters_num=3, engine="numpy", distance_matrix=distance_matrix)
+            pam.medoids_indices = [0, 1, 2]
+            pam.run()
+            results.append(sorted(pam.medoids_indices))
+
+        assert results[0] == results[1]
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from clustering_algorithms import CLARA, PAM, DistanceMatrix, Point
+from clustering_algorithms import distance_matrix as distance_matrix_module
+from clustering_algorithms.vectorized import pairwise_distances
+
+COORDINATES = np.array(
+    [[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [10.0, 0.0], [10.0, 1.0], [11.0, 0.0]]
+)
+
+
+class TestDistanceMatrix:
+    @pytest.mark.parametrize("condensed", [False, True])
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_get(self, condensed, dtype):
+        matrix = DistanceMatrix.from_coordinates(
+            COORDINATES, condensed=condensed, dtype=dtype
+        )
+        expected = pairwise_distances(COORDINATES, COORDINATES)
+
+        rows, columns = np.array([0, 5, 3, 3]), np.array([3, 0, 5, 1])
+        distances = matrix.get(rows, columns)
+        assert distances.dtype == np.float64
+        assert np.allclose(distances, expected[np.ix_(rows, columns)])
+
+    def test_condensed_matrix_is_computed_in_blocks(self, monkeypatch):
+        monkeypatch.setattr(distance_matrix_module, "ROWS_BLOCK_SIZE", 4)
+        coordinates = np.random.default_rng(0).normal(size=(11, 3))
+        calls = []
+
+        def kernel(first, second):
+            calls.append(len(first))
+            return pairwise_distances(first, second)
+
+        matrix = DistanceMatrix.from_coordinates(
+            coordinates, condensed=True, dtype=np.float64, metric=kernel
+        )
+        assert calls == [4, 4, 2]
+        assert np.allclose(
+            matrix.data,
+            pairwise_distances(coordinates, coordinates)[np.triu_indices(11, 1)],
+        )
+
+    def test_condensed_float32_matrix_takes_quarter_of_memory(self):
+        full = DistanceMatrix.from_coordinates(COORDINATES)
+        condensed = DistanceMatrix.from_coordinates(
+            COORDINATES, condensed=True, dtype=np.float32
+        )
+        assert condensed.nbytes * 4 < full.nbytes
+
+    def test_unsupported_dtype(self):
+        with pytest.raises(ValueError):
+            DistanceMatrix.from_coordinates(COORDINATES, dtype=np.int64)
+
+    def test_from_precomputed(self):
+        square = pairwise_distances(COORDINATES, COORDINATES)
+        condensed = square[np.triu_indices(len(square), 1)]
+
+        for matrix in [square, condensed]:
+            distance_matrix = DistanceMatrix.from_precomputed(matrix)
+            assert len(distance_matrix) == 6
+            assert np.allclose(distance_matrix.get(range(6), range(6)), square)
+
+    def test_from_precomputed_with_incorrect_shape(self):
+        with pytest.raises(ValueError):
+            DistanceMatrix.from_precomputed(np.zeros(4))
+        with pytest.raises(ValueError):
+            DistanceMatrix.from_precomputed(np.zeros((2, 3)))
+
+    @pytest.mark.parametrize("condensed", [False, True])
+    def test_submatrix(self, condensed):
+        matrix = DistanceMatrix.from_coordinates(COORDINATES, condensed=condensed)
+        positions = [4, 0, 2]
+        submatrix = matrix.submatrix(positions)
+
+        assert len(submatrix) == 3
+        assert submatrix.condensed == condensed
+        assert np.allclose(
+            submatrix.get(range(3), range(3)), matrix.get(positions, positions)
+        )
+
+
+class TestAlgorithmsWithDistanceMatrix:
+    def test_pam_with_precomputed_matrix_only(self):
+        matrix = DistanceMatrix.from_precomputed(
+            pairwise_distances(COORDINATES, COORDINATES)
+        )
+        pam = PAM(clusters_num=2, engine="numpy", distance_matrix=matrix)
+        pam.run()
+
+        df = pam.get_result_df()
+        assert len(df) == 6
+        assert df["nearest_medoid"].nunique() == 2
+        assert len(set(df["nearest_medoid"][:3])) == 1
+
+    def test_pam_with_distance_matrix_gives_the_same_medoids(self):
+        points = [
+            Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+            for idx, row in enumerate(COORDINATES)
+        ]
+        matrix = DistanceMatrix.from_coordinates(
+            COORDINATES, condensed=True, dtype=np.float32
+        )
+        medoids = []
+        for distance_matrix in [None, matrix]:
+            pam = PAM(points, 2, engine="numpy", distance_matrix=distance_matrix)
+            pam.medoids_indices = [0, 1]
+            pam.run()
+            medoids.append(sorted(pam.medoids_indices))
+
+        assert medoids[0] == medoids[1]
+
+    def test_clara_with_distance_matrix(self):
+        matrix = DistanceMatrix.from_coordinates(COORDINATES, condensed=True)
+        clara = CLARA(clusters_num=2, engine="numpy", distance_matrix=matrix)
+        clara.run()
+        assert clara.best_dissimilarity < 1
+
+    def test_distance_matrix_requires_numpy_engine(self):
+        matrix = DistanceMatrix.from_coordinates(COORDINATES)
+        with pytest.raises(ValueError):
+            PAM(clusters_num=2, distance_matrix=matrix)
+
+    def test_distance_matrix_size_needs_to_match_points(self):
+        points = [Point(idx=0, coordinates=np.array([0.0]), coordinates_names=["x"])]
+        matrix = DistanceMatrix.from_coordinates(COORDINATES)
+        with pytest.raises(ValueError):
+            PAM(points, 1, engine="numpy", distance_matrix=matrix)
@@ -0,0 +1,154 @@
+import random
+
+import numpy as np
+import pytest
+from scipy.spatial.distance import cdist
+
+from clustering_algorithms import CLARA, PAM, DistanceMatrix
+from clustering_algorithms.distances import from_pairwise, get_metric
+
+
+class TestDistances:
+    @pytest.mark.parametrize(
+        "metric, scipy_metric",
+        [
+            ("euclidean", "euclidean"),
+            ("sqeuclidean", "sqeuclidean"),
+            ("manhattan", "cityblock"),
+            ("chebyshev", "chebyshev"),
+            ("cosine", "cosine"),
+        ],
+    )
+    def test_kernels_give_the_same_distances_as_scipy(self, metric, scipy_metric):
+        rng = np.random.default_rng(0)
+        first, second = rng.normal(size=(20, 4)), rng.normal(size=(7, 4))
+
+        assert np.allclose(
+            get_metric(metric)(first, second), cdist(first, second, scipy_metric)
+        )
+
+    @pytest.mark.parametrize("p", [1, 1.5, 3])
+    def test_minkowski(self, p):
+        rng = np.random.default_rng(0)
+        first, second = rng.normal(size=(20, 4)), rng.normal(size=(7, 4))
+
+        assert np.allclose(
+            get_metric("minkowski", p)(first, second),
+            cdist(first, second, "minkowski", p=p),
+        )
+
+    def test_cosine_distance_of_zero_vector(self):
+        vectors = np.array([[0.0, 0.0], [1.0, 2.0]])
+        distances = get_metric("cosine")(vectors, vectors)
+        # zero vector is at distance 1 from non-zero vectors and 0 from itself
+        assert distances[0, 1] == distances[1, 0] == 1
+        assert distances[0, 0] == 0
+        assert distances[1, 1] == pytest.approx(0)
+
+    @pytest.mark.parametrize(
+        "metric", ["sqeuclidean", "manhattan", "chebyshev", "cosine", "euclidean"]
+    )
+    def test_kernels_of_points_without_coordinates(self, metric):
+        distances = get_metric(metric)(np.empty((3, 0)), np.empty((2, 0)))
+        assert np.array_equal(distances, np.zeros((3, 2)))
+
+    def test_from_pairwise(self):
+        rng = np.random.default_rng(0)
+        first, second = rng.normal(size=(5, 2)), rng.normal(size=(3, 2))
+        kernel = from_pairwise(lambda x, y: np.abs(x - y).sum())
+
+        assert np.allclose(kernel(first, second), cdist(first, second, "cityblock"))
+
+    def test_incorrect_metric(self):
+        with pytest.raises(ValueError):
+            get_metric("unknown")
+        with pytest.raises(ValueError):
+            get_metric("minkowski")
+        with pytest.raises(ValueError):
+            get_metric("minkowski", p=0.5)
+
+
+class TestAlgorithmsWithMetrics:
+    @pytest.mark.parametrize("metric", ["manhattan", "cosine", "sqeuclidean"])
+    def test_metric_gives_the_same_result_as_precomputed_matrix(
+        self, metric, make_blobs
+    ):
+        points = make_blobs(40, dimensions=3, kind="points")
+        coordinates = np.array([point.coordinates for point in points])
+        results = []
+        for kwargs in [
+            {"points": points, "metric": metric},
+            {
+                "distance_matrix": DistanceMatrix.from_coordinates(
+                    coordinates, metric=metric
+                ),
+                "metric": "precomputed",
+            },
+        ]:
+            pam = PAM(clusters_num=3, engine="numpy", **kwargs)
+            pam.medoids_indices = [0, 1, 2]
+            pam.run()
+            results.append((sorted(pam.medoids_indices), pam.cost))
+
+        assert results[0][0] == results[1][0]
+        assert results[0][1] == pytest.approx(results[1][1])
+
+    def test_callable_metric(self, make_blobs):
+        results = []
+        for metric in ["manhattan", from_pairwise(lambda x, y: np.abs(x - y).sum())]:
+            random.seed(0)
+            clara = CLARA(
+                make_blobs(40, dimensions=3, kind="points"),
+                3,
+                samples_num=20,
+                engine="numpy",
+                metric=metric,
+            )
+            clara.run()
+            results.append((clara.best_medoids, clara.best_dissimilarity))
+
+        assert results[0][0] == results[1][0]
+        assert results[0][1] == pytest.approx(results[1][1])
+
+    @pytest.mark.parametrize("metric, p", [("manhattan", None), ("minkowski", 3)])
+    def test_medoids_index_with_minkowski_norms(self, metric, p, make_blobs):
+        points = make_blobs(100, dimensions=3, kind="points")
+        assignments = []
+        for medoids_index in ["linear", "kdtree"]:
+            pam = PAM(
+                points,
+                5,
+                engine="numpy",
+                metric=metric,
+                p=p,
+                medoids_index=medoids_index,
+            )
+            pam.medoids_indices = [0, 1, 2, 3, 4]
+            pam.update_clusters_assignment()
+            assignments.append((pam.nearest, pam.nearest_distances))
+
+        assert np.array_equal(assignments[0][0], assignments[1][0])
+        assert np.allclose(assignments[0][1], assignments[1][1])
+
+    def test_predict_uses_metric(self, make_blobs):
+        pam = PAM(
+            make_blobs(40, dimensions=3, kind="points"),
+            2,
+            engine="numpy",
+            metric="chebyshev",
+        )
+        pam.medoids_indices = [0, 1]
+        pam.update_clusters_assignment()
+        coordinates = pam.coordinates
+
+        _, distances, _ = pam.predict(coordinates, return_distances=True)
+        assert np.allclose(distances, pam.nearest_distances)
+
+    def test_incorrect_configuration(self, make_blobs):
+        points = make_blobs(40, dimensions=3, kind="points")
+        with pytest.raises(ValueError):
+            PAM(points, 2, engine="numpy", metric="precomputed")
+        with pytest.raises(ValueError):
+            PAM(points, 2, metric="manhattan")
+        with pytest.raises(ValueError):
+            PAM(points, 2, engine="numpy", metric="cosine", medoids_index="kdtree")
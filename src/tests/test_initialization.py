@@ -0,0 +1,94 @@
+import random
+
+import numpy as np
+import pytest
+
+from clustering_algorithms import PAM, Point
+from clustering_algorithms.initialization import (
+    build,
+    k_medoids_plus_plus,
+    lab,
+    sample_non_medoids,
+)
+from clustering_algorithms.vectorized import pairwise_distances
+
+COORDINATES = np.array(
+    [[x, 0.0] for x in [0, 1, 2, 50, 51, 52, 100, 101, 102, 103]], dtype=float
+)
+
+
+def compute_distances(rows, columns):
+    return pairwise_distances(COORDINATES[rows], COORDINATES[columns])
+
+
+def test_build():
+    medoids = build(compute_distances, len(COORDINATES), 3)
+    # the most central point is chosen first
+    assert medoids[0] == 4
+    assert sorted(medoids)[:2] == [1, 4]
+    assert sorted(medoids)[2] in [7, 8]
+
+
+@pytest.mark.parametrize("initializer", [lab, k_medoids_plus_plus])
+def test_sampling_initializers_return_distinct_medoids(initializer):
+    random.seed(0)
+    for clusters_num in [1, 3, len(COORDINATES)]:
+        medoids = initializer(compute_distances, len(COORDINATES), clusters_num)
+        assert len(medoids) == clusters_num
+        assert len(set(medoids)) == clusters_num
+
+
+def test_sample_non_medoids():
+    random.seed(0)
+    medoids = [0, 2, 4, 6, 8]
+    for size in [1, 3, 5, 10]:
+        sample = sample_non_medoids(10, medoids, size)
+        assert len(sample) == min(size, 5)
+        assert len(set(sample)) == len(sample)
+        assert not set(sample) & set(medoids)
+
+
+def test_k_medoids_plus_plus_with_duplicated_points():
+    random.seed(0)
+    coordinates = np.zeros((5, 2))
+
+    def compute_duplicates_distances(rows, columns):
+        return pairwise_distances(coordinates[rows], coordinates[columns])
+
+    medoids = k_medoids_plus_plus(compute_duplicates_distances, 5, 3)
+    assert len(set(medoids)) == 3
+
+
+@pytest.mark.parametrize("init", ["build", "lab", "k-medoids++"])
+def test_pam_with_initialization(init):
+    random.seed(0)
+    points = [
+        Point(idx=idx * 10, coordinates=row, coordinates_names=["x", "y"])
+        for idx, row in enumerate(COORDINATES)
+    ]
+    pam = PAM(points, 3, engine="numpy", init=init)
+    assert len(set(pam.medoids_indices)) == 3
+    assert all(idx in {point.idx for point in points} for idx in pam.medoids_indices)
+
+    pam.run()
+    assert sorted(pam.medoids_indices) == [10, 40, 70]
+
+
+def test_build_needs_no_swaps_on_separated_clusters():
+    points = [
+        Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+        for idx, row in enumerate(COORDINATES)
+    ]
+    pam = PAM(points, 3, engine="numpy", init="build")
+    initial_medoids = sorted(pam.medoids_indices)
+    pam.run()
+    assert sorted(pam.medoids_indices) == initial_medoids
+
+
+def test_unknown_initialization():
+    points = [
+        Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+        for idx, row in enumerate(COORDINATES)
+    ]
+    with pytest.raises(ValueError):
+        PAM(points, 3, init="unknown")
@@ -186,3 +186,59 @@ class TestKMedoidsAlgorithm:
         assert old_medoid.idx not in algorithm.medoids_indices
         assert other_medoid.idx in algorithm.medoids_indices
         assert new_medoid.idx in algorithm.medoids_indices
+
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    def test_update_clusters_assignment_after_swap(self, engine):
+        rng = np.random.default_rng(0)
+        coordinates = rng.normal(size=(50, 2))
+        points = [
+            Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+            for idx, row in enumerate(coordinates)
+        ]
+        algorithm = KMedoidsAlgorithm(points, 4, engine=engine)
+        algorithm.medoids_indices = [0, 10, 20, 30]
+        algorithm.update_clusters_assignment()
+
+        for old_medoid_idx, new_medoid_idx in [(10, 5), (0, 45), (45, 1), (20, 21)]:
+            old_medoid, new_medoid = points[old_medoid_idx], points[new_medoid_idx]
+            algorithm.swap_medoids(old_medoid, new_medoid)
+            algorithm.update_clusters_assignment_after_swap(old_medoid, new_medoid)
+            incremental = [point.get_data() for point in points]
+
+            algorithm.update_clusters_assignment()
+            assert incremental == [point.get_data() for point in points]
+
+    @pytest.mark.parametrize("block_size", [1, 7, 4096])
+    def test_predict_gives_the_same_clusters_as_assignment(self, block_size):
+        rng = np.random.default_rng(0)
+        coordinates = rng.normal(size=(50, 2))
+        points = [
+            Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+            for idx, row in enumerate(coordinates)
+        ]
+        algorithm = KMedoidsAlgorithm(points, 3, labels=["a", "b", "c"])
+        algorithm.medoids_indices = [30, 0, 10]
+        algorithm.update_clusters_assignment()
+        df = algorithm.get_result_df()
+
+        labels, nearest_distances, second_nearest_distances = algorithm.predict(
+            coordinates, return_distances=True, block_size=block_size
+        )
+        assert list(labels) == list(df["cluster"])
+        assert np.allclose(nearest_distances, df["nearest_medoid_distance"])
+        assert np.allclose(
+            second_nearest_distances, df["second_nearest_medoid_distance"]
+        )
+        # medoids belong to their own clusters
+        assert list(algorithm.predict(coordinates[[30, 0, 10]])) == ["a", "b", "c"]
+
+    def test_predict_with_incorrect_coordinates(self):
+        points = [
+            Point(idx=idx, coordinates=np.array([x, x]), coordinates_names=["x", "y"])
+            for idx, x in enumerate([0, 1, 2])
+        ]
+        algorithm = KMedoidsAlgorithm(points, 2)
+        with pytest.raises(ValueError):
+            algorithm.predict(np.zeros((4, 3)))
+        with pytest.raises(ValueError):
+            algorithm.predict(np.zeros(2))
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from clustering_algorithms import CLARANS, PAM, k_medoids_algorithm, select_k
+from clustering_algorithms.initialization import build
+
+
+class TestSelectK:
+    @pytest.mark.parametrize("criterion", ["simplified_silhouette", "silhouette"])
+    def test_number_of_blobs_is_selected(self, criterion, make_blobs):
+        random.seed(0)
+        k, scores = select_k(
+            make_blobs(20, centers=(0, 10, 20, 30), scale=0.5),
+            range(2, 7),
+            criterion=criterion,
+            engine="numpy",
+        )
+
+        assert k == 4
+        assert list(scores.index) == [2, 3, 4, 5, 6]
+        assert scores["cost"].is_monotonic_decreasing
+        assert [len(medoids) for medoids in scores["medoids"]] == [2, 3, 4, 5, 6]
+
+    def test_warm_start_uses_medoids_of_previous_k(self, monkeypatch, make_blobs):
+        initial_medoids = []
+        run = PAM.run
+
+        def remember_initial_medoids(pam):
+            initial_medoids.append(sorted(pam.medoids_indices))
+            run(pam)
+
+        monkeypatch.setattr(PAM, "run", remember_initial_medoids)
+        random.seed(0)
+        _, scores = select_k(
+            make_blobs(20, centers=(0, 10, 20, 30), scale=0.5), [2, 3], engine="numpy"
+        )
+
+        assert set(scores.loc[2, "medoids"]) < set(initial_medoids[1])
+
+    def test_warm_start_with_numbers_of_clusters_that_are_not_consecutive(
+        self, monkeypatch, make_blobs
+    ):
+        initial_medoids = []
+        run = PAM.run
+
+        def remember_initial_medoids(pam):
+            initial_medoids.append(list(pam.medoids_indices))
+            run(pam)
+
+        monkeypatch.setattr(PAM, "run", remember_initial_medoids)
+        random.seed(0)
+        k, scores = select_k(
+            make_blobs(20, centers=(0, 10, 20, 30), scale=0.5),
+            [2, 4, 8],
+            engine="numpy",
+        )
+
+        assert k == 4
+        assert [len(medoids) for medoids in initial_medoids] == [2, 4, 8]
+        assert [len(medoids) for medoids in scores["medoids"]] == [2, 4, 8]
+        for previous, initial in zip(scores["medoids"], initial_medoids[1:]):
+            assert set(previous) < set(initial)
+            assert len(set(initial)) == len(initial)
+
+    def test_warm_start_skips_initialization(self, monkeypatch, make_blobs):
+        builds = []
+        monkeypatch.setattr(
+            k_medoids_algorithm,
+            "INITIALIZERS",
+            {"build": lambda *args: builds.append(args) or build(*args)},
+        )
+        random.seed(0)
+        select_k(
+            make_blobs(20, centers=(0, 10, 20, 30), scale=0.5),
+            [2, 3, 4],
+            engine="numpy",
+            init="build",
+        )
+        assert len(builds) == 1
+
+    def test_parallel_sweep(self, make_blobs):
+        results = []
+        for n_jobs in [1, 2]:
+            random.seed(0)
+            results.append(
+                select_k(
+                    make_blobs(20, centers=(0, 10, 20, 30), scale=0.5),
+                    range(2, 6),
+                    algorithm=CLARANS,
+                    warm_start=False,
+                    n_jobs=n_jobs,
+                    engine="numpy",
+                )
+            )
+
+        assert results[0][0] == results[1][0]
+        assert results[0][1].equals(results[1][1])
+
+    def test_incorrect_k_range(self, make_blobs):
+        with pytest.raises(ValueError):
+            select_k(make_blobs(20, centers=(0, 10, 20, 30), scale=0.5), [1, 2])
+
+    def test_wrong_number_of_medoids(self, monkeypatch, make_blobs):
+        def drop_medoid(pam):
+            pam.medoids_indices = pam.medoids_indices[1:]
+
+        monkeypatch.setattr(PAM, "run", drop_medoid)
+        with pytest.raises(ValueError, match="PAM found 1 medoids for k=2"):
+            select_k(make_blobs(20, centers=(0, 10)), [2], engine="numpy")
+
+    def test_random_state_is_restored_when_run_fails(self, monkeypatch, make_blobs):
+        def fail(pam):
+            raise RuntimeError("failed")
+
+        monkeypatch.setattr(PAM, "run", fail)
+        random.seed(0)
+        random.getrandbits(32)
+        state = random.getstate()
+        random.seed(0)
+        with pytest.raises(RuntimeError):
+            select_k(make_blobs(20, centers=(0, 10)), [2], engine="numpy")
+
+        assert random.getstate() == state
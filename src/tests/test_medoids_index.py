@@ -0,0 +1,121 @@
+import random
+
+import numpy as np
+import pytest
+
+from clustering_algorithms import CLARA, PAM, DistanceMatrix, PointSet
+from clustering_algorithms.medoids_index import MedoidsIndex
+from clustering_algorithms.vectorized import assign_to_medoids, pairwise_distances
+
+
+class TestMedoidsIndex:
+    @pytest.mark.parametrize("medoids_num", [1, 2, 40])
+    def test_query_gives_the_same_result_as_linear_scan(self, medoids_num):
+        rng = np.random.default_rng(0)
+        coordinates = rng.normal(size=(500, 3))
+        medoids_coordinates = coordinates[:medoids_num]
+
+        result = MedoidsIndex(medoids_coordinates).query(coordinates)
+        expected = assign_to_medoids(
+            pairwise_distances(coordinates, medoids_coordinates)
+        )
+        for array, expected_array in zip(result, expected):
+            assert np.allclose(array, expected_array, equal_nan=True)
+
+    def test_ties_are_resolved_in_favour_of_the_first_medoid(self):
+        medoids_coordinates = np.array([[0.0], [4.0], [2.0], [-2.0]])
+        nearest, _, second_nearest, _ = MedoidsIndex(medoids_coordinates).query(
+            np.array([[1.0], [3.0], [-1.0]])
+        )
+        assert list(nearest) == [0, 1, 0]
+        assert list(second_nearest) == [2, 2, 3]
+
+    def test_ties_of_many_medoids(self):
+        medoids_coordinates = np.array(
+            [[5.0, 5.0], [1.0, 0.0], [0.0, 1.0], [-1.0, 0.0], [0.0, -1.0]]
+        )
+        nearest, distances, second_nearest, _ = MedoidsIndex(medoids_coordinates).query(
+            np.array([[0.0, 0.0], [0.5, 0.5]])
+        )
+        assert list(nearest) == [1, 1]
+        assert list(second_nearest) == [2, 2]
+        assert np.allclose(distances, [1, np.sqrt(0.5)])
+
+
+class TestAlgorithmsWithMedoidsIndex:
+    def test_pam_gives_the_same_result_with_index(self, make_blobs):
+        results = []
+        for medoids_index in ["linear", "kdtree"]:
+            points = make_blobs(60, dimensions=3, kind="points")
+            pam = PAM(points, 5, engine="numpy", medoids_index=medoids_index)
+            pam.medoids_indices = [0, 1, 2, 3, 4]
+            pam.run()
+            results.append((sorted(pam.medoids_indices), pam.get_result_df()))
+
+        assert results[0][0] == results[1][0]
+        assert np.allclose(
+            results[0][1].drop(columns="cluster"), results[1][1].drop(columns="cluster")
+        )
+
+    def test_auto_uses_index_only_for_numpy_engine_in_few_dimensions(self, make_blobs):
+        points = make_blobs(60, dimensions=3, kind="points")
+        assert PAM(points, 40, engine="numpy").uses_medoids_index()
+        assert not PAM(points, 40).uses_medoids_index()
+        assert not PAM(points, 5, engine="numpy").uses_medoids_index()
+
+        coordinates = np.random.default_rng(0).normal(size=(60, 20))
+        point_set = PointSet(coordinates, [f"x{column}" for column in range(20)])
+        assert not PAM(point_set, 40, engine="numpy").uses_medoids_index()
+
+    def test_index_is_rebuilt_after_swap(self, make_blobs):
+        points = make_blobs(60, dimensions=3, kind="points")
+        pam = PAM(points, 3, engine="numpy", medoids_index="kdtree")
+        pam.medoids_indices = [0, 1, 2]
+        pam.update_clusters_assignment()
+        index = pam.get_medoids_index()
+        assert pam.get_medoids_index() is index
+
+        pam.swap_medoids(points[0], points[10])
+        pam.update_clusters_assignment_after_swap(points[0], points[10])
+        assert pam.get_medoids_index() is not index
+        assert pam.get_medoids_index().medoids_num == 3
+
+    def test_clara_gives_the_same_result_with_index(self, make_blobs):
+        results = []
+        for medoids_index in ["linear", "auto"]:
+            random.seed(0)
+            clara = CLARA(
+                make_blobs(200, dimensions=3, kind="points"),
+                40,
+                samples_num=80,
+                engine="numpy",
+                draws_num=2,
+                medoids_index=medoids_index,
+            )
+            clara.run()
+            results.append((clara.best_medoids, clara.best_dissimilarity))
+
+        assert results[0][0] == results[1][0]
+        assert results[0][1] == pytest.approx(results[1][1])
+
+    def test_index_requires_coordinates(self, make_blobs):
+        coordinates = np.random.default_rng(0).normal(size=(10, 2))
+        distance_matrix = DistanceMatrix.from_coordinates(coordinates)
+        with pytest.raises(ValueError):
+            PAM(
+                clusters_num=2,
+                engine="numpy",
+                distance_matrix=distance_matrix,
+                medoids_index="kdtree",
+            )
+        with pytest.raises(ValueError):
+            PAM(
+                make_blobs(10, dimensions=3, kind="points"), 2, medoids_index="balltree"
+            )
+        with pytest.raises(ValueError):
+            PAM(
+                make_blobs(10, dimensions=3, kind="points"),
+                2,
+                engine="python",
+                medoids_index="kdtree",
+            )
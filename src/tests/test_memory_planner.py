@@ -0,0 +1,167 @@
+import random
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from clustering_algorithms import PAM, Telemetry
+from clustering_algorithms.memory_planner import (
+    CONDENSED,
+    FULL,
+    ON_THE_FLY,
+    MIN_ROW_CACHE_FRACTION,
+    ROW_CACHE,
+    STRATEGIES,
+    estimate_memory,
+    plan_memory,
+)
+
+
+class TestPlanMemory:
+    def test_the_fastest_strategy_that_fits_is_chosen(self):
+        points_num, dimensions, clusters_num = 20000, 10, 10
+        estimates = {
+            strategy: estimate_memory(strategy, points_num, dimensions, clusters_num)
+            for strategy in STRATEGIES
+        }
+        assert estimates[FULL] > estimates[CONDENSED] > estimates[ON_THE_FLY]
+
+        for budget, strategy in [
+            (estimates[FULL], FULL),
+            (estimates[FULL] - 1, CONDENSED),
+            (estimates[CONDENSED] - 1, ROW_CACHE),
+        ]:
+            plan = plan_memory(points_num, dimensions, clusters_num, budget)
+            assert plan.strategy == strategy
+            assert plan.estimate <= budget
+
+    def test_row_cache_gets_remaining_memory(self):
+        points_num, row_bytes = 20000, 20000 * 8
+        budget = estimate_memory(CONDENSED, points_num, 10, 10) - 1
+        plan = plan_memory(points_num, 10, 10, budget)
+
+        assert plan.strategy == ROW_CACHE
+        assert budget - row_bytes < plan.estimate <= budget
+        assert plan.row_cache_size >= MIN_ROW_CACHE_FRACTION * points_num * row_bytes
+
+    def test_row_cache_is_not_used_for_few_rows(self):
+        points_num, row_bytes = 20000, 20000 * 8
+        row_cache_size = int(MIN_ROW_CACHE_FRACTION * points_num / 2) * row_bytes
+        budget = estimate_memory(ROW_CACHE, points_num, 10, 10, row_cache_size)
+        plan = plan_memory(points_num, 10, 10, budget)
+
+        assert plan.strategy == ON_THE_FLY
+        assert plan.row_cache_size is None
+
+    @pytest.mark.parametrize("swap_strategy", ["pam", "fastpam1", "fasterpam"])
+    def test_estimate_depends_on_swap_strategy_and_init(self, swap_strategy):
+        estimates = [
+            estimate_memory(ON_THE_FLY, 20000, 10, 10, swap_strategy=swap_strategy),
+            estimate_memory(
+                ON_THE_FLY, 20000, 10, 10, swap_strategy=swap_strategy, init="build"
+            ),
+        ]
+        if swap_strategy == "fasterpam":
+            # BUILD evaluates blocks of candidates, FasterPAM one candidate at once
+            assert estimates[0] < estimates[1]
+        else:
+            assert estimates[0] == estimates[1]
+        assert estimate_memory(ON_THE_FLY, 20000, 10, 10, swap_strategy="pam") > (
+            estimate_memory(ON_THE_FLY, 20000, 10, 10, swap_strategy="fastpam1")
+        )
+
+    def test_budget_is_too_small(self):
+        with pytest.raises(ValueError, match="needs at least"):
+            plan_memory(200000, 10, 10, 1 << 20)
+
+    def test_available_memory_is_used_by_default(self, monkeypatch):
+        monkeypatch.setattr(
+            "clustering_algorithms.memory_planner.get_available_memory",
+            lambda: 1000 << 20,
+        )
+        assert plan_memory(1000, 2, 3).budget == 800 << 20
+
+
+class TestPAMWithMemoryBudget:
+    @pytest.mark.parametrize(
+        "budget, strategy",
+        [(100 << 20, FULL), (8 << 20, CONDENSED), (1 << 20, ON_THE_FLY)],
+    )
+    def test_plan_is_applied(self, monkeypatch, budget, strategy, make_blobs):
+        monkeypatch.setattr(
+            "clustering_algorithms.memory_planner.STRATEGIES", (strategy,)
+        )
+        telemetry = Telemetry()
+        pam = PAM(
+            make_blobs(60),
+            clusters_num=3,
+            engine="numpy",
+            telemetry=telemetry,
+            memory_budget=budget,
+        )
+        pam.medoids_indices = [0, 1, 2]
+        pam.run()
+
+        assert pam.memory_plan.strategy == strategy
+        assert telemetry.records[0]["event"] == "memory_plan"
+        assert (pam.distance_matrix is not None) == (strategy != ON_THE_FLY)
+        if strategy == CONDENSED:
+            assert pam.distance_matrix.data.dtype == np.float32
+
+        expected = PAM(make_blobs(60), clusters_num=3, engine="numpy")
+        expected.medoids_indices = [0, 1, 2]
+        expected.run()
+        assert sorted(pam.medoids_indices) == sorted(expected.medoids_indices)
+
+    def test_row_cache_is_created(self, make_blobs):
+        points_num = 20000
+        budget = estimate_memory(CONDENSED, points_num, 2, 3) - 1
+        pam = PAM(
+            make_blobs(points_num),
+            clusters_num=3,
+            engine="numpy",
+            memory_budget=budget,
+        )
+
+        assert pam.memory_plan.strategy == ROW_CACHE
+        assert pam.row_cache.max_bytes == pam.memory_plan.row_cache_size
+        assert pam.distance_matrix is None
+
+    @pytest.mark.parametrize("strategy", STRATEGIES)
+    @pytest.mark.parametrize("swap_strategy", ["pam", "fastpam1", "fasterpam"])
+    @pytest.mark.parametrize("init", ["random", "build"])
+    def test_peak_memory_is_within_estimate(
+        self, monkeypatch, strategy, swap_strategy, init, make_blobs
+    ):
+        monkeypatch.setattr(
+            "clustering_algorithms.memory_planner.STRATEGIES", (strategy,)
+        )
+        point_set = make_blobs(300, centers=(0, 10))
+        random.seed(0)
+        tracemalloc.start()
+        try:
+            pam = PAM(
+                point_set,
+                clusters_num=3,
+                engine="numpy",
+                swap_strategy=swap_strategy,
+                init=init,
+                max_iter=2,
+                memory_budget=1 << 30,
+            )
+            pam.run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert pam.memory_plan.strategy == strategy
+        assert peak <= pam.memory_plan.estimate
+
+    def test_memory_budget_requires_numpy_engine(self, make_blobs):
+        with pytest.raises(ValueError):
+            PAM(make_blobs(60), clusters_num=3, memory_budget=1 << 30)
+
+    @pytest.mark.parametrize("budget", ["4GB", "Auto", True, [1]])
+    def test_incorrect_memory_budget(self, budget, make_blobs):
+        with pytest.raises(ValueError, match="number of bytes"):
+            PAM(make_blobs(60), clusters_num=3, engine="numpy", memory_budget=budget)
@@ -0,0 +1,112 @@
+import random
+
+import numpy as np
+import pytest
+
+from clustering_algorithms import (
+    PAM,
+    DistanceMatrix,
+    MultiStartPAM,
+    Telemetry,
+)
+
+# four overlapping clusters
+BLOBS = {"centers": (0, 5, 10, 15), "scale": 2.0}
+
+
+class TestMultiStartPAM:
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    def test_the_best_start_is_used(self, engine, make_blobs):
+        random.seed(0)
+        pam = MultiStartPAM(make_blobs(10, **BLOBS), 4, starts_num=3, engine=engine)
+        pam.run()
+
+        assert len(pam.costs) == 3
+        assert pam.cost == pytest.approx(min(pam.costs))
+        assert pam.cost == pytest.approx(pam.costs[pam.best_start])
+        assert pam.cost == pytest.approx(pam.compute_total_cost())
+
+    def test_start_is_the_same_as_seeded_pam(self, make_blobs):
+        multi_start = MultiStartPAM(
+            make_blobs(**BLOBS), 4, starts_num=1, engine="numpy"
+        )
+        medoids_indices, cost, _ = multi_start.run_start(1234)
+
+        random.seed(1234)
+        pam = PAM(make_blobs(**BLOBS), 4, engine="numpy")
+        pam.run()
+        assert sorted(medoids_indices) == sorted(pam.medoids_indices)
+        assert cost == pytest.approx(pam.cost)
+
+    def test_global_random_state_is_not_changed(self, make_blobs):
+        random.seed(0)
+        state = random.getstate()
+        pam = MultiStartPAM(make_blobs(10, **BLOBS), 4, starts_num=2, engine="numpy")
+        assert random.getstate() == state
+
+        pam.run_starts([1, 2])
+        assert random.getstate() == state
+
+    def test_deterministic_initialization_is_rejected(self, make_blobs):
+        with pytest.raises(ValueError, match="deterministic"):
+            MultiStartPAM(make_blobs(10, **BLOBS), 4, engine="numpy", init="build")
+        with pytest.raises(ValueError):
+            MultiStartPAM(make_blobs(10, **BLOBS), 4, engine="numpy", init="unknown")
+        MultiStartPAM(make_blobs(10, **BLOBS), 4, engine="numpy", init="k-medoids++")
+
+    def test_parallel_run_gives_the_same_result_as_serial_run(self, make_blobs):
+        results = []
+        for n_jobs in [1, 2]:
+            random.seed(0)
+            pam = MultiStartPAM(
+                make_blobs(**BLOBS), 4, starts_num=4, engine="numpy", n_jobs=n_jobs
+            )
+            pam.run()
+            results.append((sorted(pam.medoids_indices), pam.costs))
+
+        assert results[0] == results[1]
+
+    def test_remaining_starts_are_cancelled_when_target_is_reached(self, make_blobs):
+        random.seed(0)
+        pam = MultiStartPAM(
+            make_blobs(**BLOBS), 4, starts_num=5, engine="numpy", target_cost=np.inf
+        )
+        pam.run()
+
+        assert pam.costs[0] is not None
+        assert pam.costs[1:] == [None] * 4
+        assert pam.best_start == 0
+
+    def test_parallel_run_with_distance_matrix(self, make_blobs):
+        point_set = make_blobs(**BLOBS)
+        distance_matrix = DistanceMatrix.from_coordinates(point_set.coordinates)
+        results = []
+        for n_jobs in [1, 2]:
+            telemetry = Telemetry()
+            random.seed(0)
+            pam = MultiStartPAM(
+                point_set,
+                4,
+                starts_num=2,
+                engine="numpy",
+                distance_matrix=distance_matrix,
+                n_jobs=n_jobs,
+                telemetry=telemetry,
+            )
+            pam.run()
+            results.append((pam.costs, telemetry.counters["distance_computations"]))
+
+        assert results[0] == results[1]
+        start_records = [
+            record for record in telemetry.records if record["event"] == "start"
+        ]
+        assert [record["start"] for record in start_records] == [0, 1]
+        # records of PAM run by workers are merged and tagged with the start
+        pam_records = [
+            record for record in telemetry.records if record["algorithm"] == "PAM"
+        ]
+        assert {record["start"] for record in pam_records} == {0, 1}
+
+    def test_incorrect_number_of_starts(self, make_blobs):
+        with pytest.raises(ValueError):
+            MultiStartPAM(make_blobs(**BLOBS), 4, starts_num=0)
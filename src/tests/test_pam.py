@@ -1,4 +1,6 @@
 import numpy as np
+import pandas as pd
+import pytest
 
 from clustering_algorithms import PAM, Point
 
@@ -52,3 +54,125 @@ class TestPam:
         assert pam.compute_replacement_cost(old_medoid, points[3]) == -196.0
         assert pam.compute_replacement_cost(old_medoid, points[4]) == -196.0
         assert pam.compute_replacement_cost(old_medoid, points[5]) == -194.0
+
+    def test_numpy_engine_gives_the_same_result_as_python_engine(self):
+        rng = np.random.default_rng(0)
+        coordinates = np.concatenate(
+            [rng.normal(center, 1.0, size=(15, 2)) for center in (0, 10, 20)]
+        )
+        results = []
+        for engine in ["python", "numpy"]:
+            points = [
+                Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+                for idx, row in enumerate(coordinates)
+            ]
+            pam = PAM(points, clusters_num=3, labels=["a", "b", "c"], engine=engine)
+            pam.medoids_indices = [0, 1, 2]
+            pam.run()
+            results.append((sorted(pam.medoids_indices), pam.get_result_df()))
+
+        (python_medoids, python_df), (numpy_medoids, numpy_df) = results
+        assert python_medoids == numpy_medoids
+        pd.testing.assert_frame_equal(python_df, numpy_df)
+
+    def test_fastpam1_gives_the_same_medoids_as_pam(self):
+        rng = np.random.default_rng(1)
+        coordinates = rng.normal(size=(40, 2))
+        medoids = []
+        for swap_strategy in ["pam", "fastpam1"]:
+            points = [
+                Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+                for idx, row in enumerate(coordinates)
+            ]
+            pam = PAM(points, 4, engine="numpy", swap_strategy=swap_strategy)
+            pam.medoids_indices = [0, 1, 2, 3]
+            pam.run()
+            medoids.append(sorted(pam.medoids_indices))
+
+        assert medoids[0] == medoids[1]
+
+    def test_fasterpam_finds_separated_clusters(self):
+        points = [
+            Point(idx=idx, coordinates=np.array([x]), coordinates_names=["x"])
+            for idx, x in enumerate([0, 1, 2, 50, 51, 52, 100, 101, 102])
+        ]
+        pam = PAM(points, 3, engine="numpy", swap_strategy="fasterpam")
+        pam.medoids_indices = [0, 1, 2]
+        pam.run()
+
+        assert sorted(pam.medoids_indices) == [1, 4, 7]
+
+    def test_fast_swap_strategies_require_numpy_engine(self):
+        points = [
+            Point(idx=idx, coordinates=np.array([x]), coordinates_names=["x"])
+            for idx, x in enumerate([0, 1, 2])
+        ]
+        with pytest.raises(ValueError):
+            PAM(points, 2, swap_strategy="fasterpam")
+        with pytest.raises(ValueError):
+            PAM(points, 2, engine="numpy", swap_strategy="unknown")
+
+    @pytest.mark.parametrize("swap_strategy", ["pam", "fasterpam"])
+    def test_max_iter(self, swap_strategy):
+        rng = np.random.default_rng(1)
+        points = [
+            Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+            for idx, row in enumerate(rng.normal(size=(40, 2)))
+        ]
+        pam = PAM(points, 4, engine="numpy", swap_strategy=swap_strategy)
+        pam.medoids_indices = [0, 1, 2, 3]
+        pam.run()
+        assert pam.stop_reason == "converged"
+        assert pam.iterations > 1
+        cost = pam.cost
+
+        pam = PAM(points, 4, engine="numpy", swap_strategy=swap_strategy, max_iter=1)
+        pam.medoids_indices = [0, 1, 2, 3]
+        pam.run()
+        assert pam.stop_reason == "max_iter"
+        assert pam.iterations == 1
+        assert pam.cost > cost
+        assert pam.cost == pytest.approx(
+            pam.get_result_df()["nearest_medoid_distance"].sum()
+        )
+
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    def test_time_budget_keeps_medoids_found_so_far(self, engine):
+        rng = np.random.default_rng(1)
+        points = [
+            Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+            for idx, row in enumerate(rng.normal(size=(40, 2)))
+        ]
+        pam = PAM(points, 4, engine=engine, time_budget=1e-9)
+        pam.medoids_indices = [0, 1, 2, 3]
+        pam.update_clusters_assignment()
+        initial_cost = pam.compute_total_cost()
+        pam.run()
+
+        assert pam.stop_reason == "time_budget"
+        assert pam.cost <= initial_cost
+        assert pam.cost == pytest.approx(pam.compute_total_cost())
+
+    def test_tol(self):
+        points = [
+            Point(idx=idx, coordinates=np.array([x]), coordinates_names=["x"])
+            for idx, x in enumerate([0, 1, 2, 50, 51, 52, 100, 101, 102])
+        ]
+        pam = PAM(points, 3, engine="numpy", tol=0.5)
+        pam.medoids_indices = [0, 1, 2]
+        pam.run()
+
+        assert pam.stop_reason == "tol"
+        assert pam.iterations < 4
+
+    def test_incorrect_budgets(self):
+        points = [
+            Point(idx=idx, coordinates=np.array([x]), coordinates_names=["x"])
+            for idx, x in enumerate([0, 1, 2])
+        ]
+        with pytest.raises(ValueError):
+            PAM(points, 2, max_iter=0)
+        with pytest.raises(ValueError):
+            PAM(points, 2, time_budget=0)
+        with pytest.raises(ValueError):
+            PAM(points, 2, tol=-1)
@@ -102,6 +102,18 @@ class TestPoint:
             == 0
         )
 
+    def test_compute_medoid_replacement_cost_does_not_scan_medoids(self):
+        medoid = Point(0, np.array([10]), ["x"])
+        point = Point(1, np.array([11]), ["x"])
+        new_medoid = Point(2, np.array([12]), ["x"])
+        # the caller knows that the point is a medoid, so the list is not checked
+        assert (
+            point.compute_medoid_replacement_cost(
+                medoid, new_medoid, [], is_medoid=True
+            )
+            == 0
+        )
+
     def test_cost_of_replacing_nearest_medoid_with_more_similar_medoid(self):
         # create medoids
         nearest_medoid = Point(1, np.array([10]), ["x"])
@@ -182,3 +194,30 @@ class TestPoint:
         point = Point(0, np.array([123]), ["x"])
         other = Point(1, np.array([9458]), ["x"])
         assert point.compute_distance(other) == 9458 - 123
+
+    def test_update_cluster_assignment_after_swap(self):
+        medoids = [
+            Point(0, np.array([10]), ["x"]),
+            Point(1, np.array([20]), ["x"]),
+            Point(2, np.array([30]), ["x"]),
+        ]
+        point = Point(idx=999, coordinates=np.array([0]), coordinates_names=["x"])
+        point.update_cluster_assignment(medoids)
+
+        # new medoid is closer than the nearest one
+        new_medoid = Point(3, np.array([5]), ["x"])
+        point.update_cluster_assignment_after_swap(
+            medoids[2], new_medoid, [medoids[0], medoids[1], new_medoid]
+        )
+        assert point.nearest_medoid is new_medoid
+        assert point.second_nearest_medoid is medoids[0]
+        assert point.second_nearest_medoid_distance == 10
+
+        # the nearest medoid is removed
+        other_medoid = Point(4, np.array([100]), ["x"])
+        point.update_cluster_assignment_after_swap(
+            new_medoid, other_medoid, [medoids[0], medoids[1], other_medoid]
+        )
+        assert point.nearest_medoid is medoids[0]
+        assert point.second_nearest_medoid is medoids[1]
+        assert point.second_nearest_medoid_distance == 20
@@ -0,0 +1,123 @@
+import pickle
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from clustering_algorithms import CLARA, PAM, Point, PointSet
+
+
+class TestPointSet:
+    def test_views(self):
+        point_set = PointSet(
+            np.array([[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]]), ["x", "y"], [10, 20, 30]
+        )
+        assert len(point_set) == 3
+
+        point = point_set[1]
+        assert point.idx == 20
+        assert (point.coordinates == [2.0, 3.0]).all()
+        assert point.coordinates_names == ["x", "y"]
+        assert point.nearest_medoid is None
+
+        # views of the same point are equal
+        assert point_set[1] == point
+        assert point_set[1] != point_set[2]
+        assert point in [point_set[0], point_set[1]]
+        assert point_set[-1] == point_set[2]
+        with pytest.raises(IndexError):
+            point_set[3]
+
+    def test_views_are_reused_and_have_no_dict(self):
+        point_set = PointSet(np.array([[0.0, 1.0], [2.0, 3.0]]), ["x", "y"])
+        point = point_set[0]
+        assert point_set[0] is point
+        assert next(iter(point_set)) is point
+        assert not hasattr(point, "__dict__")
+        assert not hasattr(Point(0, [0.0], ["x"]), "__dict__")
+
+        unpickled = pickle.loads(pickle.dumps(point))
+        assert unpickled.idx == point.idx
+        assert (unpickled.coordinates == point.coordinates).all()
+        point_copy = pickle.loads(pickle.dumps(Point(3, [1.0], ["x"])))
+        assert point_copy.idx == 3
+
+    def test_assignment_is_stored_in_arrays(self):
+        point_set = PointSet(np.array([[0.0], [1.0], [10.0]]), ["x"])
+        medoids = [point_set[0], point_set[2]]
+        point_set[1].update_cluster_assignment(medoids)
+
+        assert point_set.nearest_medoid[1] == 0
+        assert point_set.nearest_medoid_distance[1] == 1.0
+        assert point_set.second_nearest_medoid[1] == 2
+        assert point_set.second_nearest_medoid_distance[1] == 9.0
+        assert point_set[1].nearest_medoid == medoids[0]
+
+    def test_medoid_from_other_container(self):
+        point_set = PointSet(np.array([[0.0], [1.0]]), ["x"])
+        with pytest.raises(ValueError):
+            point_set[0].nearest_medoid = Point(0, np.array([0.0]), ["x"])
+
+    def test_incorrect_shapes(self):
+        with pytest.raises(ValueError):
+            PointSet(np.zeros((3, 2)), ["x"])
+        with pytest.raises(ValueError):
+            PointSet(np.zeros((3, 2)), ["x", "y"], indices=[1, 2])
+
+    def test_from_points(self):
+        points = [
+            Point(idx=5, coordinates=np.array([0, 1]), coordinates_names=["x", "y"]),
+            Point(idx=7, coordinates=np.array([2, 3]), coordinates_names=["x", "y"]),
+        ]
+        point_set = PointSet.from_points(points)
+        assert point_set.indices.tolist() == [5, 7]
+        assert (point_set.coordinates == [[0, 1], [2, 3]]).all()
+
+    def test_get_data_requires_assignment(self):
+        point_set = PointSet(np.zeros((2, 1)), ["x"])
+        with pytest.raises(ValueError):
+            point_set.get_data()
+
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    def test_pam_on_point_set_gives_the_same_result_as_on_list(
+        self, engine, make_blobs
+    ):
+        coordinates = make_blobs(15, centers=(0, 10, 20), kind="coordinates")
+        results = []
+        for points in [
+            [
+                Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+                for idx, row in enumerate(coordinates)
+            ],
+            PointSet(coordinates, ["x", "y"]),
+        ]:
+            pam = PAM(points, 3, labels=["a", "b", "c"], engine=engine)
+            pam.medoids_indices = [0, 1, 2]
+            pam.run()
+            results.append(pam.get_result_df())
+
+        pd.testing.assert_frame_equal(results[0], results[1])
+
+    def test_clara_on_point_set(self, make_blobs):
+        random.seed(0)
+        clara = CLARA(
+            PointSet(
+                make_blobs(15, centers=(0, 10, 20), kind="coordinates"), ["x", "y"]
+            ),
+            3,
+            engine="numpy",
+        )
+        clara.run()
+        df = clara.get_result_df()
+        assert df["nearest_medoid"].nunique() == 3
+
+    def test_from_dataframe(self):
+        df = pd.DataFrame(
+            {"x": [0.5, 1.5], "y": [2.5, 3.5], "label": ["a", "b"]}, index=[3, 8]
+        )
+        point_set = PointSet.from_dataframe(df, ["x", "y"])
+
+        assert point_set.indices.tolist() == [3, 8]
+        assert (point_set.coordinates == [[0.5, 2.5], [1.5, 3.5]]).all()
+        assert point_set.coordinates_names == ["x", "y"]
@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+from clustering_algorithms import PAM, Point, PointSet
+from clustering_algorithms.quality import (
+    adjusted_rand_index,
+    davies_bouldin,
+    evaluate,
+    purity,
+    silhouette,
+    simplified_silhouette,
+    total_deviation,
+)
+from clustering_algorithms.vectorized import pairwise_distances
+
+
+def get_silhouette_naive(coordinates, labels):
+    values = []
+    for point, label in zip(coordinates, labels):
+        distances = np.linalg.norm(coordinates - point, axis=1)
+        own = labels == label
+        if own.sum() == 1:
+            values.append(0.0)
+            continue
+        a = distances[own].sum() / (own.sum() - 1)
+        b = min(distances[labels == other].mean() for other in set(labels) - {label})
+        values.append((b - a) / max(a, b))
+    return np.mean(values)
+
+
+class TestSilhouette:
+    @pytest.mark.parametrize("block_size", [1, 7, 256])
+    def test_silhouette_is_the_same_as_naive(self, block_size):
+        rng = np.random.default_rng(0)
+        coordinates = rng.normal(size=(50, 2))
+        labels = rng.integers(0, 4, size=50)
+        labels[0] = 10  # single-point cluster
+
+        def compute_distances(rows, columns):
+            return pairwise_distances(coordinates[rows], coordinates[columns])
+
+        assert silhouette(compute_distances, labels, block_size) == pytest.approx(
+            get_silhouette_naive(coordinates, labels)
+        )
+
+    def test_silhouette_requires_two_clusters(self):
+        with pytest.raises(ValueError):
+            silhouette(lambda rows, columns: None, np.zeros(5))
+
+    def test_simplified_silhouette(self):
+        assert simplified_silhouette(
+            np.array([1.0, 0.0, 2.0]), np.array([4.0, 0.0, 1.0])
+        ) == pytest.approx((0.75 + 0 - 0.5) / 3)
+
+
+def get_adjusted_rand_index_naive(classes, labels):
+    pairs = [(i, j) for i in range(len(classes)) for j in range(i + 1, len(classes))]
+    same_class = np.array([classes[i] == classes[j] for i, j in pairs])
+    same_label = np.array([labels[i] == labels[j] for i, j in pairs])
+    index = (same_class & same_label).sum()
+    expected = same_class.sum() * same_label.sum() / len(pairs)
+    maximum = (same_class.sum() + same_label.sum()) / 2
+    return (index - expected) / (maximum - expected)
+
+
+class TestMetrics:
+    def test_total_deviation(self):
+        assert total_deviation(np.array([1.0, 2.5, 0.0])) == 3.5
+
+    def test_davies_bouldin(self):
+        coordinates = np.array([[0.0, 0.0], [0.0, 2.0], [10.0, 0.0], [10.0, 4.0]])
+        labels = np.array([5, 5, 7, 7])
+        # scatters 1 and 2, centroids (0, 1) and (10, 2)
+        expected = 3 / np.sqrt(101)
+
+        assert davies_bouldin(coordinates, labels) == pytest.approx(expected)
+        assert davies_bouldin(coordinates, labels, block_size=3) == pytest.approx(
+            expected
+        )
+        assert davies_bouldin(
+            coordinates, labels, centers=coordinates[[0, 2]]
+        ) == pytest.approx(3 / 10)
+
+    def test_adjusted_rand_index(self):
+        rng = np.random.default_rng(0)
+        classes = rng.choice(["a", "b", "c"], size=40)
+        labels = rng.integers(0, 4, size=40)
+
+        assert adjusted_rand_index(classes, labels) == pytest.approx(
+            get_adjusted_rand_index_naive(classes, labels)
+        )
+        assert adjusted_rand_index(classes, classes) == pytest.approx(1.0)
+        assert adjusted_rand_index(labels, labels + 10) == pytest.approx(1.0)
+
+    def test_purity(self):
+        classes = np.array(["a", "a", "b", "b", "b", "c"])
+        labels = np.array([0, 0, 0, 1, 1, 1])
+
+        assert purity(classes, labels) == pytest.approx(4 / 6)
+
+
+class TestEvaluate:
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    @pytest.mark.parametrize("point_set", [False, True])
+    def test_metrics_are_the_same_for_every_storage(self, engine, point_set):
+        rng = np.random.default_rng(0)
+        coordinates = np.concatenate(
+            [rng.normal(center, 1.0, size=(15, 2)) for center in (0, 10, 20)]
+        )
+        classes = np.repeat(["a", "b", "c"], 15)
+        if point_set:
+            points = PointSet(coordinates, ["x", "y"])
+        else:
+            points = [
+                Point(idx=idx, coordinates=row, coordinates_names=["x", "y"])
+                for idx, row in enumerate(coordinates)
+            ]
+        pam = PAM(points, 3, engine=engine)
+        pam.medoids_indices = [0, 15, 30]
+        pam.run()
+
+        metrics = evaluate(pam, classes, full_silhouette=True)
+        df = pam.get_result_df()
+        assert metrics["total_deviation"] == pytest.approx(
+            df["nearest_medoid_distance"].sum()
+        )
+        assert metrics["simplified_silhouette"] == pytest.approx(
+            simplified_silhouette(
+                df["nearest_medoid_distance"], df["second_nearest_medoid_distance"]
+            )
+        )
+        assert metrics["silhouette"] == pytest.approx(
+            get_silhouette_naive(coordinates, df["cluster"].to_numpy())
+        )
+        assert metrics["adjusted_rand_index"] == pytest.approx(1.0)
+        assert metrics["purity"] == pytest.approx(1.0)
+        assert metrics["davies_bouldin"] > 0
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from clustering_algorithms import PAM, DistanceRowCache, PointSet, Telemetry
+from clustering_algorithms.vectorized import pairwise_distances
+
+
+def get_cache(coordinates, max_rows):
+    computed = []
+
+    def compute_rows(positions):
+        computed.extend(positions.tolist())
+        return pairwise_distances(coordinates[positions], coordinates)
+
+    row_bytes = len(coordinates) * 8
+    return (
+        DistanceRowCache(compute_rows, len(coordinates), max_rows * row_bytes),
+        computed,
+    )
+
+
+class TestDistanceRowCache:
+    def test_get_returns_distances(self, make_blobs):
+        coordinates = make_blobs(kind="coordinates")
+        cache, _ = get_cache(coordinates, 5)
+        expected = pairwise_distances(coordinates, coordinates)
+
+        rows = np.array([3, 1, 3, 20])
+        columns = np.arange(10)
+        assert np.allclose(cache.get(rows, columns), expected[rows][:, columns])
+        assert np.allclose(cache.get(columns, rows), expected[columns][:, rows])
+
+    def test_cached_rows_are_not_computed_again(self, make_blobs):
+        coordinates = make_blobs(kind="coordinates")
+        cache, computed = get_cache(coordinates, 5)
+        all_points = np.arange(len(coordinates))
+
+        cache.get(all_points, np.array([1, 2, 2]))
+        cache.get(all_points, np.array([2, 3]))
+
+        assert computed == [1, 2, 3]
+        assert cache.hits == 1
+        assert cache.misses == 4
+        assert cache.hit_rate == pytest.approx(0.2)
+
+    def test_rows_are_kept_until_the_cache_is_full(self, make_blobs):
+        coordinates = make_blobs(kind="coordinates")
+        cache, computed = get_cache(coordinates, 2)
+        all_points = np.arange(len(coordinates))
+
+        for _ in range(3):
+            for column in [0, 1, 2]:
+                cache.get(all_points, np.array([column]))
+
+        # a repeated sweep does not evict rows that are needed later in it
+        assert computed == [0, 1, 2, 2, 2]
+        assert list(cache.rows) == [0, 1]
+        assert cache.hits == 4
+        assert cache.nbytes <= cache.max_bytes
+
+    def test_cache_without_budget_computes_every_row(self, make_blobs):
+        coordinates = make_blobs(kind="coordinates")
+        cache, computed = get_cache(coordinates, 0)
+        for _ in range(2):
+            cache.get(np.arange(len(coordinates)), np.array([4]))
+
+        assert computed == [4, 4]
+        assert len(cache.rows) == 0
+
+    def test_negative_budget(self):
+        with pytest.raises(ValueError):
+            DistanceRowCache(lambda positions: None, 10, -1)
+
+
+class TestPAMWithRowCache:
+    @pytest.mark.parametrize("swap_strategy", ["pam", "fastpam1", "fasterpam"])
+    def test_result_is_the_same_as_without_cache(self, swap_strategy, make_blobs):
+        coordinates = make_blobs(60, kind="coordinates")
+        results = []
+        for row_cache_size in [None, 10 * 60 * 8]:
+            pam = PAM(
+                PointSet(coordinates, ["x", "y"]),
+                clusters_num=3,
+                engine="numpy",
+                swap_strategy=swap_strategy,
+                row_cache_size=row_cache_size,
+            )
+            pam.medoids_indices = [0, 1, 2]
+            pam.run()
+            results.append((sorted(pam.medoids_indices), pam.cost))
+
+        assert results[0][0] == results[1][0]
+        assert results[0][1] == pytest.approx(results[1][1])
+
+    def test_cache_reduces_distance_computations(self, make_blobs):
+        coordinates = make_blobs(60, kind="coordinates")
+        counters = []
+        for row_cache_size in [None, 60 * 60 * 8]:
+            telemetry = Telemetry()
+            pam = PAM(
+                PointSet(coordinates, ["x", "y"]),
+                clusters_num=3,
+                engine="numpy",
+                swap_strategy="fasterpam",
+                telemetry=telemetry,
+                row_cache_size=row_cache_size,
+            )
+            pam.medoids_indices = [0, 1, 2]
+            pam.run()
+            counters.append(telemetry.counters["distance_computations"])
+
+        assert pam.row_cache.hits > 0
+        assert telemetry.records[-1]["row_cache_hits"] == pam.row_cache.hits
+        assert counters[1] < counters[0]
+
+    @pytest.mark.parametrize("swap_strategy", ["fastpam1", "fasterpam"])
+    def test_cache_smaller_than_matrix_gives_hits(self, swap_strategy, make_blobs):
+        points_num = 300
+        pam = PAM(
+            make_blobs(points_num // 3, centers=(0, 10, 20)),
+            clusters_num=3,
+            engine="numpy",
+            swap_strategy=swap_strategy,
+            # half of the matrix
+            row_cache_size=points_num // 2 * points_num * 8,
+        )
+        pam.medoids_indices = [0, 1, 2]
+        pam.run()
+
+        assert len(pam.row_cache.rows) == points_num // 2
+        assert pam.row_cache.hit_rate > 0.25
+
+    def test_row_cache_requires_numpy_engine(self, make_blobs):
+        with pytest.raises(ValueError):
+            PAM(make_blobs(), clusters_num=3, row_cache_size=1000)
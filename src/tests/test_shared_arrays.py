@@ -0,0 +1,104 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from clustering_algorithms import CLARA, PAM, DistanceMatrix, PointSet
+from clustering_algorithms.shared_arrays import SharedArray
+
+
+def fill(shared_array: SharedArray, value: float) -> None:
+    shared_array.array[:] = value
+
+
+def set_nearest_medoid(point_set: PointSet) -> float:
+    point_set[1].nearest_medoid = point_set[0]
+    return float(point_set.coordinates.sum())
+
+
+class TestSharedArray:
+    def test_worker_writes_into_the_same_memory(self):
+        shared_array = SharedArray.from_array(np.zeros(10))
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            executor.submit(fill, shared_array, 3.0).result()
+
+        assert (shared_array.array == 3.0).all()
+        shared_array.release()
+
+    def test_array_is_pickled_by_name(self):
+        shared_array = SharedArray.from_array(np.arange(100000, dtype=float))
+        data = pickle.dumps(shared_array)
+        unpickled = pickle.loads(data)
+
+        assert len(data) < 1000
+        assert np.shares_memory(unpickled.array, shared_array.array)
+        shared_array.release()
+        assert shared_array.array is None
+
+
+class TestSharedPointSet:
+    def test_worker_sees_the_same_points(self, make_blobs):
+        point_set = make_blobs(1000)
+        shared = point_set.share()
+        assert np.array_equal(shared.coordinates, point_set.coordinates)
+        assert len(pickle.dumps(shared)) < 2000
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            total = executor.submit(set_nearest_medoid, shared).result()
+
+        assert total == pytest.approx(point_set.coordinates.sum())
+        assert shared[1].nearest_medoid == shared[0]
+        assert point_set[1].nearest_medoid is None
+        shared.release_shared()
+
+
+class TestSharedDistanceMatrix:
+    @pytest.mark.parametrize("condensed", [False, True])
+    def test_shared_matrix_is_pickled_by_name(self, condensed, make_blobs):
+        matrix = DistanceMatrix.from_coordinates(
+            make_blobs(200).coordinates, condensed=condensed
+        )
+        shared = matrix.share()
+        data = pickle.dumps(shared)
+        unpickled = pickle.loads(data)
+        positions = np.arange(200)
+
+        assert shared.is_shared() and not matrix.is_shared()
+        assert shared.share() is shared
+        assert len(data) < 1000
+        assert np.array_equal(
+            unpickled.get(positions, positions), matrix.get(positions, positions)
+        )
+        shared.release_shared()
+
+
+class TestSharedData:
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    def test_algorithm_is_pickled_without_points(self, engine, make_blobs):
+        clara = CLARA(make_blobs(1000, kind="points"), 3, engine=engine)
+        with clara.shared_data():
+            data = pickle.dumps(clara)
+            unpickled = pickle.loads(data)
+
+        assert len(data) < len(pickle.dumps(clara)) / 10
+        assert unpickled.medoids_indices == clara.medoids_indices
+        assert unpickled.compute_dissimilarity(clara.medoids_indices) == pytest.approx(
+            clara.compute_dissimilarity(clara.medoids_indices)
+        )
+
+    def test_worker_gets_empty_row_cache_of_the_same_size(self, make_blobs):
+        pam = PAM(make_blobs(200), 3, engine="numpy", row_cache_size=1 << 20)
+        pam.run()
+        assert pam.row_cache.nbytes > 0
+        with pam.shared_data():
+            unpickled = pickle.loads(pickle.dumps(pam))
+
+        assert unpickled.row_cache.max_bytes == pam.row_cache.max_bytes
+        assert unpickled.row_cache.nbytes == 0
+        positions = np.arange(3)
+        assert np.allclose(
+            unpickled.compute_distances(positions, positions),
+            pam.compute_distances(positions, positions),
+        )
+        assert unpickled.row_cache.misses > 0
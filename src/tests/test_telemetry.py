@@ -0,0 +1,140 @@
+import json
+import random
+
+import pytest
+
+from clustering_algorithms import CLARA, CLARANS, PAM, Point, Telemetry
+
+
+def count_point_distances(monkeypatch):
+    counter = {"count": 0}
+    compute_distance = Point.compute_distance
+
+    def counting_compute_distance(self, other_point):
+        counter["count"] += 1
+        return compute_distance(self, other_point)
+
+    monkeypatch.setattr(Point, "compute_distance", counting_compute_distance)
+    return counter
+
+
+class TestTelemetry:
+    def test_phase(self):
+        telemetry = Telemetry()
+        with telemetry.phase("swap_search"):
+            pass
+        with telemetry.phase("swap_search"):
+            pass
+
+        assert telemetry.calls["swap_search"] == 2
+        assert telemetry.timings["swap_search"] >= 0
+
+    def test_merge(self):
+        telemetry, other = Telemetry(), Telemetry()
+        telemetry.count("distance_computations", 5)
+        other.count("distance_computations", 3)
+        other.count("swap_candidates")
+
+        other.record({"event": "iteration", "algorithm": "PAM"})
+
+        telemetry.merge(other, sample=2)
+        assert telemetry.counters == {"distance_computations": 8, "swap_candidates": 1}
+        assert telemetry.records == [
+            {"event": "iteration", "algorithm": "PAM", "sample": 2}
+        ]
+
+    def test_to_json(self, tmp_path, make_blobs):
+        random.seed(0)
+        telemetry = Telemetry()
+        PAM(
+            make_blobs(15, centers=(0, 10, 20), kind="points"),
+            3,
+            engine="numpy",
+            telemetry=telemetry,
+        ).run()
+
+        telemetry.to_json(tmp_path / "telemetry.json")
+        with open(tmp_path / "telemetry.json") as telemetry_file:
+            assert json.load(telemetry_file) == telemetry.to_dict()
+
+
+class TestAlgorithmsTelemetry:
+    def test_python_pam_counts_every_distance(self, monkeypatch, make_blobs):
+        random.seed(0)
+        counter = count_point_distances(monkeypatch)
+        telemetry = Telemetry()
+        PAM(
+            make_blobs(15, centers=(0, 10, 20), kind="points"), 3, telemetry=telemetry
+        ).run()
+
+        assert telemetry.counters["distance_computations"] == counter["count"]
+        assert telemetry.counters["swap_candidates"] > 0
+        assert set(telemetry.timings) == {"assignment", "swap_search"}
+
+    @pytest.mark.parametrize("swap_strategy", ["pam", "fastpam1", "fasterpam"])
+    def test_pam_reports_iterations(self, swap_strategy, make_blobs):
+        random.seed(0)
+        records = []
+        pam = PAM(
+            make_blobs(15, centers=(0, 10, 20), kind="points"),
+            3,
+            engine="numpy",
+            swap_strategy=swap_strategy,
+            callbacks=[records.append],
+        )
+        pam.run()
+
+        iterations = [record for record in records if record["event"] == "iteration"]
+        assert [record["iteration"] for record in iterations] == list(
+            range(1, pam.iterations + 1)
+        )
+        costs = [record["cost"] for record in iterations]
+        assert costs == sorted(costs, reverse=True)
+        assert records[-1]["event"] == "finished"
+        assert records[-1]["cost"] == pytest.approx(costs[-1])
+
+    def test_records_contain_counters(self, make_blobs):
+        random.seed(0)
+        telemetry = Telemetry()
+        CLARANS(
+            make_blobs(15, centers=(0, 10, 20), kind="points"),
+            3,
+            engine="numpy",
+            telemetry=telemetry,
+        ).run()
+
+        df = telemetry.to_dataframe()
+        assert list(df["event"]) == ["local_minimum", "local_minimum"]
+        assert (df["algorithm"] == "CLARANS").all()
+        assert df["distance_computations"].is_monotonic_increasing
+
+    def test_clara_collects_telemetry_of_samples(self, make_blobs):
+        counters = []
+        for n_jobs in [1, 2]:
+            random.seed(0)
+            telemetry = Telemetry()
+            records = []
+            clara = CLARA(
+                make_blobs(15, centers=(0, 10, 20), kind="points"),
+                3,
+                samples_num=20,
+                engine="numpy",
+                n_jobs=n_jobs,
+                callbacks=[lambda record: records.append(record)],
+                telemetry=telemetry,
+            )
+            clara.run()
+
+            assert [record["sample"] for record in records] == list(range(5))
+            assert {"assignment", "swap_search", "sampling", "sample_evaluation"} <= (
+                set(telemetry.timings)
+            )
+            counters.append(dict(telemetry.counters))
+            # records of PAM run on samples are tagged with the sample
+            pam_records = [
+                record for record in telemetry.records if record["algorithm"] == "PAM"
+            ]
+            assert {record["sample"] for record in pam_records} == set(range(5))
+
+        # counters of samples evaluated in worker processes are not lost
+        assert counters[0] == counters[1]
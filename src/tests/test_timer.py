@@ -0,0 +1,122 @@
+import pytest
+
+from timer import RESERVOIR_SIZE, SectionStats, Timer, TimerError
+
+
+class TestTimer:
+    def test_start_and_stop(self):
+        timer = Timer()
+        with pytest.raises(TimerError):
+            timer.stop()
+
+        timer.start()
+        with pytest.raises(TimerError):
+            timer.start()
+        timer.stop()
+        assert timer.time >= 0
+
+    def test_nested_sections(self):
+        timer = Timer()
+        with timer.section("run"):
+            for _ in range(3):
+                with timer.section("swap"):
+                    pass
+            with timer.section("assignment"):
+                pass
+        with timer.section("swap"):
+            pass
+
+        assert list(timer.stats()) == ["run", "run/swap", "run/assignment", "swap"]
+        assert timer.get_section("run/swap").count == 3
+        assert timer.get_section("swap").count == 1
+        assert timer.get_section("run").total >= timer.get_section("run/swap").total
+
+    def test_stats(self):
+        timer = Timer()
+        with timer.section("swap") as stats:
+            pass
+        for duration in [0.3, 0.1, 0.2]:
+            stats.add(duration)
+
+        swap = timer.stats(percentiles=(50,))["swap"]
+        assert swap["count"] == 4
+        assert swap["max"] == 0.3
+        assert swap["min"] == timer.get_section("swap").durations[0]
+        assert swap["p50"] == pytest.approx(0.15, abs=1e-3)
+
+    def test_section_as_decorator(self):
+        timer = Timer()
+
+        @timer.section("factorial")
+        def factorial(n):
+            return n * factorial(n - 1) if n > 1 else 1
+
+        assert factorial(3) == 6
+        assert factorial(1) == 1
+        assert timer.get_section("factorial").count == 2
+        assert timer.get_section("factorial/factorial/factorial").count == 1
+
+    def test_section_is_stopped_after_exception(self):
+        timer = Timer()
+        with pytest.raises(ZeroDivisionError):
+            with timer.section("run"):
+                1 / 0
+        with timer.section("swap"):
+            pass
+
+        assert list(timer.stats()) == ["run", "swap"]
+
+    def test_report(self):
+        timer = Timer()
+        with timer.section("run"):
+            with timer.section("swap"):
+                pass
+
+        lines = timer.report().splitlines()
+        assert lines[0].split() == [
+            "section",
+            "count",
+            "total",
+            "mean",
+            "min",
+            "max",
+            "p50",
+            "p90",
+        ]
+        assert lines[1].startswith("run ")
+        assert lines[2].startswith("  swap ")
+
+    def test_report_is_in_tree_order(self):
+        timer = Timer()
+        with timer.section("run"):
+            with timer.section("swap"):
+                pass
+        with timer.section("other"):
+            pass
+        with timer.section("run"):
+            with timer.section("assignment"):
+                pass
+
+        names = [line.split()[0] for line in timer.report().splitlines()[1:]]
+        assert names == ["run", "swap", "assignment", "other"]
+        assert timer.report().splitlines()[3].startswith("  assignment ")
+        assert list(timer.stats()) == ["run", "run/swap", "run/assignment", "other"]
+
+    def test_stats_keep_bounded_sample_of_durations(self):
+        stats = SectionStats()
+        for duration in range(10 * RESERVOIR_SIZE):
+            stats.add(float(duration))
+
+        assert stats.count == 10 * RESERVOIR_SIZE
+        assert len(stats.durations) == RESERVOIR_SIZE
+        assert stats.min == 0 and stats.max == 10 * RESERVOIR_SIZE - 1
+        assert stats.mean == pytest.approx((10 * RESERVOIR_SIZE - 1) / 2)
+        assert stats.percentile(50) == pytest.approx(5 * RESERVOIR_SIZE, rel=0.1)
+
+    def test_reset(self):
+        timer = Timer()
+        with timer.section("run"):
+            with pytest.raises(TimerError):
+                timer.reset()
+        timer.reset()
+        assert timer.stats() == {}
@@ -0,0 +1,149 @@
+import numpy as np
+
+from clustering_algorithms import Point
+from clustering_algorithms.vectorized import (
+    assign_to_medoids,
+    assign_to_medoids_blocked,
+    assign_to_medoids_in_blocks,
+    compute_swap_costs,
+    compute_swap_costs_fastpam1,
+    euclidean_distances_blas,
+    pairwise_distances,
+)
+
+
+def test_pairwise_distances():
+    first = np.array([[0.0, 0.0], [3.0, 4.0]])
+    second = np.array([[0.0, 0.0], [0.0, 1.0], [6.0, 8.0]])
+
+    distances = pairwise_distances(first, second)
+    assert distances.shape == (2, 3)
+    assert np.allclose(distances, [[0, 1, 10], [5, np.sqrt(18), 5]])
+
+
+def test_pairwise_distances_of_points_without_coordinates():
+    assert np.array_equal(
+        pairwise_distances(np.empty((3, 0)), np.empty((2, 0))), np.zeros((3, 2))
+    )
+
+
+def test_euclidean_distances_blas():
+    rng = np.random.default_rng(0)
+    first, second = rng.normal(size=(30, 5)), rng.normal(size=(8, 5))
+    second[0] = first[0]
+
+    distances = euclidean_distances_blas(first, second)
+    assert np.allclose(distances, pairwise_distances(first, second))
+    assert distances[0, 0] >= 0
+    assert np.allclose(
+        euclidean_distances_blas(first, second, squared=True),
+        np.square(pairwise_distances(first, second)),
+    )
+
+
+def test_assign_to_medoids_blocked_gives_the_same_result_as_assign_to_medoids(
+    monkeypatch,
+):
+    # small blocks, so there are many of them
+    monkeypatch.setattr(
+        "clustering_algorithms.vectorized.ASSIGNMENT_BLOCK_ELEMENTS", 20
+    )
+    rng = np.random.default_rng(0)
+    # integer coordinates give many ties
+    coordinates = rng.integers(-3, 3, size=(200, 2)).astype(float)
+    for medoids_num in [1, 2, 7]:
+        medoids_coordinates = coordinates[:medoids_num]
+        expected = assign_to_medoids(
+            pairwise_distances(coordinates, medoids_coordinates)
+        )
+        result = assign_to_medoids_blocked(coordinates, medoids_coordinates)
+        for array, expected_array in zip(result, expected):
+            assert np.array_equal(array, expected_array, equal_nan=True)
+
+        _, squared_distances, _, _ = assign_to_medoids_blocked(
+            coordinates, medoids_coordinates, squared=True
+        )
+        assert np.allclose(squared_distances, np.square(expected[1]))
+
+
+def test_assign_to_medoids_in_blocks():
+    rng = np.random.default_rng(0)
+    distances = rng.random(size=(50, 4))
+
+    result = assign_to_medoids_in_blocks(50, lambda block: distances[block], 7)
+    for array, expected_array in zip(result, assign_to_medoids(distances)):
+        assert np.array_equal(array, expected_array)
+
+
+def test_assign_to_medoids_resolves_ties_like_point():
+    medoids = [
+        Point(0, np.array([12]), ["x"]),
+        Point(1, np.array([11]), ["x"]),
+        Point(2, np.array([10]), ["x"]),
+        Point(3, np.array([11]), ["x"]),
+        Point(4, np.array([10]), ["x"]),
+    ]
+    point = Point(idx=999, coordinates=np.array([0]), coordinates_names=["x"])
+    point.update_cluster_assignment(medoids)
+
+    distances = np.array([[point.compute_distance(medoid) for medoid in medoids]])
+    nearest, nearest_distances, second, second_distances = assign_to_medoids(distances)
+
+    assert medoids[nearest[0]] is point.nearest_medoid
+    assert nearest_distances[0] == point.nearest_medoid_distance
+    assert medoids[second[0]] is point.second_nearest_medoid
+    assert second_distances[0] == point.second_nearest_medoid_distance
+
+
+def test_assign_to_medoids_with_single_medoid():
+    nearest, nearest_distances, second, second_distances = assign_to_medoids(
+        np.array([[1.0], [2.0]])
+    )
+    assert (nearest == 0).all()
+    assert (nearest_distances == [1.0, 2.0]).all()
+    assert (second == -1).all()
+    assert np.isnan(second_distances).all()
+
+
+def test_compute_swap_costs():
+    coordinates = np.array([[0.0], [1.0], [2.0], [100.0], [101.0], [102.0]])
+    medoids_positions = np.array([1, 2])
+    nearest, nearest_distances, _, second_distances = assign_to_medoids(
+        pairwise_distances(coordinates, coordinates[medoids_positions])
+    )
+    costs = compute_swap_costs(
+        pairwise_distances(coordinates, coordinates),
+        nearest,
+        nearest_distances,
+        second_distances,
+        medoids_positions,
+    )
+
+    # replacing medoid at position 2
+    assert costs.shape == (2, 6)
+    assert costs[1, 0] == 3.0
+    assert costs[1, 3] == -293.0
+    assert costs[1, 4] == -294.0
+    assert costs[1, 5] == -293.0
+
+
+def test_compute_swap_costs_fastpam1_is_equal_to_compute_swap_costs():
+    rng = np.random.default_rng(0)
+    coordinates = rng.normal(size=(30, 2))
+    medoids_positions = np.array([3, 11, 20, 27])
+    nearest, nearest_distances, _, second_distances = assign_to_medoids(
+        pairwise_distances(coordinates, coordinates[medoids_positions])
+    )
+    candidates_distances = pairwise_distances(coordinates, coordinates)
+
+    costs = compute_swap_costs(
+        candidates_distances,
+        nearest,
+        nearest_distances,
+        second_distances,
+        medoids_positions,
+    )
+    fastpam1_costs = compute_swap_costs_fastpam1(
+        candidates_distances, nearest, nearest_distances, second_distances, 4
+    )
+    assert np.allclose(costs, fastpam1_costs)
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from clustering_algorithms.workers import call_in_worker, resolve_n_jobs, worker_pool
+
+
+class Algorithm:
+    def __init__(self, offset):
+        self.offset = offset
+
+    def add(self, value):
+        return self.offset + value
+
+
+class TestWorkers:
+    def test_resolve_n_jobs(self):
+        assert resolve_n_jobs(3) == 3
+        assert resolve_n_jobs(-1) == os.cpu_count()
+
+    @pytest.mark.parametrize("n_jobs", [0, -2])
+    def test_incorrect_number_of_jobs(self, n_jobs):
+        with pytest.raises(ValueError):
+            resolve_n_jobs(n_jobs)
+
+    def test_methods_of_algorithm_are_called_in_workers(self):
+        with worker_pool(2, Algorithm(10)) as executor:
+            results = [
+                executor.submit(call_in_worker, "add", value).result()
+                for value in range(3)
+            ]
+
+        assert results == [10, 11, 12]
@@ -1,16 +1,106 @@
+import contextlib
+import random
 import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# separator of sections' names in paths of nested sections, ex. "run/swap"
+SEPARATOR = "/"
+
+# maximal number of durations of a section kept to compute percentiles
+RESERVOIR_SIZE = 1024
 
 
 class TimerError(Exception):
     """A custom exception used to report errors in use of Timer class"""
 
 
+class SectionStats:
+    """
+    Durations measured for a single section. Count, total, min and max are exact,
+    percentiles are computed from a uniform sample of at most RESERVOIR_SIZE
+    durations (reservoir sampling), so memory does not grow with the number of
+    measurements.
+
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        # all durations while there are at most RESERVOIR_SIZE of them
+        self.durations: List[float] = []
+        # own generator, so timing does not change the global random state
+        self._random = random.Random(0)
+
+    def add(self, duration: float) -> None:
+        self.min = duration if not self.count else min(self.min, duration)
+        self.max = duration if not self.count else max(self.max, duration)
+        self.count += 1
+        self.total += duration
+
+        if len(self.durations) < RESERVOIR_SIZE:
+            self.durations.append(duration)
+        else:
+            position = self._random.randrange(self.count)
+            if position < RESERVOIR_SIZE:
+                self.durations[position] = duration
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.durations:
+            return 0.0
+        return float(np.percentile(self.durations, q))
+
+    def to_dict(self, percentiles: Tuple[float, ...] = (50, 90, 99)) -> dict:
+        stats = {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+        }
+        stats.update({f"p{q:g}": self.percentile(q) for q in percentiles})
+        return stats
+
+
 class Timer:
+    """
+    Measures a single span with .start() and .stop() and named sections:
+
+        timer = Timer()
+        with timer.section("run"):
+            with timer.section("swap"):
+                ...
+        print(timer.report())
+
+    Sections can be nested and entered many times, durations of each section are
+    accumulated separately for every path of names ("run/swap" above). Section can
+    be used as a decorator as well:
+
+        PAM.get_best_replacement_for_medoid = timer.section("replacement")(
+            PAM.get_best_replacement_for_medoid
+        )
+
+    Sections are not thread-safe, use one timer per thread.
+
+    """
+
     def __init__(self):
         self.start_time = None
         self.end_time = None
         self._is_running = False
 
+        # path of names -> stats, parents are always before their children
+        self.sections: Dict[Tuple[str, ...], SectionStats] = {}
+        # names of sections that are currently entered
+        self._stack: List[str] = []
+
     @property
     def time(self):
         """
@@ -37,3 +127,86 @@ class Timer:
 
         self._is_running = False
         self.end_time = time.perf_counter()
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        """
+        Measure time spent inside the context (or decorated function) and add it to
+        the `name` section nested in sections that are currently entered.
+
+        """
+        if SEPARATOR in name:
+            raise TimerError(f"Section's name cannot contain {SEPARATOR!r}.")
+        path = (*self._stack, name)
+        stats = self.sections.setdefault(path, SectionStats())
+
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.add(time.perf_counter() - start)
+            self._stack.pop()
+
+    def get_section(self, path: str) -> SectionStats:
+        """
+        Get stats of the section, ex. timer.get_section("run/swap").
+        """
+        return self.sections[tuple(path.split(SEPARATOR))]
+
+    def stats(self, percentiles: Tuple[float, ...] = (50, 90, 99)) -> Dict[str, dict]:
+        """
+        Aggregated durations of all sections in the same order as in `report`.
+
+        Return:
+            Dictionary with paths of sections as keys and dictionaries with count,
+            total, mean, min, max and percentiles (ex. "p90") as values.
+
+        """
+        return {
+            SEPARATOR.join(path): self.sections[path].to_dict(percentiles)
+            for path in self.get_tree_order()
+        }
+
+    def get_tree_order(self) -> List[Tuple[str, ...]]:
+        """
+        Paths of sections in depth-first order: every section is followed by its
+        nested sections, siblings are in the order they were first entered.
+
+        """
+        first_entered = {path: order for order, path in enumerate(self.sections)}
+        return sorted(
+            self.sections,
+            key=lambda path: [
+                first_entered[path[:length]] for length in range(1, len(path) + 1)
+            ],
+        )
+
+    def report(self, percentiles: Tuple[float, ...] = (50, 90)) -> str:
+        """
+        Prepare a table with stats of all sections. Nested sections are indented
+        and placed under their parents, times are in seconds.
+
+        """
+        columns = ["count", "total", "mean", "min", "max"] + [
+            f"p{q:g}" for q in percentiles
+        ]
+        paths = self.get_tree_order()
+        names = ["  " * (len(path) - 1) + path[-1] for path in paths]
+        width = max([len("section"), *map(len, names)])
+
+        lines = [f"{'section':<{width}}" + "".join(f"{c:>11}" for c in columns)]
+        for name, path in zip(names, paths):
+            values = self.sections[path].to_dict(percentiles)
+            line = f"{name:<{width}}{values['count']:>11}"
+            line += "".join(f"{values[column]:>11.6f}" for column in columns[1:])
+            lines.append(line)
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """
+        Forget stats of all sections.
+        """
+        if self._stack:
+            raise TimerError("Sections cannot be reset while they are running.")
+        self.sections = {}